@@ -13,86 +13,7 @@ import tikzplotlib
 
 import odesolvers
 
-from hw2ex4 import hw2ex4ode
-
-def hw4ex1ode1(t, x):
-	"""Function containing the first ODE.
-
-	- **parameters**, **types**, **return** and **return types**::
-		:param t: current time
-		:param x: state at current time
-		:type t: np.float
-		:type x: np.array[float]
-		:return: Derivative of state at current time
-		:rtype: np.array[float]
-
-	"""
-
-	return hw2ex4ode(t,x);
-
-
-def hw4ex1Jacobian1(t, x):
-	"""Function containing the Jacobian of the first ODE.
-
-	- **parameters**, **types**, **return** and **return types**::
-		:param t: current time
-		:param x: state at current time
-		:type t: np.float
-		:type x: np.array[float]
-		:return: Jacobian of the function hw4ex1ode1
-		:rtype: np.array[float,float]
-
-	"""
-
-	df = np.empty([2,2], float);
-	
-	df[0,0] = -1;
-	df[0,1] = 0;
-	df[1,0] = 0;
-	df[1,1] = -100;
-	
-	return df;
-
-def hw4ex1ode2(t, x):
-	"""Function containing the second ODE.
-
-	- **parameters**, **types**, **return** and **return types**::
-		:param t: current time
-		:param x: state at current time
-		:type t: np.float
-		:type x: np.array[float]
-		:return: Derivative of state at current time
-		:rtype: np.array[float]
-
-	"""
-	xprime = np.empty([2], float);
-
-	xprime[0] = 0.25*x[0] - 0.01*x[0]*x[1];
-	xprime[1] = -x[1] + 0.01*x[0]*x[1];
-
-	return xprime;
-
-def hw4ex1Jacobian2(t, x):
-	"""Function containing the Jacobian of the second ODE.
-
-	- **parameters**, **types**, **return** and **return types**::
-		:param t: current time
-		:param x: state at current time
-		:type t: np.float
-		:type x: np.array[float]
-		:return: Jacobian of the function hw4ex1ode2
-		:rtype: np.array[float,float]
-
-	"""
-
-	df = np.empty([2,2], float);
-
-	df[0,0] = 0.25 -0.01*x[1];
-	df[0,1] = -0.01*x[0];
-	df[1,0] = 0.01*x[1];
-	df[1,1] = -1 + 0.01*x[0];
-	
-	return df;
+from hw4ex1odes import hw4ex1ode1, hw4ex1Jacobian1, hw4ex1ode2, hw4ex1Jacobian2
 
 if __name__ == '__main__':
 	# Problem 1
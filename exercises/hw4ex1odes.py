@@ -0,0 +1,94 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# ME210B - Homework 4, Exercise 1: the ODEs and their Jacobians, without plotting (e.g. for hw4ex1.json)
+#
+
+import numpy as np
+
+def hw4ex1ode1(t, x):
+	"""Function containing the first ODE.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param t: current time
+		:param x: state at current time
+		:type t: np.float
+		:type x: np.array[float]
+		:return: Derivative of state at current time
+		:rtype: np.array[float]
+
+	"""
+	xprime = np.empty([2], float);
+
+	xprime[0] = -x[0];
+	xprime[1] = -100*(x[1] - np.sin(t)) + np.cos(t);
+
+	return xprime;
+
+
+def hw4ex1Jacobian1(t, x):
+	"""Function containing the Jacobian of the first ODE.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param t: current time
+		:param x: state at current time
+		:type t: np.float
+		:type x: np.array[float]
+		:return: Jacobian of the function hw4ex1ode1
+		:rtype: np.array[float,float]
+
+	"""
+
+	df = np.empty([2,2], float);
+	
+	df[0,0] = -1;
+	df[0,1] = 0;
+	df[1,0] = 0;
+	df[1,1] = -100;
+	
+	return df;
+
+def hw4ex1ode2(t, x):
+	"""Function containing the second ODE.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param t: current time
+		:param x: state at current time
+		:type t: np.float
+		:type x: np.array[float]
+		:return: Derivative of state at current time
+		:rtype: np.array[float]
+
+	"""
+	xprime = np.empty([2], float);
+
+	xprime[0] = 0.25*x[0] - 0.01*x[0]*x[1];
+	xprime[1] = -x[1] + 0.01*x[0]*x[1];
+
+	return xprime;
+
+def hw4ex1Jacobian2(t, x):
+	"""Function containing the Jacobian of the second ODE.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param t: current time
+		:param x: state at current time
+		:type t: np.float
+		:type x: np.array[float]
+		:return: Jacobian of the function hw4ex1ode2
+		:rtype: np.array[float,float]
+
+	"""
+
+	df = np.empty([2,2], float);
+
+	df[0,0] = 0.25 -0.01*x[1];
+	df[0,1] = -0.01*x[0];
+	df[1,0] = 0.01*x[1];
+	df[1,1] = -1 + 0.01*x[0];
+	
+	return df;
@@ -9,7 +9,6 @@
 #
 
 import numpy as np
-from scipy.linalg import toeplitz
 import tikzplotlib
 
 import odesolvers
@@ -73,7 +72,7 @@ def hw5ode3(t, x):
 
 def hw5pde(t, x):
 	"""Function containing the PDE to be solved
-	with method of lines (gridding here implemented)
+	with method of lines (gridding implemented in hw5pdeOperator)
 	and Backward Euler difference.
 
 	- **parameters**, **types**, **return** and **return types**::
@@ -85,20 +84,31 @@ def hw5pde(t, x):
 		:rtype: np.array[float]
 
 	"""
-	n : np.int = 100;		# number of points in the grid
-	r = np.zeros(n);
-	c = np.zeros(n);
-	r[0] = c[0] = -n;
-	c[1] = n;
-	A = toeplitz(c, r);
-	ub = np.zeros(n); ub[0] = n;	# constant offset given by boundary condition
+	return hw5pdeL(t,x);
 
-	return (np.dot(A,x) + ub);
+def hw5pdeOperator(n):
+	"""Function building the operator of the PDE discretized with method of lines,
+	i.e. hw5pde(t,x) = A x + ub (upwind difference, the boundary condition giving the constant offset ub).
+	Its banded Jacobian is hw5pdeOperator(n).jacobian.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param n: number of points in the grid
+		:type n: np.int
+		:return: finite-difference operator
+		:rtype: odesolvers.FDOperator
+
+	"""
+	dx = 1.0/n;
+	return odesolvers.FDOperator([-1, 0], -odesolvers.FDWeights([-1, 0], 1, dx), n, dx, left=('dirichlet', 1.0));
+
+# built once, instead of at every evaluation of hw5pde
+hw5pdeL = hw5pdeOperator(100);
 
 
 if __name__ == '__main__':
 
 	ETOL = np.array([1e-3, 1e-6]);
+	cache = odesolvers.SolverCache('.odesolvers-cache');	# the two solves of problem 1 are identical
 
 	for tol in np.nditer(ETOL):
 		# Problem 1
@@ -108,14 +118,14 @@ if __name__ == '__main__':
 
 		# Fixed stepsize
 		h : np.float = 0.01;
-		y, hi = odesolvers.AB_AM_PECE2(hw5ode1, iv, t0, tn, None, ETOL=tol);
+		y, hi = cache(odesolvers.AB_AM_PECE2, hw5ode1, iv, t0, tn, None, ETOL=tol);
 		odesolvers.plotODEsol(y[:,0], t0, h, 'y1(t)');
 		tikzplotlib.save(f'problem1-y1-tol-{tol}-step-{h}.tex');
 		odesolvers.plotODEsol(y[:,1], t0, h, 'y2(t)');
 		tikzplotlib.save(f'problem1-y2-tol-{tol}-step-{h}.tex');
 
 		# Automatic stepsize selection
-		y, hi = odesolvers.AB_AM_PECE2(hw5ode1, iv, t0, tn, None, ETOL=tol);
+		y, hi = cache(odesolvers.AB_AM_PECE2, hw5ode1, iv, t0, tn, None, ETOL=tol);
 		odesolvers.plotODEsolVar(y[:,0], t0, hi, 'y1(t)');
 		tikzplotlib.save(f'problem1-y1-tol-{tol}-variable-step.tex');
 		odesolvers.plotODEsolVar(y[:,1], t0, hi, 'y2(t)');
@@ -1,4 +1,22 @@
+from .__version__ import __version__
+from .solution import *
+from .controllers import *
 from .thetamethod import *
+from .sensitivity import *
+from .adjoint import *
 from .eulersolver import *
 from .predictorcorrector import *
+from .exponentialintegrator import *
+from .symplectic import *
+from .dde import *
+from .mol import *
+from .cache import *
+from .extrapolation import *
+from .rkc import *
+from .rosenbrock import *
+from .parareal import *
+from .jacobian import *
+from .ensemble import *
+from .asyncsolvers import *
 from .utils.plotting.odehelpers import *
+from .symbolic import *
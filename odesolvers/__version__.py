@@ -0,0 +1,7 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+__version__ = '0.1.0'
@@ -0,0 +1,77 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Internal helpers for the asyncio solvers.
+#
+
+import asyncio
+import inspect
+import numpy as np
+
+def _isawaitable(res) -> bool:
+	"""Internal function checking whether a value returned by f has to be awaited (arrays, the common case, being checked first).
+	"""
+	return not isinstance(res, np.ndarray) and inspect.isawaitable(res);
+
+
+async def _evaluate(f, *args):
+	"""Internal coroutine evaluating f, which can be either a function or a coroutine function.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param f: function to be evaluated
+		:param args: arguments of f
+		:type f: Callable
+		:type args: tuple
+		:return: value of f
+		:rtype: Any
+
+	"""
+	res = f(*args);
+	if _isawaitable(res):
+		res = await res;
+	return res;
+
+
+async def _evaluate_all(*calls):
+	"""Internal coroutine evaluating several functions, which can be either functions or coroutine functions.
+
+	The functions are called in the given order, and the coroutines among them are awaited concurrently.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param calls: tuples (f, *args) of the functions to be evaluated and of their arguments
+		:type calls: tuple
+		:return: values of the functions
+		:rtype: list
+
+	"""
+	res = [call[0](*call[1:]) for call in calls];
+	pending = [k for k, r in enumerate(res) if _isawaitable(r)];
+	if pending:
+		for k, r in zip(pending, await asyncio.gather(*[res[k] for k in pending])):
+			res[k] = r;
+	return res;
+
+
+def _run(coro):
+	"""Internal function running a coroutine of the solvers to completion, without an event loop.
+
+	The kernels of the solvers are written once as coroutines, evaluating f through _evaluate:
+	with plain functions they never suspend, and complete at the first send.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param coro: coroutine to be run
+		:type coro: coroutine
+		:return: value of the coroutine
+		:rtype: Any
+
+	"""
+	try:
+		coro.send(None);
+	except StopIteration as stop:
+		return stop.value;
+	coro.close();
+	raise TypeError('A function has returned an awaitable: use the asyncio solvers (e.g. ThetaMethodAsync)')
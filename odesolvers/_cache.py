@@ -0,0 +1,209 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Internal implementation of the solver cache: fingerprints of the arguments and entries on disk.
+#
+
+import os
+import json
+import types
+import pickle
+import hashlib
+import functools
+import numpy as np
+
+from .solution import ODESolution
+
+_SCALARS = (type(None), bool, int, float, complex, str, bytes);
+
+def _fingerprint(*objs) -> str:
+	"""Internal function computing a stable fingerprint (SHA-256) of Python objects.
+
+	Functions are fingerprinted by their bytecode, constants, default arguments, closure
+	and the global variables they reference (recursively), so that two definitions with the same
+	code and data have the same fingerprint, and editing the code or the captured data changes it.
+	Arrays are fingerprinted by their type, shape and contents, and other objects by their attributes or,
+	if they define the method _fingerprintdata(), by the data it returns (e.g. excluding lazily computed caches,
+	whose attributes would change the fingerprint after the first use of the object).
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param objs: objects to be fingerprinted
+		:type objs: tuple
+		:return: hexadecimal digest
+		:rtype: str
+
+	"""
+	h = hashlib.sha256();
+	for obj in objs:
+		_update(h, obj, set());
+	return h.hexdigest();
+
+
+def _update(h, obj, seen : set) -> None:
+	"""Internal function feeding the fingerprint of an object to the hash h.
+	"""
+	def tag(name, data = b''):
+		h.update(name.encode() + b'\0' + (data if isinstance(data, bytes) else data.encode()) + b'\0');
+
+	if isinstance(obj, _SCALARS):
+		tag(type(obj).__name__, repr(obj));
+		return;
+	if isinstance(obj, (np.ndarray, np.generic)):
+		a = np.ascontiguousarray(obj);
+		tag('ndarray', f'{a.dtype.str}{a.shape}');
+		h.update(a.tobytes() if a.dtype.kind != 'O' else pickle.dumps(a.tolist()));
+		return;
+	if isinstance(obj, types.ModuleType):
+		tag('module', obj.__name__);
+		return;
+	if isinstance(obj, (type, types.BuiltinFunctionType, np.ufunc)):
+		tag('name', f'{getattr(obj, "__module__", None)}.{getattr(obj, "__qualname__", obj.__name__)}');
+		return;
+
+	if id(obj) in seen:		# recursive structure (e.g. a recursive function)
+		tag('cycle');
+		return;
+	seen.add(id(obj));
+
+	if isinstance(obj, (tuple, list)):
+		tag(type(obj).__name__, str(len(obj)));
+		for item in obj:
+			_update(h, item, seen);
+	elif isinstance(obj, dict):
+		tag('dict', str(len(obj)));
+		for key in sorted(obj, key=repr):
+			_update(h, key, seen);
+			_update(h, obj[key], seen);
+	elif isinstance(obj, types.CodeType):
+		tag('code', obj.co_code);
+		_update(h, obj.co_names, seen);
+		_update(h, obj.co_consts, seen);
+	elif isinstance(obj, types.FunctionType):
+		_update(h, obj.__code__, seen);
+		_update(h, obj.__defaults__, seen);
+		_update(h, obj.__kwdefaults__, seen);
+		for cell in (obj.__closure__ or ()):
+			try:
+				_update(h, cell.cell_contents, seen);
+			except ValueError:		# empty cell
+				tag('empty');
+		names = _globalnames(obj.__code__);
+		_update(h, {name: obj.__globals__[name] for name in names if name in obj.__globals__}, seen);
+	elif isinstance(obj, types.MethodType):
+		_update(h, obj.__func__, seen);
+		_update(h, obj.__self__, seen);
+	elif isinstance(obj, functools.partial):
+		_update(h, (obj.func, obj.args, obj.keywords), seen);
+	elif callable(getattr(type(obj), '_fingerprintdata', None)):
+		tag('object', f'{type(obj).__module__}.{type(obj).__qualname__}');
+		_update(h, obj._fingerprintdata(), seen);
+	elif hasattr(obj, '__dict__'):
+		tag('object', f'{type(obj).__module__}.{type(obj).__qualname__}');
+		_update(h, vars(obj), seen);
+	else:
+		try:
+			tag('pickle', pickle.dumps(obj));
+		except Exception:
+			tag('repr', repr(obj));		# not stable (e.g. it includes the address): no cache hits
+
+
+def _globalnames(code : types.CodeType) -> set:
+	"""Internal function returning the names referenced by some code and by its nested functions.
+	"""
+	names = set(code.co_names);
+	for const in code.co_consts:
+		if isinstance(const, types.CodeType):
+			names |= _globalnames(const);
+	return names;
+
+
+def _store(path : str, result) -> bool:
+	"""Internal function writing the result of a solver to a (new) directory.
+
+	The arrays are stored as .npy files, to be memory-mapped when loaded, and the structure
+	of the result (nested tuples, ODESolution, scalars) in a JSON file.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param path: directory of the entry
+		:param result: result of the solver
+		:type path: str
+		:type result: tuple, ODESolution or np.array[float]
+		:return: False if the result cannot be stored
+		:rtype: bool
+
+	"""
+	arrays = [];
+
+	def index(a):
+		# the same array (e.g. the stepsizes hi returned with the ODESolution) is stored once
+		for k, b in enumerate(arrays):
+			if (a.__array_interface__['data'][0] == b.__array_interface__['data'][0]
+				and a.shape == b.shape and a.strides == b.strides and a.dtype == b.dtype):
+				return k;
+		arrays.append(a);
+		return len(arrays)-1;
+
+	def encode(obj):
+		if isinstance(obj, ODESolution):
+			x = obj._x[:,:obj._n] if obj.layout == 'component' else obj._x[:obj._n];
+			return {'solution': [index(x), index(obj._hi[:obj._n])], 't0': float(obj._t0), 'layout': obj.layout};
+		if isinstance(obj, np.ndarray):
+			if obj.dtype.kind == 'O':
+				raise TypeError(obj.dtype)
+			return {'array': index(obj)};
+		if isinstance(obj, (tuple, list)):
+			return {type(obj).__name__: [encode(item) for item in obj]};
+		if isinstance(obj, np.generic):
+			obj = obj.item();
+		if isinstance(obj, (type(None), bool, int, float, str)):
+			return {'value': obj};
+		raise TypeError(type(obj))
+
+	try:
+		structure = encode(result);
+	except TypeError:
+		return False;
+
+	for k, a in enumerate(arrays):
+		np.save(os.path.join(path, f'{k}.npy'), a);
+	with open(os.path.join(path, 'result.json'), 'w') as fh:
+		json.dump(structure, fh);
+
+	return True;
+
+
+def _load(path : str):
+	"""Internal function loading the result of a solver from a directory written by _store, the arrays being memory-mapped (read-only).
+	"""
+	with open(os.path.join(path, 'result.json')) as fh:
+		structure = json.load(fh);
+
+	arrays = {};
+	def array(k):
+		if k not in arrays:
+			arrays[k] = np.load(os.path.join(path, f'{k}.npy'), mmap_mode='r');
+		return arrays[k];
+
+	def decode(node):
+		if 'solution' in node:
+			x, hi = (array(k) for k in node['solution']);
+			return ODESolution(x, hi, hi.shape[0], t0=node['t0'], layout=node['layout']);
+		if 'array' in node:
+			return array(node['array']);
+		if 'tuple' in node:
+			return tuple(decode(item) for item in node['tuple']);
+		if 'list' in node:
+			return [decode(item) for item in node['list']];
+		return node['value'];
+
+	return decode(structure);
+
+
+def _size(path : str) -> int:
+	"""Internal function returning the size (in bytes) of the files of an entry.
+	"""
+	return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file());
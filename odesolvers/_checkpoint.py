@@ -0,0 +1,77 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Internal implementation of solver checkpoints on disk.
+#
+
+import os
+import numpy as np
+
+def _save_checkpoint(path : str, rows : dict = None, **state) -> None:
+	"""Internal function saving the state of a solver to disk.
+
+	The state is first written to a temporary file, which then atomically replaces
+	the previous checkpoint: a job killed while saving leaves the previous checkpoint intact.
+	The arrays growing with the integration (e.g. the states x) are not rewritten at each checkpoint:
+	each one is kept in the file path.name, to which only the rows computed since the previous checkpoint are written
+	(before the state referring to them, rows beyond the saved count being ignored and later overwritten).
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param path: checkpoint file
+		:param rows: arrays (by name) saved row by row, each with the index of its first row not saved yet
+		:param state: arrays and scalars describing the state of the solver
+		:type path: str
+		:type rows: dict[str, (np.array, int)]
+		:type state: dict
+		:return: None
+		:rtype: None
+
+	"""
+	for name, (array, start) in (rows or {}).items():
+		array = np.reshape(array, (array.shape[0], -1));
+		filename = path + '.' + name;
+		with open(filename, 'r+b' if os.path.exists(filename) else 'w+b') as fh:
+			fh.seek(start*array.shape[1]*array.itemsize);
+			np.ascontiguousarray(array[start:]).tofile(fh);
+			fh.truncate();
+			fh.flush();
+			os.fsync(fh.fileno());
+		state['_rows_' + name] = np.array([array.shape[0], array.shape[1]]);
+		state['_dtype_' + name] = array.dtype.str;
+
+	tmp = path + '.tmp';
+	with open(tmp, 'wb') as fh:
+		np.savez(fh, **state);
+		fh.flush();
+		os.fsync(fh.fileno());
+	os.replace(tmp, path);
+
+
+def _load_checkpoint(path : str, solver : str) -> dict:
+	"""Internal function loading the state of a solver from disk (see _save_checkpoint).
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param path: checkpoint file
+		:param solver: name of the solver expected to have written the checkpoint
+		:type path: str
+		:type solver: str
+		:return: state of the solver
+		:rtype: dict
+
+	"""
+	with np.load(path) as data:
+		state = {k: data[k] for k in data.files};
+
+	if str(state.get('solver')) != solver:
+		raise ValueError(f'{path} is not a checkpoint of {solver}')
+
+	for key in [k for k in state if k.startswith('_rows_')]:
+		name = key[len('_rows_'):];
+		nrows, ncols = (int(v) for v in state.pop(key));
+		state[name] = np.fromfile(path + '.' + name, dtype=str(state.pop('_dtype_' + name)), count=nrows*ncols).reshape((nrows, ncols));
+
+	return state;
@@ -0,0 +1,111 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Internal implementation of the history of delay differential equations.
+#
+
+import numpy as np
+
+class _History:
+	"""Internal class storing the history of the solution of a delay differential equation, with dense output.
+
+	The steps (times, states and derivatives) are stored in a buffer, dropping those older than the maximum delay:
+	its size stays proportional to the number of steps within the maximum delay, and not to the length of the integration.
+	Delayed states are evaluated by binary search of their step (O(log n)), and cubic Hermite interpolation within it.
+	Before the initial time, the initial history function is evaluated instead.
+
+	"""
+
+	def __init__(self, phi, t0 : float, x0, f0, capacity : int = 64):
+		"""Constructor.
+
+		- **parameters**, **types**, **return** and **return types**::
+			:param phi: initial history, function of t (t <= t0) or constant vector
+			:param t0: initial time
+			:param x0: state at time t0
+			:param f0: derivative at time t0
+			:param capacity: initial size of the buffer
+			:type phi: Callable or np.array[float]
+			:type t0: np.float
+			:type x0: np.array[float]
+			:type f0: np.array[float]
+			:type capacity: int
+
+		"""
+		self._phi = phi;
+		self._t0 = t0;
+		self._t = np.empty(capacity, float);
+		self._x = np.empty((capacity, np.size(x0)), float);
+		self._f = np.empty((capacity, np.size(x0)), float);
+		self._start = 0;
+		self._end = 0;
+		self.append(t0, x0, f0);
+
+	def __len__(self):
+		return self._end - self._start;
+
+	@property
+	def capacity(self):
+		return self._t.size;
+
+	def append(self, t : float, x, f):
+		"""Function appending a step (time t, state x, derivative f), compacting or enlarging the buffer if full.
+		"""
+		if self._end == self._t.size:
+			n = self._end - self._start;
+			capacity = self._t.size if 2*n <= self._t.size else 2*self._t.size;
+			for name in ('_t', '_x', '_f'):
+				buf = getattr(self, name);
+				new = np.empty((capacity,) + buf.shape[1:], float) if capacity != buf.shape[0] else buf;
+				new[:n] = buf[self._start:self._end];
+				setattr(self, name, new);
+			self._start, self._end = 0, n;
+
+		self._t[self._end] = t;
+		self._x[self._end] = x;
+		self._f[self._end] = f;
+		self._end += 1;
+
+	def prune(self, tmin : float):
+		"""Function dropping the steps not needed for evaluating the states at times >= tmin.
+		"""
+		k = np.searchsorted(self._t[self._start:self._end], tmin, side='right') - 1;
+		self._start += max(min(k, self._end - self._start - 1), 0);
+
+	def __call__(self, tq):
+		"""Function evaluating the states at times tq (after the last step, the last interval is extrapolated).
+
+		- **parameters**, **types**, **return** and **return types**::
+			:param tq: times
+			:type tq: np.array[float]
+			:return: Vector z containing component j at time tq[k] (z[k,j])
+			:rtype: np.array[float,float]
+
+		"""
+		tq = np.asarray(tq, float);
+		t = self._t[self._start:self._end];
+		x = self._x[self._start:self._end];
+		f = self._f[self._start:self._end];
+
+		if t.size < 2:
+			# only the initial condition is known: linear extrapolation
+			z = x[0] + (tq - t[0])[:,None]*f[0];
+		else:
+			# binary search of the interval [t[i], t[i+1]] containing each time
+			i = np.minimum(np.maximum(np.searchsorted(t, tq, side='right') - 1, 0), t.size - 2);
+			hk = (t[i+1] - t[i])[:,None];
+			s = (tq - t[i])[:,None]/hk;
+
+			# cubic Hermite interpolation
+			z = ((2*s - 3)*s*s + 1)*x[i] + ((s - 2)*s + 1)*s*hk*f[i] + (3 - 2*s)*s*s*x[i+1] + (s - 1)*s*s*hk*f[i+1];
+
+		# before the initial time, the initial history
+		if tq.min() <= self._t0:
+			for k in np.flatnonzero(tq <= self._t0):
+				z[k] = self._phi(tq[k]) if callable(self._phi) else self._phi;
+
+		return z;
@@ -0,0 +1,75 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Internal implementation of the weighted RMS norm used for error control and Newton convergence.
+#
+
+import numpy as np
+
+def _wrmsnorm(rtol, atol, n : int):
+	"""Internal function returning the weighted RMS norm defined by relative and absolute tolerances:
+		||v|| = sqrt(mean((v_j/w_j)^2)),  w_j = atol_j + rtol_j max(|x_j|, |y_j|)
+	x and y being two states (e.g. the current one and the new one), so that ||v|| <= 1 means that
+	v is within the tolerances. If only one of rtol and atol is given, the other one is set to its
+	default (rtol = 1e-3, atol = 1e-6), and if none is given None is returned (legacy absolute norms).
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param rtol: relative tolerance (scalar or per component)
+		:param atol: absolute tolerance (scalar or per component)
+		:param n: number of components
+		:type rtol: np.float or np.array[float]
+		:type atol: np.float or np.array[float]
+		:type n: int
+		:return: function (v, x, y) returning the weighted RMS norm of v
+		:rtype: Callable
+
+	"""
+	if rtol is None and atol is None:
+		return None;
+
+	rtol, atol = _tolerances(rtol, atol).values();
+	rtol = np.broadcast_to(np.asarray(rtol, float), (n,)).copy();
+	atol = np.broadcast_to(np.asarray(atol, float), (n,)).copy();
+
+	if np.any(rtol < 0.0) or np.any(atol <= 0.0):
+		raise ValueError('The relative tolerances must be non-negative and the absolute tolerances positive')
+
+	def norm(v, x, y):
+		w = atol + rtol*np.maximum(np.abs(x), np.abs(y));
+		return np.sqrt(np.mean((np.ravel(v)/w)**2));
+
+	return norm;
+
+
+def _tolerances(rtol, atol) -> dict:
+	"""Internal function returning the tolerances with their defaults (rtol = 1e-3, atol = 1e-6) if only one is given,
+		as keyword arguments (e.g. for a checkpoint). It returns an empty dictionary if none is given.
+	"""
+	if rtol is None and atol is None:
+		return {};
+	return {'rtol': 1.0e-3 if rtol is None else rtol, 'atol': 1.0e-6 if atol is None else atol};
+
+
+def _scalednorm(delta, TOL, norm, x, y):
+	"""Internal function returning the norm of a correction delta (e.g. of a Newton iteration), scaled by the tolerance:
+	||delta||/TOL in the 2-norm if norm is None (legacy), norm(delta, x, y) otherwise.
+	The iteration has converged when it is <= 1.
+	"""
+	if norm is None:
+		return np.linalg.norm(delta)/TOL;
+	return norm(delta, x, y);
+
+
+def _tolerancescale(TOL, norm, x, y):
+	"""Internal function returning the tolerance of a convergence test (see _scalednorm) in absolute units:
+	the 2-norm of the uniform vector whose scaled norm is 1, i.e. TOL if norm is None (legacy).
+	It scales the tolerances of the inner iterations (e.g. the linear solves of a Newton iteration).
+	"""
+	if norm is None:
+		return TOL;
+	ones = np.ones(np.size(x));
+	return np.linalg.norm(ones)/norm(ones, x, y);
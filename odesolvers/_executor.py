@@ -0,0 +1,52 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Internal helpers for running independent evaluations on executors.
+#
+
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+
+def _get_executor(executor, workers : int = None):
+	"""Internal function returning the executor to be used.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param executor: executor, or 'thread' (resp. 'process') for a new thread (resp. process) pool
+		:param workers: number of workers of the new pool (default as in concurrent.futures)
+		:type executor: concurrent.futures.Executor or str
+		:type workers: int
+		:return: executor, whether it has been created here (and must be shut down by the caller)
+		:rtype: concurrent.futures.Executor, bool
+
+	"""
+	if isinstance(executor, Executor):
+		return executor, False;
+
+	if workers is not None and workers < 1:
+		raise ValueError('The number of workers must be positive')
+
+	if executor == 'thread':
+		return ThreadPoolExecutor(max_workers=workers), True;
+	if executor == 'process':
+		return ProcessPoolExecutor(max_workers=workers), True;
+
+	raise ValueError("The executor must be a concurrent.futures.Executor, 'thread' or 'process'")
+
+
+def _nworkers(workers : int = None) -> int:
+	"""Internal function returning the number of workers among which independent evaluations are split
+	(default to the number of CPUs, as for a new process pool).
+	"""
+	return workers if workers is not None else (os.cpu_count() or 1);
+
+
+def _chunks(n : int, k : int):
+	"""Internal function splitting range(n) into (at most) k contiguous chunks of similar size.
+	"""
+	k = max(1, min(n, k));
+	bounds = [(n*c)//k for c in range(k+1)];
+	return [range(bounds[c], bounds[c+1]) for c in range(k)];
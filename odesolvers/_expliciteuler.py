@@ -8,7 +8,9 @@
 # Internal implementation of the Explicit Euler method for ODEs numerical solution.
 #
 
-def _ExplicitEuler_step(f, xi, ti, h):
+from ._async import _evaluate, _run
+
+def _ExplicitEuler_step(f, xi, ti, h, fi = None):
 	"""Internal function implementing one step of the Explicit Euler method.
 
 	The ODE to be solved is of the form: x' = f(t,x), x being a vector in n-dimensions
@@ -17,15 +19,31 @@ def _ExplicitEuler_step(f, xi, ti, h):
 		:param f: function in x' = f(t,x)
 		:param xi: current time
 		:param h: step size
+		:param fi: f(ti,xi), if already evaluated
 		:type f: Callable
 		:type xi: np.array[float]
 		:type ti: np.float
 		:type h: np.float
+		:type fi: np.array[float]
 		:return: Vector x containing solution of component j at current time ti (x[j])
 		:rtype: np.array[float]
 
 	"""
 
-	xnext = xi + h*f(ti, xi);
+	return _run(_ExplicitEuler_step_async(f, xi, ti, h, fi));
+
+
+async def _ExplicitEuler_step_async(f, xi, ti, h, fi = None):
+	"""Internal coroutine implementing one step of the Explicit Euler method,
+		f being possibly a coroutine function.
+
+	See _ExplicitEuler_step for the parameters.
+
+	"""
+
+	if fi is None:
+		fi = await _evaluate(f, ti, xi);
+
+	xnext = xi + h*fi;
 
 	return xnext;
@@ -0,0 +1,217 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Internal implementation of the phi-functions and of the exponential integrators steps.
+#
+# phi_0(z) = exp(z), phi_{k+1}(z) = (phi_k(z) - 1/k!)/z
+#
+
+import numpy as np
+from scipy.linalg import expm
+
+from ._linalg import _matvec
+
+def _phi_dense(Z, p : int):
+	"""Internal function computing the matrices phi_k(Z), k = 0..p.
+
+	The phi-functions are obtained from the exponential of the augmented matrix
+		[[Z, I, 0, ...], [0, 0, I, ...], ..., [0, 0, 0, ...]],
+	whose first block row is [phi_0(Z), phi_1(Z), ..., phi_p(Z)].
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param Z: square matrix
+		:param p: highest phi-function needed
+		:type Z: np.array[float,float]
+		:type p: int
+		:return: list of the matrices phi_k(Z)
+		:rtype: list[np.array[float,float]]
+
+	"""
+	m = Z.shape[0];
+	M = np.zeros(((p+1)*m, (p+1)*m));
+	M[:m,:m] = Z;
+	for k in range(p):
+		M[k*m:(k+1)*m, (k+1)*m:(k+2)*m] = np.identity(m);
+
+	E = expm(M);
+
+	return [E[:m, k*m:(k+1)*m] for k in range(p+1)];
+
+
+def _expv(C, u, m : int, tol : float, maxsteps : int = 1000):
+	"""Internal function computing the action exp(C) u of the exponential of a matrix, given by its products with vectors,
+		by projection on Krylov subspaces of dimension m, with time stepping (as expokit, Sidje):
+		exp(C) u = exp(tau_s C) ... exp(tau_1 C) u,  tau_1 + ... + tau_s = 1.
+
+	Each substep tau is accepted when the a-posteriori estimate of the error of the Krylov approximation (Saad)
+		beta h_{m+1,m} tau |e_m^T phi_1(tau H_m) e_1|
+	is within tol tau (i.e. tol in total, relative to the norm of u), the next one being chosen accordingly.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param C: function returning the product of the matrix with a vector
+		:param u: vector
+		:param m: (maximum) dimension of the Krylov subspaces
+		:param tol: tolerance, relative to the norm of u
+		:param maxsteps: maximum number of substeps
+		:type C: Callable
+		:type u: np.array[float]
+		:type m: int
+		:type tol: np.float
+		:type maxsteps: int
+		:return: vector exp(C) u
+		:rtype: np.array[float]
+
+	"""
+	tol = tol*np.linalg.norm(u);
+	m = min(m, u.size);
+	w = np.array(u, float);
+	t, tau = 0.0, 1.0;
+
+	for s in range(maxsteps):
+		beta = np.linalg.norm(w);
+		if beta == 0.0 or t >= 1.0:
+			return w;
+
+		V = np.zeros((m+1, u.size));
+		H = np.zeros((m+1, m));
+		V[0] = w/beta;
+
+		# Arnoldi iteration (modified Gram-Schmidt)
+		k = m;
+		for j in range(m):
+			v = C(V[j]);
+			for i in range(j+1):
+				H[i,j] = np.dot(v, V[i]);
+				v -= H[i,j]*V[i];
+			H[j+1,j] = np.linalg.norm(v);
+			if H[j+1,j] <= 1.0e-12*np.linalg.norm(H[:j+2,j]):
+				k = j+1;		# happy breakdown: the subspace is invariant, and the projection exact
+				break
+			V[j+1] = v/H[j+1,j];
+
+		tau = min(tau, 1.0 - t);
+		while True:
+			phis = _phi_dense(tau*H[:k,:k], 1);
+			err = 0.0 if k < m or H[m,m-1] == 0.0 else beta*H[m,m-1]*tau*abs(phis[1][m-1,0]);
+			if err <= tol*tau:
+				break
+			tau *= max(0.1, min(0.5, 0.9*(tol*tau/err)**(1.0/m)));
+			if t + tau == t:
+				raise ArithmeticError('Krylov approximation of the exponential has not converged')
+
+		w = beta*np.dot(phis[0][:,0], V[:k]);
+		t = 1.0 if tau >= 1.0 - t else t + tau;
+		if err > 0.0:
+			tau *= min(5.0, 0.9*(tol*tau/err)**(1.0/m));
+		else:
+			tau = 1.0;
+
+	raise ArithmeticError('Krylov approximation of the exponential has not converged within %d substeps' % maxsteps)
+
+
+def _phi_krylov(A, v, h : float, p : int, m : int, tol : float = 1.0e-8):
+	"""Internal function computing the action phi_p(hA) v, p >= 1, by Krylov projections with time stepping.
+
+	phi_p(hA) v is the first block of exp(C) [0, e_p], with the augmented matrix (Sidje; Niesen and Wright)
+		C = [[hA, v e_1^T], [0, J]],  J being the p x p shift matrix (ones on the superdiagonal),
+	computed by _expv with error control. Only products of A with vectors are needed (A can be sparse or banded).
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param A: matrix
+		:param v: vector
+		:param h: step size
+		:param p: index of the phi-function
+		:param m: (maximum) dimension of the Krylov subspaces
+		:param tol: tolerance, relative to the norm of v
+		:type A: ((int, int), np.array[float,float]) or scipy.sparse matrix
+		:type v: np.array[float]
+		:type h: np.float
+		:type p: int
+		:type m: int
+		:type tol: np.float
+		:return: vector phi_p(hA) v
+		:rtype: np.array[float]
+
+	"""
+	beta = np.linalg.norm(v);
+	if beta == 0.0:
+		return np.zeros(v.size);
+
+	n = v.size;
+	vn = v/beta;
+
+	def C(y):
+		z = np.empty(y.size);
+		z[:n] = h*_matvec(A, y[:n]) + y[n]*vn;
+		z[n:-1] = y[n+1:];
+		z[-1] = 0.0;
+		return z;
+
+	u = np.zeros(n + p);
+	u[-1] = 1.0;
+
+	return beta*_expv(C, u, m, tol)[:n];
+
+
+def _ExponentialEuler_step(A, N, xi, ti, h, phi):
+	"""Internal function implementing one step of the Exponential Euler method:
+		x_{n+1} = x_n + h phi_1(hA)(A x_n + N(t_n,x_n))
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param A: matrix of the linear part
+		:param N: nonlinear part (None if zero)
+		:param xi: initial condition at time ti
+		:param ti: current time
+		:param h: step size
+		:param phi: function (k, v) returning phi_k(hA) v
+		:type A: np.array[float,float], ((int, int), np.array[float,float]) or scipy.sparse matrix
+		:type N: Callable
+		:type xi: np.array[float]
+		:type ti: np.float
+		:type h: np.float
+		:type phi: Callable
+		:return: Vector x containing solution of component j at next time ti+h (x[j])
+		:rtype: np.array[float]
+
+	"""
+	F = _matvec(A, xi);
+	if N is not None:
+		F = F + N(ti, xi);
+
+	return xi + h*phi(1, F);
+
+
+def _ETDRK2_step(A, N, xi, ti, h, phi):
+	"""Internal function implementing one step of the exponential Runge-Kutta method
+		of order 2 (ETD2RK, Cox and Matthews):
+		a = x_n + h phi_1(hA)(A x_n + N(t_n,x_n))
+		x_{n+1} = a + h phi_2(hA)(N(t_{n+1},a) - N(t_n,x_n))
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param A: matrix of the linear part
+		:param N: nonlinear part (None if zero)
+		:param xi: initial condition at time ti
+		:param ti: current time
+		:param h: step size
+		:param phi: function (k, v) returning phi_k(hA) v
+		:type A: np.array[float,float], ((int, int), np.array[float,float]) or scipy.sparse matrix
+		:type N: Callable
+		:type xi: np.array[float]
+		:type ti: np.float
+		:type h: np.float
+		:type phi: Callable
+		:return: Vector x containing solution of component j at next time ti+h (x[j])
+		:rtype: np.array[float]
+
+	"""
+	if N is None:		# the linear part is solved exactly by the first stage
+		return _ExponentialEuler_step(A, N, xi, ti, h, phi);
+
+	Ni = N(ti, xi);
+	a = xi + h*phi(1, _matvec(A, xi) + Ni);
+
+	return a + h*phi(2, N(ti+h, a) - Ni);
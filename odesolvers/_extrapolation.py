@@ -0,0 +1,167 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Internal implementation of the extrapolation methods: Gragg-Bulirsch-Stoer (explicit midpoint rule)
+# and linearly implicit Euler, with Aitken-Neville extrapolation and adaptive order and stepsize.
+#
+
+import numpy as np
+
+from ._expliciteuler import _ExplicitEuler_step
+from ._linalg import _shifted, _factorize
+
+def _Gragg_sequence(f, xi, ti, H, n, fi):
+	"""Internal function implementing n substeps of the explicit midpoint rule (Gragg) over [ti, ti+H],
+		started with one Explicit Euler step. Its error has an expansion in even powers of H/n.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param f: function in x' = f(t,x)
+		:param xi: initial condition at time ti
+		:param ti: current time
+		:param H: (macro) step size
+		:param n: (even) number of substeps
+		:param fi: f(ti,xi)
+		:type f: Callable
+		:type xi: np.array[float]
+		:type ti: np.float
+		:type H: np.float
+		:type n: int
+		:type fi: np.array[float]
+		:return: Vector x containing solution of component j at time ti+H (x[j])
+		:rtype: np.array[float]
+
+	"""
+	h = H/n;
+	xprev = xi;
+	x = _ExplicitEuler_step(f, xi, ti, h, fi);
+	for m in range(1, n):
+		xprev, x = x, xprev + 2*h*f(ti+m*h, x);
+	return x;
+
+
+def _LinearlyImplicitEuler_sequence(f, J, xi, ti, H, n, fi):
+	"""Internal function implementing n substeps of the linearly implicit Euler method over [ti, ti+H]:
+		(I - h J) (x_{m+1} - x_m) = h f(t_m,x_m)
+	J being the Jacobian at (ti,xi). Its error has an expansion in powers of H/n.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param f: function in x' = f(t,x)
+		:param J: Jacobian of f at (ti,xi)
+		:param xi: initial condition at time ti
+		:param ti: current time
+		:param H: (macro) step size
+		:param n: number of substeps
+		:param fi: f(ti,xi)
+		:type f: Callable
+		:type J: np.array[float,float], ((int, int), np.array[float,float]) or scipy.sparse matrix
+		:type xi: np.array[float]
+		:type ti: np.float
+		:type H: np.float
+		:type n: int
+		:type fi: np.array[float]
+		:return: Vector x containing solution of component j at time ti+H (x[j])
+		:rtype: np.array[float]
+
+	"""
+	h = H/n;
+	solve = _factorize(_shifted(J, h));
+	x = xi + solve(h*fi);
+	for m in range(1, n):
+		x = x + solve(h*f(ti+m*h, x));
+	return x;
+
+
+def _Extrapolation_step(f, df, xi, ti, H, k, ETOL, kmax, linearlyimplicit, norm = None):
+	"""Internal function implementing one (accepted) step of the extrapolation method.
+
+	Row j of the extrapolation table is started with n_j substeps (n_j = 2(j+1) for Gragg, j+1 for
+	linearly implicit Euler) and extrapolated with the Aitken-Neville algorithm. The local error is
+	estimated by the difference of the last two entries of a row, in the RMS norm weighted by
+	ETOL (1 + |x|), or in the given weighted norm. The step is accepted at row k or k+1, and the next row and stepsize are those
+	minimizing the work (number of function evaluations) per unit step, as in ODEX/SEULEX (Hairer and Wanner).
+	Rejected steps are retried with a smaller stepsize.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param f: function in x' = f(t,x)
+		:param df: Jacobian of f (only if linearlyimplicit)
+		:param xi: initial condition at time ti
+		:param ti: current time
+		:param H: guess on the step size
+		:param k: target row of the extrapolation table
+		:param ETOL: Error tolerance
+		:param kmax: number of rows of the extrapolation table
+		:param linearlyimplicit: whether to use the linearly implicit Euler method instead of Gragg
+		:param norm: weighted norm of the local error (None for the RMS norm weighted by ETOL (1 + |x|))
+		:type f: Callable
+		:type df: Callable
+		:type xi: np.array[float]
+		:type ti: np.float
+		:type H: np.float
+		:type k: int
+		:type ETOL: np.float
+		:type kmax: int
+		:type linearlyimplicit: bool
+		:type norm: Callable
+		:return: Vector x containing solution of component j at next time (x[j]), corresponding stepsize,
+					guessed stepsize and row for following iteration
+		:rtype: np.array[float], np.float, np.float, int
+
+	"""
+
+	fi = f(ti, xi);
+	if linearlyimplicit:
+		J = df(ti, xi);
+		n = np.arange(1, kmax+1);
+		p = 1;			# the error expands in powers of H
+		sequence = lambda H, nj: _LinearlyImplicitEuler_sequence(f, J, xi, ti, H, nj, fi);
+	else:
+		n = 2*np.arange(1, kmax+1);
+		p = 2;			# the error expands in even powers of H
+		sequence = lambda H, nj: _Gragg_sequence(f, xi, ti, H, nj, fi);
+
+	A = 1 + np.cumsum(n);			# work to compute row j
+	Hopt = np.empty(kmax);
+	W = np.empty(kmax);
+
+	while True:
+		if ti + H == ti:
+			raise ArithmeticError('Stepsize underflow in the extrapolation method')
+
+		T = [];
+		for j in range(min(k+2, kmax)):
+			# new row of the extrapolation table (Aitken-Neville)
+			T.append([sequence(H, n[j])]);
+			for l in range(1, j+1):
+				T[j].append(T[j][l-1] + (T[j][l-1] - T[j-1][l-1])/((n[j]/n[j-l])**p - 1));
+
+			if j == 0:
+				continue
+
+			if norm is None:
+				sc = ETOL*(1.0 + np.maximum(np.abs(xi), np.abs(T[j][j])));
+				err = np.sqrt(np.mean(((T[j][j] - T[j][j-1])/sc)**2));
+			else:
+				err = norm(T[j][j] - T[j][j-1], xi, T[j][j]);
+			fac = 0.94*(0.65/err)**(1.0/(p*j+1)) if err > 0.0 else 4.0;
+			Hopt[j] = H*min(4.0, max(0.02, fac));
+			W[j] = A[j]/Hopt[j];
+
+			if j >= k and err <= 1.0:
+				# step accepted: choosing the row and the stepsize for the following step
+				if j > 1 and W[j-1] < 0.8*W[j]:
+					knew, Hnew = j-1, Hopt[j-1];
+				elif j == k and j+1 < kmax-1 and W[j] < 0.9*W[j-1]:
+					knew, Hnew = j+1, Hopt[j]*A[j+1]/A[j];
+				else:
+					knew, Hnew = j, Hopt[j];
+
+				return T[j][j], H, Hnew, min(max(knew, 1), kmax-2);
+
+		# step rejected: retrying with the optimal stepsize of row k (or k-1, if cheaper)
+		if k > 1 and W[k-1] < 0.8*W[k]:
+			k -= 1;
+		H = min(Hopt[k], 0.5*H);
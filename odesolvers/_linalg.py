@@ -0,0 +1,168 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Internal linear algebra helpers for dense, banded and sparse matrices.
+#
+# Banded matrices are stored as in scipy.linalg.solve_banded, i.e. as a tuple ((l, u), ab)
+# with ab[u + i - j, j] == a[i,j].
+#
+
+import numpy as np
+import scipy.sparse
+from scipy.linalg import lu_factor, lu_solve, get_lapack_funcs, solve_banded
+from scipy.sparse.linalg import splu, spsolve
+
+def _isbanded(A) -> bool:
+	"""Internal function checking whether A is a banded matrix ((l, u), ab).
+	"""
+	return isinstance(A, tuple) and len(A) == 2 and len(A[0]) == 2;
+
+
+def _shape(A):
+	"""Internal function returning the shape of a dense, banded or sparse matrix.
+	"""
+	if _isbanded(A):
+		n = A[1].shape[1];
+		return (n, n);
+	return A.shape;
+
+
+def _matvec(A, x):
+	"""Internal function computing the product A x, A being a dense, banded or sparse matrix.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param A: matrix
+		:param x: vector
+		:type A: np.array[float,float], ((int, int), np.array[float,float]) or scipy.sparse matrix
+		:type x: np.array[float]
+		:return: product A x
+		:rtype: np.array[float]
+
+	"""
+	if not _isbanded(A):
+		return A.dot(x);
+
+	(l, u), ab = A;
+	n = ab.shape[1];
+	y = ab[u]*x;
+	for k in range(1, u+1):		# super-diagonals
+		y[:n-k] += ab[u-k, k:]*x[k:];
+	for k in range(1, l+1):		# sub-diagonals
+		y[k:] += ab[u+k, :n-k]*x[:n-k];
+	return y;
+
+
+def _shifted(A, c : float, d : float = 1.0):
+	"""Internal function computing d I - c A, in the same format as A.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param A: matrix
+		:param c: coefficient of A
+		:param d: coefficient of the identity
+		:type A: np.array[float,float], ((int, int), np.array[float,float]) or scipy.sparse matrix
+		:type c: np.float
+		:type d: np.float
+		:return: d I - c A
+		:rtype: same as A
+
+	"""
+	if _isbanded(A):
+		(l, u), ab = A;
+		M = -c*ab;
+		M[u] += d;
+		return ((l, u), M);
+	if scipy.sparse.issparse(A):
+		return (d*scipy.sparse.identity(A.shape[0], format='csc') - c*A).tocsc();
+	return d*np.identity(A.shape[0]) - c*A;
+
+
+def _tosparse(A):
+	"""Internal function converting a dense, banded or sparse matrix to a scipy.sparse (CSC) matrix.
+	"""
+	if _isbanded(A):
+		(l, u), ab = A;
+		n = ab.shape[1];
+		# row u-k of ab stores the diagonal of offset k (ab[u-k, j] == a[j-k, j])
+		return scipy.sparse.dia_matrix((ab, np.arange(u, -l-1, -1)), shape=(n, n)).tocsc();
+	return scipy.sparse.csc_matrix(A);
+
+
+def _tobanded(A):
+	"""Internal function converting a dense or sparse matrix to the banded format ((l, u), ab),
+	l and u being its lower and upper bandwidths.
+	"""
+	A = scipy.sparse.coo_matrix(A);
+	n = A.shape[0];
+	l = max(int(np.max(A.row - A.col, initial=0)), 0);
+	u = max(int(np.max(A.col - A.row, initial=0)), 0);
+	ab = np.zeros((l + u + 1, n), dtype=np.result_type(A.dtype, float));
+	np.add.at(ab, (u + A.row - A.col, A.col), A.data);
+	return ((l, u), ab);
+
+
+def _solve(A, b):
+	"""Internal function solving A x = b once, A being a dense, banded (scipy.linalg.solve_banded) or sparse matrix.
+	"""
+	if _isbanded(A):
+		return solve_banded(A[0], A[1], b);
+	if scipy.sparse.issparse(A):
+		return spsolve(scipy.sparse.csc_matrix(A), b);
+	return np.linalg.solve(A, b);
+
+
+def _combination(M, c : float, J):
+	"""Internal function computing M - c J, M and J being dense, banded or sparse matrices.
+
+	The result is banded if both are banded with the same bandwidths, dense if both are dense, and sparse otherwise.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param M: matrix
+		:param c: coefficient of J
+		:param J: matrix
+		:type M: np.array[float,float], ((int, int), np.array[float,float]) or scipy.sparse matrix
+		:type c: np.float
+		:type J: np.array[float,float], ((int, int), np.array[float,float]) or scipy.sparse matrix
+		:return: M - c J
+		:rtype: np.array[float,float], ((int, int), np.array[float,float]) or scipy.sparse matrix
+
+	"""
+	if _isbanded(M) and _isbanded(J) and tuple(M[0]) == tuple(J[0]):
+		return (M[0], M[1] - c*J[1]);
+	if _isbanded(M) or _isbanded(J) or scipy.sparse.issparse(M) or scipy.sparse.issparse(J):
+		return (_tosparse(M) - c*_tosparse(J)).tocsc();
+	return M - c*J;
+
+
+def _factorize(M):
+	"""Internal function factorizing a (dense, banded or sparse) matrix M once.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param M: matrix to be factorized
+		:type M: np.array[float,float], ((int, int), np.array[float,float]) or scipy.sparse matrix
+		:return: function solving M x = b for given b
+		:rtype: Callable
+
+	"""
+	if _isbanded(M):
+		(l, u), ab = M;
+		# LAPACK banded LU needs l additional rows to store the fill-in
+		abf = np.zeros((2*l + u + 1, ab.shape[1]), dtype=np.result_type(ab, float));
+		abf[l:,:] = ab;
+		gbtrf, gbtrs = get_lapack_funcs(('gbtrf', 'gbtrs'), (abf,));
+		lu, piv, info = gbtrf(abf, l, u);
+		if info > 0:
+			raise np.linalg.LinAlgError('Singular matrix');
+		def solve(b):
+			x, info = gbtrs(lu, l, u, b, piv);
+			return x;
+		return solve;
+
+	if scipy.sparse.issparse(M):
+		return splu(scipy.sparse.csc_matrix(M)).solve;
+
+	lu = lu_factor(M);
+	return lambda b: lu_solve(lu, b);
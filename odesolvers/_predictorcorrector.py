@@ -10,7 +10,10 @@
 
 import numpy as np
 
-def _PECE_step(f, xi, ti, h, fpast, hpast, hpred, ETOL):
+from ._async import _evaluate, _run
+from .controllers import _DoublingController
+
+def _PECE_step(f, xi, ti, h, fpast, hpast, hpred, ETOL, controller = None, norm = None):
 	"""Internal function implementing one step of the Predictor-Corrector
 		linear multistep method.
 
@@ -25,6 +28,8 @@ def _PECE_step(f, xi, ti, h, fpast, hpast, hpred, ETOL):
 		:param hpast: previous step sizes
 		:param hpred: predicted step size to be used
 		:param TOL: Error tolerance
+		:param controller: stepsize controller (None for the legacy one)
+		:param norm: weighted norm of the local error (None for the 2-norm per unit step with ETOL)
 		:type f: Callable
 		:type xi: np.array[float]
 		:type ti: np.float
@@ -33,10 +38,22 @@ def _PECE_step(f, xi, ti, h, fpast, hpast, hpred, ETOL):
 		:type hpast: Ringbuffer(float)
 		:type hpred: np.float
 		:type TOL: np.float
+		:type controller: StepController
+		:type norm: Callable
 		:return: Vector x containing solution of component j at next time ti+h (x[j]),
 					corresponding stepsize hi, guessed stepsize for following iteration hfuture
 		:rtype: np.array[float], float, float
 
+	"""
+	return _run(_PECE_step_async(f, xi, ti, h, fpast, hpast, hpred, ETOL, controller, norm));
+
+
+async def _PECE_step_async(f, xi, ti, h, fpast, hpast, hpred, ETOL, controller = None, norm = None):
+	"""Internal coroutine implementing one step of the Predictor-Corrector
+		linear multistep method, f being possibly a coroutine function.
+
+	See _PECE_step for the parameters.
+
 	"""
 	if xi.size > 1:
 		fpast0 = fpast[0,:];
@@ -49,9 +66,23 @@ def _PECE_step(f, xi, ti, h, fpast, hpast, hpred, ETOL):
 		# Predictor: AB2
 		yp = xi + h*fpast1 + ((fpast1 - fpast0)/hpast[0])*h*h*0.5;
 		# Corrector: AM2
-		yc = xi + h*0.5*(f((ti+h), yp) + fpast1);
+		yc = xi + h*0.5*((await _evaluate(f, (ti+h), yp)) + fpast1);
 
 		return yc, h, h;
+	elif controller is not None or norm is not None:	# adaptive stepsize, pluggable controller
+		if controller is None:
+			controller = _DoublingController();
+		# the local error estimate lte is of order hstep^3, and the default measure hstep*|lte|/ETOL of order hstep^4
+		k = 4 if norm is None else 3;
+		hstep = hpred;
+		while True:
+			yp = xi + hstep*fpast1 + ((fpast1 - fpast0)/hpast[0])*hstep*hstep*0.5;
+			yc = xi + hstep*0.5*((await _evaluate(f, (ti+hstep), yp)) + fpast1);
+			lte = 5/6*(yc - yp);
+			err = hstep*np.linalg.norm(lte)/ETOL if norm is None else norm(lte, xi, yc);
+			if err <= 1.0:
+				return yc, hstep, controller.accept(hstep, err, k);
+			hstep = controller.reject(hstep, err, k);
 	else:					# adaptive stepsize
 		hstep = hpred;
 		lte : np.float = 0.0;	# initializing estimate of local truncation error
@@ -59,7 +90,7 @@ def _PECE_step(f, xi, ti, h, fpast, hpast, hpred, ETOL):
 			# Predictor: AB2
 			yp = xi + hstep*fpast1 + ((fpast1 - fpast0)/hpast[0])*hstep*hstep*0.5;
 			# Corrector: AM2
-			yc = xi + hstep*0.5*(f((ti+hstep), yp) + fpast1);
+			yc = xi + hstep*0.5*((await _evaluate(f, (ti+hstep), yp)) + fpast1);
 			lte = (5/6*np.linalg.norm(yc - yp));
 			if hstep*lte <= ETOL:
 				break			# step accepted, exiting loop
@@ -72,3 +103,4 @@ def _PECE_step(f, xi, ti, h, fpast, hpast, hpred, ETOL):
 			hfuture = hstep;		# same stepsize for following iteration
 
 		return yc, hstep, hfuture;
+
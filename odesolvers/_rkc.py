@@ -0,0 +1,195 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Internal implementation of the Runge-Kutta-Chebyshev method (stabilized explicit, second order)
+# and of the estimation of the spectral radius of the Jacobian by nonlinear power iteration.
+#
+
+import numpy as np
+from functools import lru_cache
+
+_EPS = 2.0/13.0;		# damping of the Chebyshev polynomials (as in RKC)
+
+@lru_cache(maxsize=None)
+def _RKC_coefficients(s : int):
+	"""Internal function computing the coefficients of the s-stage (damped) Runge-Kutta-Chebyshev method of order 2
+	(van der Houwen and Sommeijer; Sommeijer, Shampine and Verwer):
+		Y_0 = x_n,  Y_1 = Y_0 + mut_1 h F_0,
+		Y_j = (1 - mu_j - nu_j) Y_0 + mu_j Y_{j-1} + nu_j Y_{j-2} + mut_j h F_{j-1} + gt_j h F_0,  j = 2, ..., s
+	F_j being f(t_n + c_j h, Y_j), and x_{n+1} = Y_s. The stability polynomial is a shifted Chebyshev polynomial,
+	whose interval of stability on the negative real axis has length beta(s) ~ 0.653 s^2.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param s: number of stages (at least 2)
+		:type s: int
+		:return: coefficients mu, nu, mut, gt and c (indexed by the stage j = 0, ..., s), and beta(s)
+		:rtype: np.array[float], np.array[float], np.array[float], np.array[float], np.array[float], np.float
+
+	"""
+	w0 = 1.0 + _EPS/s**2;
+
+	# Chebyshev polynomials T_j(w0) and their first two derivatives
+	T, dT, ddT = np.zeros(s+1), np.zeros(s+1), np.zeros(s+1);
+	T[0], T[1], dT[1] = 1.0, w0, 1.0;
+	for j in range(2, s+1):
+		T[j] = 2*w0*T[j-1] - T[j-2];
+		dT[j] = 2*T[j-1] + 2*w0*dT[j-1] - dT[j-2];
+		ddT[j] = 4*dT[j-1] + 2*w0*ddT[j-1] - ddT[j-2];
+	w1 = dT[s]/ddT[s];
+
+	b = np.empty(s+1);
+	b[2:] = ddT[2:]/dT[2:]**2;
+	b[0] = b[1] = b[2];
+
+	mu, nu, mut, gt = np.zeros(s+1), np.zeros(s+1), np.zeros(s+1), np.zeros(s+1);
+	mut[1] = b[1]*w1;
+	for j in range(2, s+1):
+		mu[j] = 2*b[j]*w0/b[j-1];
+		nu[j] = -b[j]/b[j-2];
+		mut[j] = 2*b[j]*w1/b[j-1];
+		gt[j] = -(1.0 - b[j-1]*T[j-1])*mut[j];
+
+	# times of the stages (the method is exact on x' = 1)
+	c = np.zeros(s+1);
+	c[1] = mut[1];
+	for j in range(2, s+1):
+		c[j] = mu[j]*c[j-1] + nu[j]*c[j-2] + mut[j] + gt[j];
+
+	return mu, nu, mut, gt, c, (w0 + 1.0)*ddT[s]/dT[s];
+
+
+def _stages(h : float, rho : float) -> int:
+	"""Internal function returning the number of stages making the RKC method stable for the stepsize h,
+	the eigenvalues of the Jacobian lying (close to) the interval [-rho, 0] (h rho <= 0.653 s^2, as in RKC).
+	"""
+	return 1 + int(np.sqrt(1.0 + 1.54*h*rho));
+
+
+def _RKC_stages(f, xi, ti, h, s, fi):
+	"""Internal function implementing one step of the s-stage RKC method.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param f: function in x' = f(t,x)
+		:param xi: initial condition at time ti
+		:param ti: current time
+		:param h: step size
+		:param s: number of stages
+		:param fi: f(ti,xi)
+		:type f: Callable
+		:type xi: np.array[float]
+		:type ti: np.float
+		:type h: np.float
+		:type s: int
+		:type fi: np.array[float]
+		:return: Vector x containing solution of component j at time ti+h (x[j])
+		:rtype: np.array[float]
+
+	"""
+	mu, nu, mut, gt, c, _ = _RKC_coefficients(s);
+
+	yprev, y = xi, xi + mut[1]*h*fi;
+	for j in range(2, s+1):
+		yprev, y = y, (1.0 - mu[j] - nu[j])*xi + mu[j]*y + nu[j]*yprev + h*(mut[j]*f(ti + c[j-1]*h, y) + gt[j]*fi);
+	return y;
+
+
+def _RKC_step(f, xi, ti, H, fi, rho, smax, controller, errnorm):
+	"""Internal function implementing one (accepted) step of the RKC method, with stepsize control.
+
+	The number of stages is chosen from the spectral radius rho for the step to be stable, the stepsize being
+	limited so that it does not exceed smax. The local error is estimated (as in RKC) by
+		est = 0.8 (x_n - x_{n+1}) + 0.4 h (f(t_n,x_n) + f(t_{n+1},x_{n+1}))
+	behaving as h^3, and rejected steps are retried with the stepsize proposed by the controller.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param f: function in x' = f(t,x)
+		:param xi: initial condition at time ti
+		:param ti: current time
+		:param H: guess on the step size
+		:param fi: f(ti,xi)
+		:param rho: spectral radius of the Jacobian of f (upper bound)
+		:param smax: maximum number of stages
+		:param controller: stepsize controller
+		:param errnorm: normalized norm (v, x, y) of the local error
+		:type f: Callable
+		:type xi: np.array[float]
+		:type ti: np.float
+		:type H: np.float
+		:type fi: np.array[float]
+		:type rho: np.float
+		:type smax: int
+		:type controller: StepController
+		:type errnorm: Callable
+		:return: Vector x containing solution of component j at next time (x[j]), corresponding stepsize,
+					guessed stepsize for following iteration, f at the next time, number of stages
+		:rtype: np.array[float], np.float, np.float, np.array[float], int
+
+	"""
+	hstable = ((smax - 1)**2 - 1)/(1.54*rho) if rho > 0.0 else np.inf;		# largest stepsize with at most smax stages
+
+	h = min(H, hstable);
+	while True:
+		if ti + h == ti:
+			raise ArithmeticError('Stepsize underflow in the RKC method')
+
+		s = _stages(h, rho);
+		x = _RKC_stages(f, xi, ti, h, s, fi);
+		fx = f(ti + h, x);
+		err = errnorm(0.8*(xi - x) + 0.4*h*(fi + fx), xi, x);
+
+		if err <= 1.0:
+			return x, h, min(controller.accept(h, err, 3), hstable), fx, s;
+		h = controller.reject(h, err if np.isfinite(err) else np.inf, 3);
+
+
+def _spectralradius(f, ti, xi, fi, v = None, maxiter : int = 50, rtol : float = 0.01):
+	"""Internal function estimating the spectral radius of the Jacobian of f at (ti,xi) by nonlinear power iteration
+	(as in RKC): the products of the Jacobian by v are approximated by finite differences (f(ti, xi + v) - fi),
+	v being rescaled to a small perturbation at each iteration. The estimate is increased by 20% (upper bound).
+	The iteration is started from the dominant direction of the previous estimate if given, from fi otherwise.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param f: function in x' = f(t,x)
+		:param ti: current time
+		:param xi: current state
+		:param fi: f(ti,xi)
+		:param v: initial direction (e.g. returned by the previous estimate)
+		:param maxiter: maximum number of iterations
+		:param rtol: relative variation of the estimate for convergence
+		:type f: Callable
+		:type ti: np.float
+		:type xi: np.array[float]
+		:type fi: np.array[float]
+		:type v: np.array[float]
+		:type maxiter: int
+		:type rtol: np.float
+		:return: estimate of the spectral radius, dominant direction
+		:rtype: np.float, np.array[float]
+
+	"""
+	xnorm = np.linalg.norm(xi);
+	dx = np.sqrt(np.finfo(float).eps)*(xnorm if xnorm > 0.0 else 1.0);
+
+	if v is None or not np.any(v):
+		v = fi if np.any(fi) else np.ones(xi.size);
+	# small perturbation along every component, for v not to be orthogonal to the dominant direction
+	v = v + np.linalg.norm(v)*1.0e-3*np.cos(np.arange(xi.size));
+
+	rho = 0.0;
+	for _ in range(maxiter):
+		v = v*(dx/np.linalg.norm(v));
+		d = f(ti, xi + v) - fi;
+		dnorm = np.linalg.norm(d);
+		rhoprev, rho = rho, dnorm/dx;
+
+		if dnorm == 0.0:		# f locally constant along v
+			break;
+		if abs(rho - rhoprev) <= rtol*rho:
+			break;
+		v = d;
+
+	return 1.2*rho, v;
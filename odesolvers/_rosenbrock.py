@@ -0,0 +1,154 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Internal implementation of the Rosenbrock (linearly implicit Runge-Kutta) methods, with embedded error estimate.
+#
+
+import numpy as np
+
+from ._linalg import _shifted, _factorize
+
+def _transformed(alpha, Gamma, b, bhat, order):
+	"""Internal function computing the coefficients of the transformed form (Hairer and Wanner) of a Rosenbrock method,
+	without matrix-vector products with the Jacobian, from the coefficients alpha_ij, gamma_ij (gamma on the diagonal),
+	b_i and bhat_i (embedded method) of its standard form.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param alpha: matrix alpha_ij (strictly lower triangular)
+		:param Gamma: matrix gamma_ij (lower triangular, constant diagonal)
+		:param b: weights of the method
+		:param bhat: weights of the embedded method
+		:param order: order of the local error estimate (order of the method)
+		:type alpha: np.array[float,float]
+		:type Gamma: np.array[float,float]
+		:type b: np.array[float]
+		:type bhat: np.array[float]
+		:type order: int
+		:return: coefficients of the method
+		:rtype: dict
+
+	"""
+	G = np.linalg.inv(Gamma);
+	gamma = Gamma[0,0];
+	return {
+		'gamma': gamma,
+		'a': np.tril(alpha @ G, -1),
+		'c': np.tril(np.eye(b.size)/gamma - G, -1),
+		'alpha': alpha.sum(axis=1),			# times of the stages
+		'gammas': Gamma.sum(axis=1),		# coefficients of df/dt
+		'm': b @ G,
+		'mhat': bhat @ G,
+		'order': order,
+	};
+
+# ROS34PW2 (Rang and Angermann): 4 stages, order 3 (embedded order 2), L-stable and stiffly accurate.
+# (The embedded method of ROS3P coincides with the method itself on linear autonomous problems, alpha_21 + gamma_21 being 0,
+# so that the error would not be estimated e.g. for a discretized diffusion.)
+_ROS34PW2 = _transformed(
+	np.array([[0.0, 0.0, 0.0, 0.0],
+			[8.7173304301691801e-01, 0.0, 0.0, 0.0],
+			[8.4457060015369423e-01, -1.1299064236484185e-01, 0.0, 0.0],
+			[0.0, 0.0, 1.0, 0.0]]),
+	np.array([[4.3586652150845900e-01, 0.0, 0.0, 0.0],
+			[-8.7173304301691801e-01, 4.3586652150845900e-01, 0.0, 0.0],
+			[-9.0338057013044082e-01, 5.4180672388095326e-02, 4.3586652150845900e-01, 0.0],
+			[2.4212380706095346e-01, -1.2232505839045147e+00, 5.4526025533510214e-01, 4.3586652150845900e-01]]),
+	np.array([2.4212380706095346e-01, -1.2232505839045147e+00, 1.5452602553351020e+00, 4.3586652150845900e-01]),
+	np.array([3.7810903145819369e-01, -9.6042292212423178e-02, 5.0000000000000000e-01, 2.1793326075422950e-01]),
+	3);
+
+def _Rosenbrock_stages(f, J, ft, xi, ti, h, fi, method = _ROS34PW2):
+	"""Internal function implementing one step of a Rosenbrock method, in the transformed form:
+		(I/(h gamma) - J) U_i = f(ti + alpha_i h, xi + sum_j a_ij U_j) + sum_j c_ij/h U_j + gammas_i h df/dt
+		x_{n+1} = xi + sum_i m_i U_i,  error estimate sum_i (m_i - mhat_i) U_i
+	J being the Jacobian at (ti,xi): one factorization, and no Newton iteration, per step.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param f: function in x' = f(t,x)
+		:param J: Jacobian of f at (ti,xi)
+		:param ft: derivative of f with respect to t at (ti,xi)
+		:param xi: initial condition at time ti
+		:param ti: current time
+		:param h: step size
+		:param fi: f(ti,xi)
+		:param method: coefficients of the method
+		:type f: Callable
+		:type J: np.array[float,float], ((int, int), np.array[float,float]) or scipy.sparse matrix
+		:type ft: np.array[float]
+		:type xi: np.array[float]
+		:type ti: np.float
+		:type h: np.float
+		:type fi: np.array[float]
+		:type method: dict
+		:return: Vector x containing solution of component j at time ti+h (x[j]), and local error estimate
+		:rtype: np.array[float], np.array[float]
+
+	"""
+	a, c, alpha, gammas = method['a'], method['c'], method['alpha'], method['gammas'];
+	solve = _factorize(_shifted(J, 1.0, 1.0/(h*method['gamma'])));
+
+	U = [];
+	for i in range(alpha.size):
+		x = xi + sum(a[i,j]*U[j] for j in range(i));
+		fx = fi if i == 0 else f(ti + alpha[i]*h, x);
+		U.append(solve(fx + sum((c[i,j]/h)*U[j] for j in range(i)) + (gammas[i]*h)*ft));
+
+	x = xi + sum(m*u for m, u in zip(method['m'], U));
+	err = sum((m - mhat)*u for m, mhat, u in zip(method['m'], method['mhat'], U));
+
+	return x, err;
+
+
+def _Rosenbrock_step(f, df, xi, ti, H, fi, controller, errnorm, method = _ROS34PW2):
+	"""Internal function implementing one (accepted) step of a Rosenbrock method, with stepsize control.
+
+	The Jacobian (and the derivative of f with respect to t, by finite differences) is evaluated once per step,
+	and kept when the step is rejected and retried with the stepsize proposed by the controller
+	(a singular matrix I/(h gamma) - J being treated as a rejection).
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param f: function in x' = f(t,x)
+		:param df: Jacobian of f
+		:param xi: initial condition at time ti
+		:param ti: current time
+		:param H: guess on the step size
+		:param fi: f(ti,xi)
+		:param controller: stepsize controller
+		:param errnorm: normalized norm (v, x, y) of the local error
+		:param method: coefficients of the method
+		:type f: Callable
+		:type df: Callable
+		:type xi: np.array[float]
+		:type ti: np.float
+		:type H: np.float
+		:type fi: np.array[float]
+		:type controller: StepController
+		:type errnorm: Callable
+		:type method: dict
+		:return: Vector x containing solution of component j at next time (x[j]), corresponding stepsize,
+					guessed stepsize for following iteration
+		:rtype: np.array[float], np.float, np.float
+
+	"""
+	J = df(ti, xi);
+	dt = np.sqrt(np.finfo(float).eps)*max(abs(ti), H);
+	ft = (f(ti + dt, xi) - fi)/dt;
+
+	h = H;
+	while True:
+		if ti + h == ti:
+			raise ArithmeticError('Stepsize underflow in the Rosenbrock method')
+
+		try:
+			x, est = _Rosenbrock_stages(f, J, ft, xi, ti, h, fi, method);
+			err = errnorm(est, xi, x);
+		except np.linalg.LinAlgError:
+			err = np.inf;
+
+		if err <= 1.0:
+			return x, h, controller.accept(h, err, method['order']);
+		h = controller.reject(h, err if np.isfinite(err) else np.inf, method['order']);
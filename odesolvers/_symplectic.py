@@ -0,0 +1,82 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Internal implementation of symplectic integrators for second-order ODEs numerical solution.
+#
+
+import numpy as np
+
+# Coefficients of the symmetric compositions of the Stormer-Verlet method (first half, the sequence being symmetric)
+_triplejump = 1.0/(2.0 - 2.0**(1.0/3.0));
+_compositions = {
+	2: [1.0],
+	# triple jump (Yoshida, Suzuki)
+	4: [_triplejump, 1.0 - 2.0*_triplejump],
+	# Yoshida, solution A
+	6: [0.784513610477560, 0.235573213359357, -1.17767998417887,
+		1.0 - 2.0*(0.784513610477560 + 0.235573213359357 - 1.17767998417887)],
+	# Yoshida, solution D
+	8: [0.914844246229740, 0.253693336566229, -1.44485223686048, -0.158240635368243,
+		1.93813913762276, -1.96061023297549, 0.102799849391985,
+		1.0 - 2.0*(0.914844246229740 + 0.253693336566229 - 1.44485223686048 - 0.158240635368243
+					+ 1.93813913762276 - 1.96061023297549 + 0.102799849391985)],
+};
+
+def _composition(order):
+	"""Internal function returning the substep coefficients of the symmetric composition of the given order.
+	"""
+	gammas = _compositions[order];
+	return np.array(gammas + gammas[-2::-1]);
+
+
+def _StormerVerlet_step(a, qi, vi, ai, ti, h):
+	"""Internal function implementing one step of the Stormer-Verlet (velocity Verlet, leapfrog) method.
+
+	The ODE to be solved is of the form: q'' = a(t,q), q being a vector in n-dimensions
+		v_{n+1/2} = v_n + h/2 a(t_n,q_n)
+		q_{n+1} = q_n + h v_{n+1/2}
+		v_{n+1} = v_{n+1/2} + h/2 a(t_{n+1},q_{n+1})
+	The acceleration at the end of the step is returned, to be reused at the beginning of the next one.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param a: acceleration in q'' = a(t,q)
+		:param qi: position at time ti
+		:param vi: velocity at time ti
+		:param ai: acceleration at time ti, a(ti,qi)
+		:param ti: current time
+		:param h: step size
+		:type a: Callable
+		:type qi: np.array[float]
+		:type vi: np.array[float]
+		:type ai: np.array[float]
+		:type ti: np.float
+		:type h: np.float
+		:return: position, velocity and acceleration at next time ti+h
+		:rtype: np.array[float], np.array[float], np.array[float]
+
+	"""
+
+	vhalf = vi + 0.5*h*ai;
+	qnext = qi + h*vhalf;
+	anext = a(ti+h, qnext);
+
+	return qnext, vhalf + 0.5*h*anext, anext;
+
+
+def _Composition_step(a, qi, vi, ai, ti, h, gammas):
+	"""Internal function implementing one step of a composition of the Stormer-Verlet method,
+		with substeps gammas[k]*h (one evaluation of a per substep).
+
+	See _StormerVerlet_step for the other parameters and the return values.
+
+	"""
+
+	for gamma in gammas:
+		qi, vi, ai = _StormerVerlet_step(a, qi, vi, ai, ti, gamma*h);
+		ti += gamma*h;
+
+	return qi, vi, ai;
@@ -9,21 +9,144 @@
 #
 
 import numpy as np
+from scipy.linalg import lu_factor, lu_solve
+from scipy.sparse.linalg import LinearOperator, gmres
 
-def _Theta_step(f, df, xi, ti, h, theta, TOL, MAXITER):
+from ._async import _evaluate, _evaluate_all, _run
+from ._errornorm import _scalednorm, _tolerancescale
+from ._linalg import _matvec, _shifted, _combination, _solve
+
+def _Newton_test(delta, TOL, norm, xi, xinu, dnorms, MAXITER):
+	"""Internal function testing the convergence of a Newton iteration, monitoring its contraction rate.
+
+	With dnorm the norm of the correction delta scaled by the tolerance (see _scalednorm, appended to dnorms),
+	and rate = dnorm/dnormprev the contraction rate, the iteration:
+	- has converged if dnorm <= 1, or earlier if rate/(1-rate)*dnorm <= 1 (estimate of the error of xinu);
+	- cannot converge if dnorm > 1 and the tolerance is below the roundoff of xinu (eps |xinu| in the same norm),
+	  as the estimate would then certify an accuracy that the iterate does not have;
+	- is diverging if the correction is not finite, or it has grown in the last two iterations;
+	- will not converge within MAXITER iterations if rate^(remaining iterations)*dnorm > 1,
+	  the rate not decreasing (i.e. the iteration not accelerating, as it does when close to the solution).
+	In the last three cases an ArithmeticError is raised right away, without performing the remaining iterations.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param delta: last correction of the iteration
+		:param TOL: Numerical tolerance for convergence
+		:param norm: weighted norm for the convergence test (None for the 2-norm with TOL)
+		:param xi: initial condition of the step
+		:param xinu: current iterate
+		:param dnorms: scaled norms of the previous corrections (updated)
+		:param MAXITER: Maximum number of Newton iterations to be performed
+		:type delta: np.array[float]
+		:type TOL: np.float
+		:type norm: Callable
+		:type xi: np.array[float]
+		:type xinu: np.array[float]
+		:type dnorms: list
+		:type MAXITER: (unsigned) int
+		:return: whether the iteration has converged
+		:rtype: bool
+
+	"""
+
+	dnorm = _scalednorm(delta, TOL, norm, xi, xinu);
+	dnorms.append(dnorm);
+	k = len(dnorms) - 1;		# index of the current iteration
+
+	if not np.isfinite(dnorm):
+		raise ArithmeticError('Newton iteration has diverged')
+
+	if dnorm <= 1.0:
+		return True;
+
+	if _scalednorm(np.finfo(float).eps*np.abs(xinu), TOL, norm, xi, xinu) > 1.0:
+		raise ArithmeticError('Newton iteration cannot converge: the tolerance is below the roundoff of the iterate')
+
+	if k == 0:
+		return False;
+
+	rate = dnorm/dnorms[k-1];
+	if rate < 1.0 and rate/(1.0 - rate)*dnorm <= 1.0:
+		return True;
+
+	if k == 1:
+		return False;
+
+	rateprev = dnorms[k-1]/dnorms[k-2];
+	if rate >= 1.0 and rateprev >= 1.0:
+		raise ArithmeticError('Newton iteration has diverged')
+	if rate >= rateprev and rate**(MAXITER-1-k)*dnorm > 1.0:
+		raise ArithmeticError('Newton iteration has not converged')
+
+	return False;
+
+
+def _Theta_step_retry(step, xi, ti, h, guess, maxhalvings):
+	"""Internal function performing one step of size h with step(xi,ti,h,guess) and, if its Newton iteration fails,
+		two steps of size h/2 instead (recursively, halving the stepsize up to maxhalvings times).
+
+	The initial guesses of the substeps are interpolated (first half) and extrapolated (second half) linearly.
+	The error of the last attempt is raised if the Newton iteration still fails with the smallest stepsize.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param step: function (xi,ti,h,guess) performing one step, raising ArithmeticError if its Newton iteration fails
+		:param xi: initial condition at time ti
+		:param ti: current time
+		:param h: step size
+		:param guess: initial guess of the Newton iteration (None for xi)
+		:param maxhalvings: maximum number of times the stepsize is halved
+		:type step: Callable
+		:type xi: np.array[float]
+		:type ti: np.float
+		:type h: np.float
+		:type guess: np.array[float]
+		:type maxhalvings: int
+		:return: Vector x containing solution of component j at next time ti+h (x[j]), and number of steps performed
+		:rtype: np.array[float], int
+
+	"""
+
+	return _run(_Theta_step_retry_async(step, xi, ti, h, guess, maxhalvings));
+
+
+async def _Theta_step_retry_async(step, xi, ti, h, guess, maxhalvings):
+	"""Internal coroutine implementing _Theta_step_retry, step being possibly a coroutine function.
+
+	See _Theta_step_retry for the parameters.
+
+	"""
+
+	try:
+		return (await _evaluate(step, xi, ti, h, guess)), 1;
+	except (ArithmeticError, np.linalg.LinAlgError):
+		if maxhalvings <= 0:
+			raise
+
+	xhalf, n1 = await _Theta_step_retry_async(step, xi, ti, h/2, (None if guess is None else (xi + guess)/2), maxhalvings-1);
+	xnext, n2 = await _Theta_step_retry_async(step, xhalf, ti+h/2, h/2, 2*xhalf - xi, maxhalvings-1);
+
+	return xnext, n1 + n2;
+
+
+def _Theta_step(f, df, xi, ti, h, theta, TOL, MAXITER, norm = None, guess = None, fi = None, M = None):
 	"""Internal function implementing one step of the theta (including Backward Euler) method.
 
-	The ODE to be solved is of the form: x' = f(t,x), x being a vector in n-dimensions
+	The ODE to be solved is of the form: x' = f(t,x), x being a vector in n-dimensions,
+	or M x' = f(t,x) if the mass matrix M is provided (possibly singular, for differential-algebraic equations)
 
 	- **parameters**, **types**, **return** and **return types**::
 		:param f: function in x' = f(t,x)
-		:param df: Jacobian of f
+		:param df: Jacobian of f (returning a dense, banded ((l, u), ab) or sparse matrix)
 		:param xi: initial condition at time ti
 		:param ti: current time
 		:param h: step size
 		:param theta: value between 0 and 1
 		:param TOL: Numerical tolerance for convergence
 		:param MAXITER: Maximum number of Newton iterations to be performed
+		:param norm: weighted norm for the convergence test (None for the 2-norm with TOL)
+		:param guess: initial guess of the Newton iteration (None for xi)
+		:param fi: f(ti,xi), if already known (None for evaluating it)
+		:param M: mass matrix (None for the identity)
 		:type f: Callable
 		:type df: Callable
 		:type xi: np.array[float]
@@ -32,29 +155,329 @@ def _Theta_step(f, df, xi, ti, h, theta, TOL, MAXITER):
 		:type theta: np.float
 		:type TOL: np.float
 		:type NEWTITER: (unsigned) int
+		:type norm: Callable
+		:type guess: np.array[float]
+		:type fi: np.array[float]
+		:type M: np.array[float,float], ((int, int), np.array[float,float]) or scipy.sparse matrix
 		:return: Vector x containing solution of component j at next time ti+h (x[j])
 		:rtype: np.array[float]
 
 	"""
 
-	# xinu represents the \nu step of the Newton iteration algorithm
+	return _run(_Theta_step_async(f, df, xi, ti, h, theta, TOL, MAXITER, norm, guess, fi, M));
+
+
+def _Theta_step_sens(f, df, dfp, xi, Si, ti, h, theta, TOL, MAXITER, norm = None):
+	"""Internal function implementing one step of the theta (including Backward Euler) method,
+		together with the forward sensitivities of the state with respect to the parameters.
+
+	The sensitivities S = dx/dp satisfy the derivative of the theta scheme with respect to p:
+		(I - (1-theta)h df_{n+1}) S_{n+1} = S_n + theta h (df_n S_n + dfp_n) + (1-theta)h dfp_{n+1}
+	whose matrix is the Newton iteration matrix: its LU factorization at the last Newton iteration
+	is reused, so that the sensitivities only cost back-substitutions (and df is evaluated at the
+	iterate preceding the converged state, within TOL of it).
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param f: function in x' = f(t,x)
+		:param df: Jacobian of f with respect to x
+		:param dfp: Jacobian of f with respect to the parameters
+		:param xi: initial condition at time ti
+		:param Si: sensitivities at time ti
+		:param ti: current time
+		:param h: step size
+		:param theta: value between 0 and 1
+		:param TOL: Numerical tolerance for convergence
+		:param MAXITER: Maximum number of Newton iterations to be performed
+		:param norm: weighted norm for the convergence test (None for the 2-norm with TOL)
+		:type f: Callable
+		:type df: Callable
+		:type dfp: Callable
+		:type xi: np.array[float]
+		:type Si: np.array[float,float]
+		:type ti: np.float
+		:type h: np.float
+		:type theta: np.float
+		:type TOL: np.float
+		:type NEWTITER: (unsigned) int
+		:type norm: Callable
+		:return: state and sensitivities at next time ti+h
+		:rtype: np.array[float], np.array[float,float]
+
+	"""
+
+	gamma = (1-theta)*h;
+	fi = f(ti,xi);
+
+	# explicit part of the sensitivity equation
+	c = Si + theta*h*(np.dot(df(ti,xi), Si) + np.reshape(dfp(ti,xi), Si.shape)) if theta != 0 else Si;
+
+	if theta == 1:
+		return xi + h*fi, c;
+
 	# xinu's first guess initialized as previous solution
 	xinu = np.copy(xi);
 
 	# Newton iteration
+	dnorms = [];
 	for i in range(MAXITER):
-		A = (np.identity(xi.size) - (1-theta)*h*df(ti+h,xinu));
-		b = -(xinu - xi -theta*h*f(ti,xi) -(1-theta)*h*f(ti+h,xinu));
+		lu = lu_factor(np.identity(xi.size) - gamma*df(ti+h,xinu));
+		b = -(xinu - xi -theta*h*fi -gamma*f(ti+h,xinu));
+
+		delta = lu_solve(lu, b);
+
+		xinu += delta;
+
+		# check for convergence
+		if _Newton_test(delta, TOL, norm, xi, xinu, dnorms, MAXITER):
+			return xinu, lu_solve(lu, c + gamma*np.reshape(dfp(ti+h,xinu), Si.shape));
+
+	raise ArithmeticError('Newton iteration has not converged')
+
+
+def _Theta_adjoint_step(df, dfp, xi, xnext, lam, ti, h, theta, dq = None, dqp = None):
+	"""Internal function implementing one backward step of the discrete adjoint of the theta method.
+
+	Given the adjoint lam_{n+1} = dJ/dx_{n+1}, the step x_n -> x_{n+1} is reversed as:
+		(I - (1-theta)h df_{n+1})^T mu = lam_{n+1} + (1-theta)h dq_{n+1}
+		lam_n = (I + theta h df_n)^T mu + theta h dq_n
+		dJ/dp += (theta h dfp_n + (1-theta)h dfp_{n+1})^T mu + theta h dqp_n + (1-theta)h dqp_{n+1}
+	dq and dqp being the gradients of the running cost q, whose integral over the step is h (theta q_n + (1-theta) q_{n+1}).
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param df: Jacobian of f with respect to x
+		:param dfp: Jacobian of f with respect to the parameters
+		:param xi: state at time ti
+		:param xnext: state at time ti+h
+		:param lam: adjoint at time ti+h
+		:param ti: current time
+		:param h: step size
+		:param theta: value between 0 and 1
+		:param dq: gradient of the running cost with respect to x (None for no running cost)
+		:param dqp: gradient of the running cost with respect to the parameters (None if independent of them)
+		:type df: Callable
+		:type dfp: Callable
+		:type xi: np.array[float]
+		:type xnext: np.array[float]
+		:type lam: np.array[float]
+		:type ti: np.float
+		:type h: np.float
+		:type theta: np.float
+		:type dq: Callable
+		:type dqp: Callable
+		:return: adjoint at time ti, contribution of the step to the gradient with respect to the parameters
+		:rtype: np.array[float], np.array[float]
+
+	"""
+
+	gamma = (1-theta)*h;
+
+	if dq is not None and theta != 1:
+		lam = lam + gamma*np.asarray(dq(ti+h,xnext), float);
+
+	mu = np.linalg.solve((np.identity(xi.size) - gamma*df(ti+h,xnext)).T, lam) if theta != 1 else lam;
+
+	gp = 0.0;
+	lamprev = mu;
+	if theta != 0:
+		gp = theta*h*np.dot(np.reshape(dfp(ti,xi), (xi.size, -1)).T, mu);
+		lamprev = mu + theta*h*np.dot(df(ti,xi).T, mu);
+		if dq is not None:
+			lamprev = lamprev + theta*h*np.asarray(dq(ti,xi), float);
+		if dqp is not None:
+			gp = gp + theta*h*np.asarray(dqp(ti,xi), float);
+	if theta != 1:
+		gp = gp + gamma*np.dot(np.reshape(dfp(ti+h,xnext), (xi.size, -1)).T, mu);
+		if dqp is not None:
+			gp = gp + gamma*np.asarray(dqp(ti+h,xnext), float);
+
+	return lamprev, gp;
+
+
+def _Theta_step_JFNK(f, xi, ti, h, theta, TOL, MAXITER, precond = None, norm = None, guess = None, M = None):
+	"""Internal function implementing one step of the theta (including Backward Euler) method,
+		with a Jacobian-free Newton-Krylov iteration.
+
+	The ODE to be solved is of the form: x' = f(t,x), x being a vector in n-dimensions
+	The Newton linear systems are solved by GMRES, approximating the products of the Jacobian of f
+	with a vector v by the directional derivative (f(t,x + eps v) - f(t,x))/eps.
+	The Jacobian is never formed. If GMRES stops before its tolerance, its solution is still used as an inexact
+	Newton step when it reduces the residual by a factor 10 at least; otherwise an ArithmeticError is raised
+	(the step being then retried with a smaller stepsize by the solvers, see _Theta_step_retry).
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param f: function in x' = f(t,x)
+		:param xi: initial condition at time ti
+		:param ti: current time
+		:param h: step size
+		:param theta: value between 0 and 1
+		:param TOL: Numerical tolerance for convergence
+		:param MAXITER: Maximum number of Newton iterations to be performed
+		:param precond: preconditioner approximating the inverse of I - (1-theta)*h*df,
+						or function (t,x,gamma) returning such a preconditioner for I - gamma*df(t,x)
+		:param norm: weighted norm for the convergence test (None for the 2-norm with TOL)
+		:param guess: initial guess of the Newton iteration (None for xi)
+		:param M: mass matrix (None for the identity), see _Theta_step
+		:type f: Callable
+		:type xi: np.array[float]
+		:type ti: np.float
+		:type h: np.float
+		:type theta: np.float
+		:type TOL: np.float
+		:type NEWTITER: (unsigned) int
+		:type precond: LinearOperator or Callable
+		:type norm: Callable
+		:type guess: np.array[float]
+		:type M: np.array[float,float], ((int, int), np.array[float,float]) or scipy.sparse matrix
+		:return: Vector x containing solution of component j at next time ti+h (x[j])
+		:rtype: np.array[float]
+
+	"""
+
+	gamma = (1-theta)*h;
+	sqrteps = np.sqrt(np.finfo(float).eps);
+
+	# xinu's first guess initialized as previous solution (or as the provided guess)
+	xinu = np.array(xi if guess is None else guess, float);
+	fi = f(ti,xi);		# constant throughout the Newton iteration
+
+	# a LinearOperator is callable too: only other callables are factories of the preconditioner
+	P = precond(ti+h, xinu, gamma) if callable(precond) and not isinstance(precond, LinearOperator) else precond;
+	mass = (lambda v: v) if M is None else (lambda v: _matvec(M, v));
+
+	# Newton iteration
+	dnorms = [];
+	for i in range(MAXITER):
+		fnu = f(ti+h,xinu);
+		b = -(mass(xinu - xi) -theta*h*fi -gamma*fnu);
+
+		def matvec(v, xinu=xinu, fnu=fnu):
+			v = np.ravel(v);
+			vnorm = np.linalg.norm(v);
+			if vnorm == 0.0:
+				return np.zeros(xi.size);
+			eps = sqrteps*(1.0 + np.linalg.norm(xinu))/vnorm;
+			return mass(v) - gamma*(f(ti+h,xinu + eps*v) - fnu)/eps;
+
+		A = LinearOperator((xi.size, xi.size), matvec=matvec, dtype=float);
+
+		# inexact solution of (M - (1-theta)*h*df)*delta = b (M = I if not provided),
+		# to a fraction of the tolerance of the Newton iteration in its norm
+		delta, info = gmres(A, b, M=P, atol=1.0e-3*_tolerancescale(TOL, norm, xi, xinu));
+		if info != 0 and not (info > 0 and np.linalg.norm(b - matvec(delta)) <= 0.1*np.linalg.norm(b)):
+			# not even an inexact Newton step (residual reduced by the forcing term 0.1)
+			raise ArithmeticError('GMRES has not converged in the Newton iteration (info = %d)' % info)
+
+		xinu += delta;
+
+		# check for convergence
+		if _Newton_test(delta, TOL, norm, xi, xinu, dnorms, MAXITER):
+			return xinu;
+
+	raise ArithmeticError('Newton iteration has not converged')
+
+
+def _IMEXTheta_step(fs, dfs, fn, xi, ti, h, theta, TOL, MAXITER, solve = None, norm = None, guess = None):
+	"""Internal function implementing one step of the implicit-explicit theta method.
+
+	The ODE to be solved is of the form: x' = fs(t,x) + fn(t,x), x being a vector in n-dimensions,
+	fs being the stiff part (treated implicitly) and fn the non-stiff part (treated explicitly):
+		x_{n+1} = x_n + h fn(t_n,x_n) + theta h fs(t_n,x_n) + (1 - theta)h fs(t_{n+1},x_{n+1})
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param fs: stiff part of f
+		:param dfs: Jacobian of fs (not used if solve is provided)
+		:param fn: non-stiff part of f
+		:param xi: initial condition at time ti
+		:param ti: current time
+		:param h: step size
+		:param theta: value between 0 and 1
+		:param TOL: Numerical tolerance for convergence
+		:param MAXITER: Maximum number of Newton iterations to be performed
+		:param solve: solver of the (constant) linear system (I - (1-theta)*h*dfs) delta = b, if fs is affine in x
+		:param norm: weighted norm for the convergence test (None for the 2-norm with TOL)
+		:param guess: initial guess of the Newton iteration (None for xi)
+		:type fs: Callable
+		:type dfs: Callable
+		:type fn: Callable
+		:type xi: np.array[float]
+		:type ti: np.float
+		:type h: np.float
+		:type theta: np.float
+		:type TOL: np.float
+		:type NEWTITER: (unsigned) int
+		:type solve: Callable
+		:type norm: Callable
+		:type guess: np.array[float]
+		:return: Vector x containing solution of component j at next time ti+h (x[j])
+		:rtype: np.array[float]
+
+	"""
+
+	# explicit part, evaluated once per step
+	c = xi + h*fn(ti,xi) + theta*h*fs(ti,xi);
+
+	if solve is not None:
+		# fs affine in x: Newton converges in exactly one iteration, with a constant matrix
+		return xi + solve(-(xi - c -(1-theta)*h*fs(ti+h,xi)));
+
+	# xinu's first guess initialized as previous solution (or as the provided guess)
+	xinu = np.array(xi if guess is None else guess, float);
+
+	# Newton iteration
+	dnorms = [];
+	for i in range(MAXITER):
+		A = (np.identity(xi.size) - (1-theta)*h*dfs(ti+h,xinu));
+		b = -(xinu - c -(1-theta)*h*fs(ti+h,xinu));
 
-		# delta = xinu+1 - xinu
-		# Solving the linear system of equations A delta = b, that is,
-		# (I - (1-theta)*h*df)*delta = -(xinu - xi -theta*h*f(ti,xi) -(1-theta)*h*f(ti+h,xinu))
 		delta = np.linalg.solve(A, b);
 
 		xinu += delta;
 
 		# check for convergence
-		if np.linalg.norm(delta) <= TOL:
+		if _Newton_test(delta, TOL, norm, xi, xinu, dnorms, MAXITER):
+			return xinu;
+
+	raise ArithmeticError('Newton iteration has not converged')
+
+
+async def _Theta_step_async(f, df, xi, ti, h, theta, TOL, MAXITER, norm = None, guess = None, fi = None, M = None):
+	"""Internal coroutine implementing one step of the theta (including Backward Euler) method,
+		f and df being possibly coroutine functions.
+
+	f and df at the current Newton iterate are awaited concurrently.
+	See _Theta_step for the parameters.
+
+	"""
+
+	# xinu represents the \nu step of the Newton iteration algorithm
+	# xinu's first guess initialized as previous solution (or as the provided guess, e.g. extrapolated)
+	xinu = np.array(xi if guess is None else guess, float);
+	if fi is None:
+		fi = await _evaluate(f, ti, xi);		# constant throughout the Newton iteration
+
+	# Newton iteration
+	dnorms = [];
+	for i in range(MAXITER):
+		J, fnu = await _evaluate_all((df, ti+h, xinu), (f, ti+h, xinu));
+		if M is None:
+			b = -(xinu - xi -theta*h*fi -(1-theta)*h*fnu);
+
+			# delta = xinu+1 - xinu
+			# Solving the linear system of equations A delta = b, that is,
+			# (I - (1-theta)*h*df)*delta = -(xinu - xi -theta*h*f(ti,xi) -(1-theta)*h*f(ti+h,xinu))
+			if isinstance(J, np.ndarray):
+				delta = np.linalg.solve(np.identity(xi.size) - (1-theta)*h*J, b);
+			else:
+				delta = _solve(_shifted(J, (1-theta)*h), b);		# banded or sparse Jacobian
+		else:
+			# (M - (1-theta)*h*df)*delta = -(M (xinu - xi) -theta*h*f(ti,xi) -(1-theta)*h*f(ti+h,xinu))
+			b = -(_matvec(M, xinu - xi) -theta*h*fi -(1-theta)*h*fnu);
+			delta = _solve(_combination(M, (1-theta)*h, J), b);
+
+		xinu += delta;
+
+		# check for convergence
+		if _Newton_test(delta, TOL, norm, xi, xinu, dnorms, MAXITER):
 			return xinu;
 
 	raise ArithmeticError('Newton iteration has not converged')
@@ -0,0 +1,149 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# File implementing the discrete adjoint of the theta method, with binomial checkpointing.
+#
+
+import numpy as np
+from nptyping import Array
+from typing import Tuple
+from scipy.special import comb
+
+from ._expliciteuler import _ExplicitEuler_step
+from ._errornorm import _wrmsnorm
+from ._thetamethod import _Theta_step, _Theta_adjoint_step
+
+def ThetaMethodAdjoint(f, iv : Array[float], t0 : float, tn : float, h : float, theta : float, df, dfp, dg, TOL : float = 1.0e-5, NEWTITER : int = 10, snapshots : int = None, rtol = None, atol = None, dq = None, dqp = None) -> Tuple[Array[float], Array[float], Array[float]]:
+	"""Function computing the gradient of a functional of the Theta method solution
+		with respect to the parameters and to the initial values, by the discrete adjoint method.
+
+	The ODE to be solved is of the form: x' = f(t,x;p), x being a vector in n-dimensions, p a vector of m parameters.
+	The functional is J = g(x_N) + integral of q(t,x;p) dt from t0 to tn, x_N being the numerical solution at the final time,
+	the running cost q being integrated with the same theta rule, sum_n h (theta q(t_n,x_n) + (1 - theta) q(t_{n+1},x_{n+1})).
+	Its gradient is the exact derivative of this discrete functional (up to the Newton tolerance).
+	Theta = 1 is the Explicit Euler method.
+	The cost of the gradient does not depend on m, as opposed to forward sensitivities (see ThetaMethodSensitivity).
+
+	The backward pass needs the forward states in reverse order: instead of storing all of them, only
+	snapshots states are kept, and the segments between them are recomputed (binomial checkpointing, as in revolve).
+	With s snapshots, N steps are reversed with at most r forward sweeps, r being the smallest integer with
+	binomial(s+r, s) >= N: the default s = ceil(log2(N)) keeps the memory logarithmic in N with a few sweeps.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param f: function in x' = f(t,x;p), for the nominal parameters
+		:param iv: vector of initial values
+		:param t0: initial time
+		:param tn: final time
+		:param h: step size
+		:param theta: value between 0 and 1
+		:param df: Jacobian of f with respect to x (n x n)
+		:param dfp: Jacobian of f with respect to p (n x m)
+		:param dg: gradient of g (None for no terminal cost)
+		:param TOL: Numerical tolerance for convergence
+		:param NEWTITER: Maximum number of Newton iterations to be performed
+		:param snapshots: number of states stored during the backward pass (default to ceil(log2(N)))
+		:param rtol: relative tolerance of the Newton iteration (scalar or per component), see ThetaMethod
+		:param atol: absolute tolerance of the Newton iteration (scalar or per component), see ThetaMethod
+		:param dq: gradient of the running cost q with respect to x, dq(t,x) (None for no running cost)
+		:param dqp: gradient of the running cost q with respect to p, dqp(t,x) (None if q does not depend on p)
+		:type f: Callable
+		:type iv: np.array[float]
+		:type t0: np.float
+		:type tn: np.float
+		:type h: np.float
+		:type theta: np.float
+		:type df: Callable
+		:type dfp: Callable
+		:type dg: Callable
+		:type TOL: np.float
+		:type NEWTITER: (unsigned) int
+		:type snapshots: int
+		:type rtol: np.float or np.array[float]
+		:type atol: np.float or np.array[float]
+		:type dq: Callable
+		:type dqp: Callable
+		:return: solution at the final time x_N, gradient of J with respect to p, gradient of J with respect to iv
+		:rtype: np.array[float], np.array[float], np.array[float]
+
+	"""
+
+	if h <= 0.0:
+		raise ValueError('The stepsize h must be positive')
+
+	if (tn - t0) <= 0.0:
+		raise ValueError('The final time must be greater than the initial time')
+
+	if not 0 <= theta <= 1:
+		raise ValueError('Theta has to be between 0 and 1')
+
+	if TOL <= 0.0:
+		raise ValueError('The numerical tolerance must be positive')
+
+	if (theta != 1) and (NEWTITER < 0.0):
+		raise ValueError('The maximum number of Newton Iteration steps must be positive')
+
+	if df is None or dfp is None:
+		raise NotImplementedError('Automatic differentiation not implemented yet. Please provide the Jacobians of f')
+
+	norm = _wrmsnorm(rtol, atol, iv.size);
+
+	N : np.int = np.int(np.ceil((tn - t0)/h));	# number of steps
+
+	if snapshots is None:
+		snapshots = np.int(np.ceil(np.log2(N))) if N > 1 else 0;
+
+	if snapshots < 0:
+		raise ValueError('The number of snapshots cannot be negative')
+
+	if (theta == 1):
+		step = lambda xi, i: _ExplicitEuler_step(f,xi,(t0+h*i),h);
+	else:
+		step = lambda xi, i: _Theta_step(f,df,xi,(t0+h*i),h,theta,TOL,NEWTITER,norm);
+
+	def advance(xi, i, k):
+		# k forward steps from step i
+		for j in range(i, i+k):
+			xi = step(xi, j);
+		return xi;
+
+	# forward pass, keeping only the final state
+	x0 = np.array(iv, float);
+	xN = advance(x0, 0, N);
+
+	lam = np.array(dg(xN), float) if dg is not None else np.zeros(x0.size);
+	gp = np.zeros(np.reshape(dfp(t0, x0), (x0.size, -1)).shape[1]);
+
+	def adjoint(xi, i):
+		# reversal of step i, from x_i
+		nonlocal lam, gp;
+		lam, gpi = _Theta_adjoint_step(df, dfp, xi, step(xi, i), lam, (t0+h*i), h, theta, dq, dqp);
+		gp += gpi;
+
+	def reverse(xi, i, L, s):
+		# reversal of steps i+L-1, ..., i, from x_i, storing at most s additional states
+		# (recursing on the number of snapshots only, the first d steps being then reversed in the same call)
+		while L > 1 and s > 0:
+			r = _sweeps(L, s);
+			d = max(1, L - np.int(comb(s-1+r, s-1, exact=True)));	# the last L-d steps are reversed with s-1 snapshots
+			reverse(advance(xi, i, d), i+d, L-d, s-1);
+			L = d;
+		for k in reversed(range(L)):
+			adjoint(advance(xi, i, k), i+k);
+
+	reverse(x0, 0, N, snapshots);
+
+	return xN, gp, lam;
+
+
+def _sweeps(L : int, s : int) -> int:
+	"""Internal function returning the smallest number of forward sweeps r
+		reversing L steps with s snapshots, i.e. the smallest r with binomial(s+r, s) >= L.
+	"""
+	r = 0;
+	while comb(s+r, s, exact=True) < L:
+		r += 1;
+	return r;
@@ -0,0 +1,131 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# File implementing asyncio variants of the solvers, for right hand sides awaiting external computations.
+#
+
+import asyncio
+from nptyping import Array
+from typing import Tuple, List
+
+from .thetamethod import _ThetaMethod_async
+from .predictorcorrector import _AB_AM_PECE2_async
+
+async def ThetaMethodAsync(f, iv : Array[float], t0 : float, tn : float, h : float, theta : float, df = None, TOL : float = 1.0e-5, NEWTITER : int = 10, rtol = None, atol = None, **kwargs) -> Array[float]:
+	"""Coroutine implementing the Theta method for ODEs numerical solution,
+		f and df being possibly coroutine functions (e.g. awaiting a remote model).
+
+	While f or df are awaited, other coroutines (e.g. other integrations, see EnsembleAsync) run on the event loop.
+	The numerical scheme and its implementation are the same as in ThetaMethod, whose other settings are accepted too
+	(except for jacobianfree and executor, which require f to be a function).
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param f: function in x' = f(t,x)
+		:param iv: vector of initial values
+		:param t0: initial time
+		:param tn: final time
+		:param h: step size
+		:param theta: value between 0 and 1
+		:param df: Jacobian of f
+		:param TOL: Numerical tolerance for convergence
+		:param NEWTITER: Maximum number of Newton iterations to be performed
+		:param rtol: relative tolerance of the Newton iteration, see ThetaMethod
+		:param atol: absolute tolerance of the Newton iteration, see ThetaMethod
+		:param kwargs: other keyword arguments of ThetaMethod (e.g. maxhalvings, M, checkpoint, solution)
+		:type f: Callable or coroutine function
+		:type iv: np.array[float]
+		:type t0: np.float
+		:type tn: np.float
+		:type h: np.float
+		:type theta: np.float
+		:type df: Callable or coroutine function
+		:type TOL: np.float
+		:type NEWTITER: (unsigned) int
+		:type rtol: np.float or np.array[float]
+		:type atol: np.float or np.array[float]
+		:type kwargs: dict
+		:return: Vector x containing solution of component j at time i (x[i,j])
+		:rtype: np.array[float,float] or ODESolution
+
+	"""
+
+	return await _ThetaMethod_async(f, iv, t0, tn, h, theta, df, TOL, NEWTITER, rtol=rtol, atol=atol, **kwargs);
+
+
+async def AB_AM_PECE2Async(f, iv : Array[float], t0 : float, tn : float, h : float = None, ETOL : float = 1.0e-5, controller = None, rtol = None, atol = None, **kwargs) -> Tuple[Array[float], Array[float]]:
+	"""Coroutine implementing the predictor-corrector method of order 2, using Adams-Bashforth and Adams-Moulton,
+		f being possibly a coroutine function (e.g. awaiting a remote model).
+
+	While f is awaited, other coroutines (e.g. other integrations, see EnsembleAsync) run on the event loop.
+	The numerical scheme and its implementation are the same as in AB_AM_PECE2, whose other settings are accepted too.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param f: function in x' = f(t,x)
+		:param iv: vector of initial values
+		:param t0: initial time
+		:param tn: final time
+		:param h: step size
+		:param ETOL: Error tolerance
+		:param controller: stepsize controller (None for the original strategy), see AB_AM_PECE2
+		:param rtol: relative tolerance, see AB_AM_PECE2
+		:param atol: absolute tolerance, see AB_AM_PECE2
+		:param kwargs: other keyword arguments of AB_AM_PECE2 (e.g. checkpoint, solution)
+		:type f: Callable or coroutine function
+		:type iv: np.array[float]
+		:type t0: np.float
+		:type tn: np.float
+		:type h: np.float
+		:type TOL: np.float
+		:type controller: StepController
+		:type rtol: np.float or np.array[float]
+		:type atol: np.float or np.array[float]
+		:type kwargs: dict
+		:return: Vector x containing solution of component j at time i (x[i,j]), and corresponding stepsizes hi
+		:rtype: np.array[float,float] (ODESolution if solution), np.array[float]
+
+	"""
+
+	return await _AB_AM_PECE2_async(f, iv, t0, tn, h, ETOL, controller=controller, rtol=rtol, atol=atol, **kwargs);
+
+
+async def EnsembleAsync(solver, f, ivs : List[Array[float]], *args, maxconcurrent : int = None, **kwargs) -> list:
+	"""Coroutine running an ensemble of independent integrations concurrently on the event loop.
+
+	Each member is solver(f, iv, *args, **kwargs), with one initial value iv of ivs.
+	The waits of the members on f (e.g. on a remote model) overlap.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param solver: asyncio solver (e.g. ThetaMethodAsync, AB_AM_PECE2Async)
+		:param f: function in x' = f(t,x)
+		:param ivs: initial values of the members of the ensemble
+		:param args: other positional arguments of solver
+		:param maxconcurrent: maximum number of members integrated at the same time (None for no limit)
+		:param kwargs: other keyword arguments of solver
+		:type solver: coroutine function
+		:type f: Callable or coroutine function
+		:type ivs: list[np.array[float]]
+		:type args: tuple
+		:type maxconcurrent: int
+		:type kwargs: dict
+		:return: solutions of the members, in the same order as ivs
+		:rtype: list
+
+	"""
+
+	if maxconcurrent is not None and maxconcurrent < 1:
+		raise ValueError('The maximum number of concurrent integrations must be positive')
+
+	if maxconcurrent is None:
+		return list(await asyncio.gather(*[solver(f, iv, *args, **kwargs) for iv in ivs]));
+
+	semaphore = asyncio.Semaphore(maxconcurrent);
+
+	async def member(iv):
+		async with semaphore:
+			return await solver(f, iv, *args, **kwargs);
+
+	return list(await asyncio.gather(*[member(iv) for iv in ivs]));
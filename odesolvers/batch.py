@@ -0,0 +1,240 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# File implementing batches of solver jobs described in job files, and their command-line runner.
+#
+
+import os
+import sys
+import json
+import time
+import argparse
+import importlib
+import inspect
+import numpy as np
+
+from ._executor import _get_executor
+from .solution import ODESolution
+from .cache import SolverCache
+from .__version__ import __version__
+
+def RunBatch(jobfile : str, workers : int = None, output : str = None) -> dict:
+	"""Function running the solver jobs described in a job file, in parallel.
+
+	The job file (JSON) lists problems, solvers and jobs combining them, e.g.
+		{
+			"workers": 4,
+			"output": "results",
+			"problems": {
+				"stiff": {"f": "mymodule:rhs", "df": "mymodule:jacobian", "iv": [1.0, 2.0], "t0": 0.0, "tn": 1.0}
+			},
+			"solvers": {
+				"trapezoidal": {"solver": "ThetaMethod", "h": 0.01, "theta": 0.5},
+				"pece": {"solver": "AB_AM_PECE2", "ETOL": 1.0e-6, "solution": true, "outputs": ["x", "hi"]}
+			},
+			"jobs": [
+				{"problem": "stiff", "solver": "trapezoidal"},
+				{"name": "stiff-pece-tight", "problem": "stiff", "solver": "pece", "settings": {"ETOL": 1.0e-9}}
+			]
+		}
+	Without "jobs", every problem is solved with every solver.
+	The strings of the form "module:attribute" in a problem are imported objects (the directory of the job file being importable),
+	and its entries are passed to the solver as keyword arguments if the solver accepts them
+	(so that a problem with a Jacobian can be solved by explicit solvers as well).
+	The settings of a solver (other keyword arguments) are given as such, "solver" being the name of a solver
+	of the package or an imported one ("module:attribute"), and "outputs" the names of the arrays returned by the solver
+	(default "x" for one array, "x0", "x1", ... for several). Lists are converted to arrays.
+	"cache" is an optional directory of a SolverCache shared by the jobs.
+
+	The jobs are run on a process pool, and the result of each job is written to <output>/<name>.npz (compressed),
+	with the times t if the solver returns an ODESolution. The summary of the batch (timings and statistics of the jobs)
+	is written to <output>/summary.json.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param jobfile: job file
+		:param workers: number of worker processes (default as in the job file, or as in concurrent.futures)
+		:param output: output directory (default as in the job file, or the directory of the job file)
+		:type jobfile: str
+		:type workers: int
+		:type output: str
+		:return: summary of the batch
+		:rtype: dict
+
+	"""
+	with open(jobfile) as fh:
+		config = json.load(fh);
+
+	base = os.path.dirname(os.path.abspath(jobfile));
+	workers = workers if workers is not None else config.get('workers');
+	output = output if output is not None else os.path.join(base, config.get('output', '.'));
+	cache = config.get('cache');
+	cache = os.path.join(base, cache) if cache is not None else None;
+
+	jobs = _jobs(config);
+	os.makedirs(output, exist_ok=True);
+
+	start = time.perf_counter();
+	pool, _ = _get_executor('process', workers);
+	try:
+		futures = [pool.submit(_run, job, os.path.join(output, job['name'] + '.npz'), [base], cache) for job in jobs];
+		records = [future.result() for future in futures];
+	finally:
+		pool.shutdown();
+
+	summary = {
+		'version': __version__,
+		'jobfile': os.path.abspath(jobfile),
+		'workers': workers,
+		'seconds': time.perf_counter() - start,
+		'failed': sum(record['status'] != 'ok' for record in records),
+		'jobs': records,
+	};
+
+	with open(os.path.join(output, 'summary.json'), 'w') as fh:
+		json.dump(summary, fh, indent=2);
+
+	return summary;
+
+
+def _jobs(config : dict) -> list:
+	"""Internal function returning the jobs of a job file, as dictionaries with name, problem, solver and settings.
+	"""
+	problems = config.get('problems', {});
+	solvers = config.get('solvers', {});
+
+	if not problems or not solvers:
+		raise ValueError('The job file must contain problems and solvers')
+
+	jobs = config.get('jobs');
+	if jobs is None:
+		jobs = [{'problem': p, 'solver': s} for p in problems for s in solvers];
+
+	resolved = [];
+	for job in jobs:
+		if job.get('problem') not in problems or job.get('solver') not in solvers:
+			raise ValueError(f'Unknown problem or solver in job {job}')
+
+		settings = dict(solvers[job['solver']]);
+		settings.update(job.get('settings', {}));
+		if 'solver' not in settings:
+			raise ValueError(f"The solver {job['solver']} has no 'solver' entry")
+
+		name = job.get('name', f"{job['problem']}-{job['solver']}");
+		resolved.append({'name': name, 'problem': job['problem'], 'solver': job['solver'],
+						'definition': problems[job['problem']], 'settings': settings});
+
+	names = [job['name'] for job in resolved];
+	if len(set(names)) != len(names):
+		raise ValueError('The names of the jobs must be unique')
+
+	return resolved;
+
+
+def _import(path : str):
+	"""Internal function importing an object given as "module:attribute".
+	"""
+	module, _, attribute = path.partition(':');
+	if not attribute:
+		raise ValueError(f'{path} is not of the form module:attribute')
+	obj = importlib.import_module(module);
+	for name in attribute.split('.'):
+		obj = getattr(obj, name);
+	return obj;
+
+
+def _value(value):
+	"""Internal function converting the lists of a job file to arrays.
+	"""
+	return np.asarray(value, float) if isinstance(value, list) else value;
+
+
+def _arrays(result, names) -> dict:
+	"""Internal function returning the arrays of the result of a solver, by name.
+	"""
+	items = list(result) if isinstance(result, tuple) else [result];
+	if names is None:
+		names = ['x'] if len(items) == 1 else [f'x{k}' for k in range(len(items))];
+	if len(names) != len(items):
+		raise ValueError(f'The solver returns {len(items)} arrays, {len(names)} output names given')
+
+	arrays = {};
+	for name, item in zip(names, items):
+		if isinstance(item, ODESolution):
+			arrays.setdefault('t', item.t);
+		arrays[name] = np.asarray(item);
+	return arrays;
+
+
+def _run(job : dict, path : str, paths : list, cache : str = None) -> dict:
+	"""Internal function running a job (in a worker process), writing its result to path and returning its record for the summary.
+	"""
+	record = {'name': job['name'], 'problem': job['problem'], 'solver': job['solver']};
+	start = time.perf_counter();
+
+	try:
+		for p in paths:
+			if p not in sys.path:
+				sys.path.insert(0, p);
+
+		settings = dict(job['settings']);
+		name = settings.pop('solver');
+		names = settings.pop('outputs', None);
+		solver = _import(name) if ':' in name else getattr(importlib.import_module('odesolvers'), name);
+
+		kwargs = {k: (_import(v) if isinstance(v, str) and ':' in v else _value(v)) for k, v in job['definition'].items()};
+		parameters = inspect.signature(solver).parameters;
+		if not any(p.kind == p.VAR_KEYWORD for p in parameters.values()):
+			kwargs = {k: v for k, v in kwargs.items() if k in parameters};
+		kwargs.update({k: _value(v) for k, v in settings.items()});
+
+		if cache is not None:
+			f = kwargs.pop(next(iter(parameters)));		# right hand side, first argument of the solvers
+			result = SolverCache(cache)(solver, f, **kwargs);
+		else:
+			result = solver(**kwargs);
+		record['seconds'] = time.perf_counter() - start;
+
+		arrays = _arrays(result, names);
+		np.savez_compressed(path, **arrays);
+
+		first = result[0] if isinstance(result, tuple) else result;
+		if isinstance(first, ODESolution):
+			record.update({k: float(v) if k != 'nsteps' else int(v) for k, v in first.stats.items()});
+		else:
+			record['nsteps'] = int(np.shape(first)[0]) - 1;
+		record.update({'status': 'ok', 'output': path, 'bytes': os.path.getsize(path)});
+	except Exception as e:
+		record.update({'status': 'error', 'error': f'{type(e).__name__}: {e}'});
+		record.setdefault('seconds', time.perf_counter() - start);
+
+	return record;
+
+
+def main(argv : list = None) -> int:
+	"""Function implementing the command line odesolvers-batch jobfile [--workers N] [--output DIR] (see RunBatch).
+
+	The summary of the batch is printed (JSON); the exit status is 1 if a job failed.
+	"""
+	parser = argparse.ArgumentParser(prog='odesolvers-batch', description='Run the solver jobs described in a job file (JSON).');
+	parser.add_argument('jobfile', help='job file');
+	parser.add_argument('-w', '--workers', type=int, default=None, help='number of worker processes');
+	parser.add_argument('-o', '--output', default=None, help='output directory of the results and of summary.json');
+	args = parser.parse_args(argv);
+
+	try:
+		summary = RunBatch(args.jobfile, args.workers, args.output);
+	except (OSError, ValueError) as e:
+		parser.error(str(e));
+
+	json.dump(summary, sys.stdout, indent=2);
+	print();
+
+	return 1 if summary['failed'] else 0;
+
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,164 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# File implementing an on-disk cache of the results of the solvers.
+#
+
+import os
+import shutil
+import tempfile
+import functools
+
+from ._cache import _fingerprint, _store, _load, _size
+from .__version__ import __version__
+
+class SolverCache:
+	"""Class implementing an opt-in, content-addressed cache of the results of the solvers on disk.
+
+	A call cache(solver, f, *args, **kwargs) returns solver(f, *args, **kwargs), computing it only
+	if the same solve has not been cached yet. The entries are keyed on the name of the solver, a fingerprint
+	of f (its code, closure, default arguments and referenced global variables), the other arguments
+	(initial values, interval, stepsize, tolerances, ...) and the version of the library.
+	Objects (e.g. an FDOperator passed as f) are fingerprinted by their attributes or, if they define
+	the method _fingerprintdata(), by the data it returns: classes caching lazily computed values in their attributes
+	should define it, for their key not to change after the first use.
+	Results of cache hits are read-only memory-mapped arrays, loaded lazily from disk; solutions (ODESolution)
+	loaded from the cache do not keep the internal state of the solver, hence they cannot be continued.
+	The least recently used entries are evicted when the total size of the cache exceeds maxbytes.
+	Results which are neither arrays, solutions, scalars nor tuples of those are returned without being cached.
+
+	"""
+
+	def __init__(self, directory : str, maxbytes : int = 2**30):
+		"""Constructor.
+
+		- **parameters**, **types**, **return** and **return types**::
+			:param directory: directory of the cache (created if needed)
+			:param maxbytes: maximum total size of the entries, in bytes
+			:type directory: str
+			:type maxbytes: int
+
+		"""
+		if maxbytes <= 0:
+			raise ValueError('The maximum size of the cache must be positive')
+
+		os.makedirs(directory, exist_ok=True);
+		self._directory = directory;
+		self._maxbytes = maxbytes;
+
+	def key(self, solver, f, *args, **kwargs) -> str:
+		"""Function returning the key of the entry of solver(f, *args, **kwargs).
+
+		- **parameters**, **types**, **return** and **return types**::
+			:param solver: solver (e.g. ThetaMethod, AB_AM_PECE2)
+			:param f: function in x' = f(t,x)
+			:param args: other positional arguments of solver
+			:param kwargs: other keyword arguments of solver
+			:type solver: Callable
+			:type f: Callable
+			:type args: tuple
+			:type kwargs: dict
+			:return: key (hexadecimal SHA-256 digest)
+			:rtype: str
+
+		"""
+		name = f'{solver.__module__}.{solver.__qualname__}';
+		return _fingerprint(__version__, name, f, args, kwargs);
+
+	def __call__(self, solver, f, *args, **kwargs):
+		"""Function returning solver(f, *args, **kwargs), from the cache if available.
+
+		- **parameters**, **types**, **return** and **return types**::
+			:param solver: solver (e.g. ThetaMethod, AB_AM_PECE2)
+			:param f: function in x' = f(t,x)
+			:param args: other positional arguments of solver
+			:param kwargs: other keyword arguments of solver
+			:type solver: Callable
+			:type f: Callable
+			:type args: tuple
+			:type kwargs: dict
+			:return: result of the solver
+			:rtype: same as solver
+
+		"""
+		path = os.path.join(self._directory, self.key(solver, f, *args, **kwargs));
+
+		try:
+			result = _load(path);
+			os.utime(path);		# most recently used
+			return result;
+		except FileNotFoundError:	# miss (or entry evicted meanwhile)
+			pass;
+
+		result = solver(f, *args, **kwargs);
+
+		# the entry is written to a temporary directory, then atomically renamed
+		tmp = tempfile.mkdtemp(prefix='.tmp-', dir=self._directory);
+		try:
+			if _store(tmp, result) and _size(tmp) <= self._maxbytes:
+				os.rename(tmp, path);
+		except OSError:		# entry written meanwhile by another process
+			pass;
+		finally:
+			shutil.rmtree(tmp, ignore_errors=True);
+
+		self._evict();
+
+		return result;
+
+	def cached(self, solver):
+		"""Function returning a cached version of solver, with the same arguments.
+
+		- **parameters**, **types**, **return** and **return types**::
+			:param solver: solver (e.g. ThetaMethod, AB_AM_PECE2)
+			:type solver: Callable
+			:return: function calling solver through the cache
+			:rtype: Callable
+
+		"""
+		@functools.wraps(solver)
+		def wrapper(f, *args, **kwargs):
+			return self(solver, f, *args, **kwargs);
+		return wrapper;
+
+	def _entries(self) -> list:
+		"""Internal function returning the entries as (last use, size, path), the least recently used first.
+		"""
+		entries = [];
+		for entry in os.scandir(self._directory):
+			if entry.is_dir() and not entry.name.startswith('.'):
+				try:
+					entries.append((entry.stat().st_mtime, _size(entry.path), entry.path));
+				except FileNotFoundError:
+					pass;
+		return sorted(entries);
+
+	def _evict(self) -> None:
+		"""Internal function evicting the least recently used entries, until the size of the cache is at most maxbytes.
+		"""
+		entries = self._entries();
+		size = sum(s for _, s, _ in entries);
+		for _, s, path in entries:
+			if size <= self._maxbytes:
+				break;
+			shutil.rmtree(path, ignore_errors=True);
+			size -= s;
+
+	@property
+	def size(self) -> int:
+		"""Total size of the entries, in bytes.
+		"""
+		return sum(s for _, s, _ in self._entries());
+
+	def __len__(self):
+		return len(self._entries());
+
+	def clear(self) -> None:
+		"""Function removing all the entries.
+		"""
+		for _, _, path in self._entries():
+			shutil.rmtree(path, ignore_errors=True);
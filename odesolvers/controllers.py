@@ -0,0 +1,168 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# File implementing the stepsize controllers of the adaptive solvers.
+#
+
+import numpy as np
+
+class StepController:
+	"""Base class of the stepsize controllers.
+
+	A controller proposes the next stepsize from the normalized error estimate err of the last step
+	(the step being accepted if err <= 1), the local error behaving as h^k.
+	The new stepsize is limited to [facmin h, facmax h], and cannot grow right after a rejection.
+	A controller keeps the history of one integration: the solvers work on a copy of it.
+
+	"""
+
+	def __init__(self, safety : float = 0.9, facmin : float = 0.2, facmax : float = 5.0):
+		"""Constructor.
+
+		- **parameters**, **types**, **return** and **return types**::
+			:param safety: safety factor
+			:param facmin: minimum ratio between two consecutive stepsizes
+			:param facmax: maximum ratio between two consecutive stepsizes
+			:type safety: np.float
+			:type facmin: np.float
+			:type facmax: np.float
+
+		"""
+		if not 0.0 < safety <= 1.0:
+			raise ValueError('The safety factor has to be between 0 and 1')
+
+		if not 0.0 < facmin < 1.0 < facmax:
+			raise ValueError('The stepsize ratio limits must satisfy 0 < facmin < 1 < facmax')
+
+		self.safety = safety;
+		self.facmin = facmin;
+		self.facmax = facmax;
+		self.reset();
+
+	def reset(self):
+		"""Function clearing the history of the controller.
+		"""
+		self.errprev = None;		# error of the last accepted step
+		self.hprev = None;			# last accepted stepsize
+		self.rejected = False;		# whether the last step has been rejected
+		self.nrejected = 0;			# number of rejected steps
+
+	def accept(self, h : float, err : float, k : int) -> float:
+		"""Function returning the stepsize following an accepted step.
+
+		- **parameters**, **types**, **return** and **return types**::
+			:param h: stepsize of the accepted step
+			:param err: normalized error estimate of the accepted step
+			:param k: exponent of h in the local error
+			:type h: np.float
+			:type err: np.float
+			:type k: int
+			:return: next stepsize
+			:rtype: np.float
+
+		"""
+		err = max(err, 1.0e-10);
+		fac = self._limit(self._factor(h, err, k));
+		if self.rejected:
+			fac = min(fac, 1.0);
+
+		self.errprev, self.hprev, self.rejected = max(err, 1.0e-4), h, False;
+		return h*fac;
+
+	def reject(self, h : float, err : float, k : int) -> float:
+		"""Function returning the stepsize to retry a rejected step with (elementary control).
+
+		- **parameters**, **types**, **return** and **return types**::
+			:param h: stepsize of the rejected step
+			:param err: normalized error estimate of the rejected step
+			:param k: exponent of h in the local error
+			:type h: np.float
+			:type err: np.float
+			:type k: int
+			:return: new stepsize
+			:rtype: np.float
+
+		"""
+		self.rejected = True;
+		self.nrejected += 1;
+		return h*max(self.facmin, min(1.0, self.safety*err**(-1.0/k)));
+
+	def _limit(self, fac : float) -> float:
+		return max(self.facmin, min(self.facmax, fac));
+
+	def _factor(self, h : float, err : float, k : int) -> float:
+		raise NotImplementedError('The stepsize controller must implement _factor')
+
+
+class IController(StepController):
+	"""Elementary (integral) controller: h_{n+1} = safety h_n err_n^(-1/k).
+	"""
+
+	def _factor(self, h, err, k):
+		return self.safety*err**(-1.0/k);
+
+
+class PIController(StepController):
+	"""Proportional-integral controller (Gustafsson, Lundh and Soderlind):
+		h_{n+1} = safety h_n err_n^(-kI/k) (err_{n-1}/err_n)^(kP/k)
+	It damps the oscillations of the stepsize of the elementary controller, reducing the rejected steps.
+
+	"""
+
+	def __init__(self, kI : float = 0.3, kP : float = 0.4, safety : float = 0.9, facmin : float = 0.2, facmax : float = 5.0):
+		"""Constructor.
+
+		- **parameters**, **types**, **return** and **return types**::
+			:param kI: integral gain
+			:param kP: proportional gain
+			:param safety: safety factor
+			:param facmin: minimum ratio between two consecutive stepsizes
+			:param facmax: maximum ratio between two consecutive stepsizes
+			:type kI: np.float
+			:type kP: np.float
+			:type safety: np.float
+			:type facmin: np.float
+			:type facmax: np.float
+
+		"""
+		super().__init__(safety, facmin, facmax);
+		self.kI = kI;
+		self.kP = kP;
+
+	def _factor(self, h, err, k):
+		if self.errprev is None:
+			return self.safety*err**(-1.0/k);
+		return self.safety*err**(-self.kI/k)*(self.errprev/err)**(self.kP/k);
+
+
+class GustafssonController(StepController):
+	"""Predictive controller (Gustafsson), extrapolating the behaviour of the error from the last two steps:
+		h_{n+1} = safety h_n (h_n/h_{n-1}) (err_{n-1}/err_n)^(1/k) err_n^(-1/k)
+	taken if smaller than the elementary proposal. It prevents the rejections when the stepsize has to decrease.
+
+	"""
+
+	def _factor(self, h, err, k):
+		fac = self.safety*err**(-1.0/k);
+		if self.errprev is None:
+			return fac;
+		return min(fac, self.safety*(h/self.hprev)*(self.errprev/(err*err))**(1.0/k));
+
+
+class _DoublingController(StepController):
+	"""Original strategy of AB_AM_PECE2 on a normalized error: shrinking by (0.9/err)^(1/k)
+	until the step is accepted, doubling the following stepsize only if err <= 0.01.
+	"""
+
+	def __init__(self):
+		super().__init__(0.9, 1.0e-10, 2.0);
+
+	def accept(self, h, err, k):
+		return 2*h if err <= 0.01 else h;
+
+	def reject(self, h, err, k):
+		return h*np.power(0.9/err, 1.0/k);
@@ -0,0 +1,134 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# File implementing the theta method for delay differential equations (DDEs) numerical solution.
+#
+
+import numpy as np
+from nptyping import Array
+
+from ._thetamethod import _Theta_step, _Theta_step_retry
+from ._dde import _History
+from ._errornorm import _wrmsnorm
+
+def DDESolver(f, history, delays, t0 : float, tn : float, h : float, theta : float = 0.5, df = None, TOL : float = 1.0e-5, NEWTITER : int = 10, rtol = None, atol = None, maxhalvings : int = 4) -> Array[float]:
+	"""Function implementing the Theta method for delay differential equations (DDEs) numerical solution.
+
+	The DDE to be solved is of the form: x'(t) = f(t, x(t), z(t)), x being a vector in n-dimensions,
+	with z[k,:] = x(t - delays[k]) the delayed states, and x(t) = history(t) for t <= t0.
+	The numerical scheme is the one of ThetaMethod, the delayed states being evaluated from the history of the solution:
+		x_{n+1} = x_n + theta h f(t_n,x_n,z(t_n)) + (1 - theta)h f(t_{n+1},x_{n+1},z(t_{n+1}))
+
+	The history is interpolated by cubic Hermite polynomials (using the states and their derivatives at the steps),
+	each delayed state being found by binary search (O(log n) per evaluation).
+	Only the steps within the maximum delay are kept, so that the memory of the history stays bounded on long runs.
+	Delays shorter than h are evaluated by extrapolating the last step (which lowers the accuracy):
+	for the best accuracy, h should not exceed the smallest delay, and the delays should be multiples of h
+	(so that the discontinuities of the derivatives propagated from t0 fall on the steps).
+
+	If the Newton iteration of a step fails, the step is performed as two steps of size h/2 (halving recursively,
+	up to maxhalvings times), the delayed states being evaluated at the times of the substeps, see ThetaMethod.
+
+	Theta = 1 is equivalent to the Explicit (Forward) Euler method.
+	Theta = 0 is equivalent to the Implicit (Backward) Euler method.
+	Theta = 0.5 (default) is the trapezoidal rule, of order 2.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param f: function in x'(t) = f(t,x(t),z(t))
+		:param history: initial history, function of t (t <= t0) or constant vector
+		:param delays: vector of (positive, constant) delays
+		:param t0: initial time
+		:param tn: final time
+		:param h: step size
+		:param theta: value between 0 and 1
+		:param df: Jacobian of f with respect to x, function of (t,x,z)
+		:param TOL: Numerical tolerance for convergence
+		:param NEWTITER: Maximum number of Newton iterations to be performed
+		:param rtol: relative tolerance of the Newton iteration, see ThetaMethod
+		:param atol: absolute tolerance of the Newton iteration, see ThetaMethod
+		:param maxhalvings: maximum number of times the stepsize is halved when the Newton iteration fails (0 for none)
+		:type f: Callable
+		:type history: Callable or np.array[float]
+		:type delays: np.array[float]
+		:type t0: np.float
+		:type tn: np.float
+		:type h: np.float
+		:type theta: np.float
+		:type df: Callable
+		:type TOL: np.float
+		:type NEWTITER: (unsigned) int
+		:type rtol: np.float or np.array[float]
+		:type atol: np.float or np.array[float]
+		:type maxhalvings: int
+		:return: Vector x containing solution of component j at time i (x[i,j])
+		:rtype: np.array[float,float]
+
+	"""
+
+	delays = np.atleast_1d(np.asarray(delays, float));
+
+	if h <= 0.0:
+		raise ValueError('The stepsize h must be positive')
+
+	if (tn - t0) <= 0.0:
+		raise ValueError('The final time must be greater than the initial time')
+
+	if not 0 <= theta <= 1:
+		raise ValueError('Theta has to be between 0 and 1')
+
+	if TOL <= 0.0:
+		raise ValueError('The numerical tolerance must be positive')
+
+	if (theta != 1) and (NEWTITER < 0.0):
+		raise ValueError('The maximum number of Newton Iteration steps must be positive')
+
+	if maxhalvings < 0:
+		raise ValueError('The maximum number of stepsize halvings must be nonnegative')
+
+	if delays.size == 0 or np.any(delays <= 0.0):
+		raise ValueError('The delays must be positive')
+
+	if (theta != 1) and df is None:
+		raise NotImplementedError('Automatic differentiation not implemented yet. Please provide the Jacobian of f')
+
+	iv = np.atleast_1d(np.asarray(history(t0) if callable(history) else history, float));
+	norm = _wrmsnorm(rtol, atol, iv.size);
+	maxdelay = np.max(delays);
+
+	N : np.int = np.int(np.ceil((tn - t0)/h));	# number of steps
+
+	x = np.empty((np.int(N+1),iv.size), float);	# preallocating the array (+1 for including initial condition)
+	x[0,:] = iv;
+
+	# delayed states at t0, given by the initial history
+	z0 = np.array([(history(t) if callable(history) else iv) for t in (t0 - delays)], float).reshape(delays.size, iv.size);
+	fi = f(t0, x[0,:], z0);
+	hist = _History(history, t0, iv, fi);
+
+	def step(xs, ts, hs, guess):
+		# step from ts to ts+hs (a substep of [ti, ti+h] if the Newton iteration has failed),
+		# the delayed states at its end and its initial derivative being evaluated at its own times
+		zs = znext if ts + hs == ti + h else hist(ts + hs - delays);
+		fs = fi if ts == ti else f(ts, xs, hist(ts - delays));
+		return _Theta_step(lambda t, x: f(t, x, zs), lambda t, x: df(t, x, zs), xs, ts, hs, theta, TOL, NEWTITER, norm, guess, fs);
+
+	for i in range(N):
+		ti = t0 + h*i;
+		# delayed states at the end of the step (constant during the Newton iteration)
+		znext = hist(ti + h - delays);
+
+		if (theta == 1):
+			x[i+1,:] = x[i,:] + h*fi;
+		else:
+			guess = None if i == 0 else 2*x[i,:] - x[i-1,:];
+			x[i+1,:] = _Theta_step_retry(step, x[i,:], ti, h, guess, maxhalvings)[0];
+
+		fi = f(ti + h, x[i+1,:], znext);
+		hist.append(ti + h, x[i+1,:], fi);
+		hist.prune(ti + h - maxdelay);
+
+	return x;
@@ -0,0 +1,51 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# File implementing ensembles of independent integrations.
+#
+
+import numpy as np
+from nptyping import Array
+from typing import List
+
+from ._executor import _get_executor
+
+def Ensemble(solver, f, ivs : List[Array[float]], *args, executor = 'thread', workers : int = None, **kwargs) -> list:
+	"""Function running an ensemble of independent integrations in parallel.
+
+	Each member is solver(f, iv, *args, **kwargs), with one initial value iv of ivs.
+	The members are dispatched to the executor: a thread pool is effective when f releases the GIL
+	(NumPy/SciPy heavy), a process pool otherwise (f, solver and the arguments must then be picklable).
+	The results do not depend on the executor.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param solver: solver (e.g. ThetaMethod, AB_AM_PECE2)
+		:param f: function in x' = f(t,x)
+		:param ivs: initial values of the members of the ensemble
+		:param args: other positional arguments of solver
+		:param executor: executor, or 'thread' (resp. 'process') for a new thread (resp. process) pool
+		:param workers: number of workers of the new pool
+		:param kwargs: other keyword arguments of solver
+		:type solver: Callable
+		:type f: Callable
+		:type ivs: list[np.array[float]]
+		:type args: tuple
+		:type executor: concurrent.futures.Executor or str
+		:type workers: int
+		:type kwargs: dict
+		:return: solutions of the members, in the same order as ivs
+		:rtype: list
+
+	"""
+
+	pool, owned = _get_executor(executor, workers);
+	try:
+		futures = [pool.submit(solver, f, iv, *args, **kwargs) for iv in ivs];
+		return [future.result() for future in futures];
+	finally:
+		if owned:
+			pool.shutdown();
@@ -37,7 +37,7 @@ def ExplicitEulerSolver(f, iv : Array[float], t0 : float, tn : float, h : float)
 	return ThetaMethod(f, iv, t0, tn, h, 1);
 
 
-def ImplicitEulerSolver(f, iv : Array[float], t0 : float, tn : float, h : float, df = None, TOL : float = 1.0e-5, NEWTITER : int = 10) -> Array[float]:
+def ImplicitEulerSolver(f, iv : Array[float], t0 : float, tn : float, h : float, df = None, TOL : float = 1.0e-5, NEWTITER : int = 10, jacobianfree : bool = False, precond = None, executor = None, workers : int = None, rtol = None, atol = None, maxhalvings : int = 4, M = None) -> Array[float]:
 	"""Function implementing the Explicit Euler method for ODEs numerical solution.
 	It leverages the ThetaMethod function.
 
@@ -52,6 +52,14 @@ def ImplicitEulerSolver(f, iv : Array[float], t0 : float, tn : float, h : float,
 		:param df: Jacobian of f
 		:param TOL: Numerical tolerance for convergence
 		:param NEWTITER: Maximum number of Newton iterations to be performed
+		:param jacobianfree: whether to use the Jacobian-free Newton-Krylov iteration (df not needed)
+		:param precond: (only if jacobianfree) preconditioner, see ThetaMethod
+		:param executor: (only if df is None) executor for the finite-difference Jacobian, see ThetaMethod
+		:param workers: number of workers of the new pool, see ThetaMethod
+		:param rtol: relative tolerance of the Newton iteration, see ThetaMethod
+		:param atol: absolute tolerance of the Newton iteration, see ThetaMethod
+		:param maxhalvings: maximum number of times the stepsize is halved when the Newton iteration fails, see ThetaMethod
+		:param M: mass matrix (None for the identity), for M x' = f(t,x), see ThetaMethod
 		:type f: Callable
 		:type iv: np.array[float]
 		:type t0: np.float
@@ -60,10 +68,18 @@ def ImplicitEulerSolver(f, iv : Array[float], t0 : float, tn : float, h : float,
 		:type df: Callable
 		:type TOL: np.float
 		:type NEWTITER: (unsigned) int
+		:type jacobianfree: bool
+		:type precond: LinearOperator or Callable
+		:type executor: concurrent.futures.Executor or str
+		:type workers: int
+		:type rtol: np.float or np.array[float]
+		:type atol: np.float or np.array[float]
+		:type maxhalvings: int
+		:type M: np.array[float,float], ((int, int), np.array[float,float]) or scipy.sparse matrix
 		:return: Vector x containing solution of component j at time i (x[i,j])
 		:rtype: np.array[float,float]
 
 	"""
 
-	return ThetaMethod(f, iv, t0, tn, h, 0, df, TOL, NEWTITER);
+	return ThetaMethod(f, iv, t0, tn, h, 0, df, TOL, NEWTITER, jacobianfree, precond, executor=executor, workers=workers, rtol=rtol, atol=atol, maxhalvings=maxhalvings, M=M);
 
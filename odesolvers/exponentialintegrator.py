@@ -0,0 +1,155 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# File implementing exponential integrators for semilinear ODEs numerical solution.
+#
+
+import numpy as np
+from nptyping import Array
+
+from ._linalg import _shape
+from ._exponential import _phi_dense, _phi_krylov, _ExponentialEuler_step, _ETDRK2_step
+
+def ExponentialIntegrator(A, N, iv : Array[float], t0 : float, tn : float, h : float, order : int = 1, krylovdim : int = 30, krylovtol : float = 1.0e-8) -> Array[float]:
+	"""Function implementing exponential integrators for semilinear ODEs numerical solution.
+
+	The ODE to be solved is of the form: x' = A x + N(t,x), x being a vector in n-dimensions
+	The linear part is integrated exactly, so that the stepsize is limited by the accuracy
+	on N only, and not by the stiffness of A.
+
+	Order = 1 is the Exponential Euler method.
+	Order = 2 is the exponential Runge-Kutta method ETD2RK (Cox and Matthews).
+
+	If A is a dense matrix, the phi-functions of hA are computed once and cached.
+	If A is sparse (scipy.sparse) or banded ((l, u), ab), their actions on vectors are
+	approximated in Krylov subspaces of dimension krylovdim, using only products with A.
+	Their error is estimated a posteriori and kept within krylovtol (relative to the vector), the step h
+	being split into substeps when the subspace is too small for hA (as in expokit); an ArithmeticError
+	is raised if this fails.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param A: matrix in x' = A x + N(t,x)
+		:param N: function in x' = A x + N(t,x) (None if zero)
+		:param iv: vector of initial values
+		:param t0: initial time
+		:param tn: final time
+		:param h: step size
+		:param order: order of the method (1 or 2)
+		:param krylovdim: dimension of the Krylov subspaces (sparse or banded A only)
+		:param krylovtol: tolerance of the Krylov approximations (sparse or banded A only)
+		:type A: np.array[float,float], ((int, int), np.array[float,float]) or scipy.sparse matrix
+		:type N: Callable
+		:type iv: np.array[float]
+		:type t0: np.float
+		:type tn: np.float
+		:type h: np.float
+		:type order: int
+		:type krylovdim: int
+		:type krylovtol: np.float
+		:return: Vector x containing solution of component j at time i (x[i,j])
+		:rtype: np.array[float,float]
+
+	"""
+
+	if h <= 0.0:
+		raise ValueError('The stepsize h must be positive')
+
+	if (tn - t0) <= 0.0:
+		raise ValueError('The final time must be greater than the initial time')
+
+	if order not in (1, 2):
+		raise ValueError('The order has to be 1 or 2')
+
+	if krylovdim < 1:
+		raise ValueError('The dimension of the Krylov subspaces must be positive')
+
+	if krylovtol <= 0.0:
+		raise ValueError('The tolerance of the Krylov approximations must be positive')
+
+	if _shape(A) != (iv.size, iv.size):
+		raise ValueError('The matrix A must be square, with size equal to the number of states')
+
+	if isinstance(A, np.ndarray):
+		phis = _phi_dense(h*A, order);	# cached phi_k(hA), k = 0..order
+		phi = lambda k, v: np.dot(phis[k], v);
+	else:
+		phi = lambda k, v: _phi_krylov(A, v, h, k, krylovdim, krylovtol);
+
+	step = _ExponentialEuler_step if order == 1 else _ETDRK2_step;
+
+	Nsteps : np.int = np.int(np.ceil((tn - t0)/h));	# number of steps
+
+	x = np.empty((np.int(Nsteps+1),iv.size), float);	# preallocating the array (+1 for including initial condition)
+	x[0,:] = iv;
+
+	for i in range(Nsteps):
+		x[i+1,:] = step(A,N,x[i,:],(t0+h*i),h,phi);
+
+	return x;
+
+
+def ExponentialEulerSolver(A, N, iv : Array[float], t0 : float, tn : float, h : float, krylovdim : int = 30, krylovtol : float = 1.0e-8) -> Array[float]:
+	"""Function implementing the Exponential Euler method for semilinear ODEs numerical solution.
+	It leverages the ExponentialIntegrator function.
+
+	The ODE to be solved is of the form: x' = A x + N(t,x), x being a vector in n-dimensions
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param A: matrix in x' = A x + N(t,x)
+		:param N: function in x' = A x + N(t,x) (None if zero)
+		:param iv: vector of initial values
+		:param t0: initial time
+		:param tn: final time
+		:param h: step size
+		:param krylovdim: dimension of the Krylov subspaces (sparse or banded A only)
+		:param krylovtol: tolerance of the Krylov approximations (sparse or banded A only)
+		:type A: np.array[float,float], ((int, int), np.array[float,float]) or scipy.sparse matrix
+		:type N: Callable
+		:type iv: np.array[float]
+		:type t0: np.float
+		:type tn: np.float
+		:type h: np.float
+		:type krylovdim: int
+		:type krylovtol: np.float
+		:return: Vector x containing solution of component j at time i (x[i,j])
+		:rtype: np.array[float,float]
+
+	"""
+
+	return ExponentialIntegrator(A, N, iv, t0, tn, h, 1, krylovdim, krylovtol);
+
+
+def ETDRK2Solver(A, N, iv : Array[float], t0 : float, tn : float, h : float, krylovdim : int = 30, krylovtol : float = 1.0e-8) -> Array[float]:
+	"""Function implementing the exponential Runge-Kutta method of order 2 (ETD2RK)
+	for semilinear ODEs numerical solution.
+	It leverages the ExponentialIntegrator function.
+
+	The ODE to be solved is of the form: x' = A x + N(t,x), x being a vector in n-dimensions
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param A: matrix in x' = A x + N(t,x)
+		:param N: function in x' = A x + N(t,x) (None if zero)
+		:param iv: vector of initial values
+		:param t0: initial time
+		:param tn: final time
+		:param h: step size
+		:param krylovdim: dimension of the Krylov subspaces (sparse or banded A only)
+		:param krylovtol: tolerance of the Krylov approximations (sparse or banded A only)
+		:type A: np.array[float,float], ((int, int), np.array[float,float]) or scipy.sparse matrix
+		:type N: Callable
+		:type iv: np.array[float]
+		:type t0: np.float
+		:type tn: np.float
+		:type h: np.float
+		:type krylovdim: int
+		:type krylovtol: np.float
+		:return: Vector x containing solution of component j at time i (x[i,j])
+		:rtype: np.array[float,float]
+
+	"""
+
+	return ExponentialIntegrator(A, N, iv, t0, tn, h, 2, krylovdim, krylovtol);
@@ -0,0 +1,187 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# File implementing the extrapolation methods for ODEs numerical solution:
+# Gragg-Bulirsch-Stoer and linearly implicit Euler extrapolation.
+#
+
+import numpy as np
+from nptyping import Array
+from typing import Tuple
+
+from ._extrapolation import _Extrapolation_step
+from .solution import _allocate, _grow, _result
+from ._errornorm import _wrmsnorm
+
+def ExtrapolationSolver(f, iv : Array[float], t0 : float, tn : float, h : float = None, ETOL : float = 1.0e-10, df = None, linearlyimplicit : bool = False, kmax : int = None, rtol = None, atol = None, dtype = float, layout : str = 'time', solution : bool = False) -> Tuple[Array[float], Array[float]]:
+	"""Function implementing the extrapolation methods for ODEs numerical solution, with adaptive order and stepsize.
+
+	The ODE to be solved is of the form: x' = f(t,x), x being a vector in n-dimensions
+	Each step combines sequences of substeps of a basic method of increasing number by Richardson extrapolation
+	(Aitken-Neville algorithm), which yields a high order method with a free error estimate:
+	- linearlyimplicit = False: Gragg-Bulirsch-Stoer, explicit midpoint rule (order 2 in even powers), non-stiff problems;
+	- linearlyimplicit = True: linearly implicit Euler (order 1, one factorization per substep sequence), stiff problems.
+	The order and stepsize are chosen at each step to minimize the work per unit step, making these
+	methods the most efficient in this package at stringent tolerances (1e-10 and below).
+	The last step is shortened to end exactly at tn.
+
+	The local error is measured in the RMS norm weighted by ETOL (1 + |x_j|) or, if rtol and/or atol are provided,
+	by atol_j + rtol_j |x_j|.
+	If solution is True, the states are returned as an ODESolution (with the times t and statistics on the steps),
+	otherwise as an array.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param f: function in x' = f(t,x)
+		:param iv: vector of initial values
+		:param t0: initial time
+		:param tn: final time
+		:param h: initial step size (guess)
+		:param ETOL: Error tolerance (relative, and absolute for small components)
+		:param df: Jacobian of f (only if linearlyimplicit)
+		:param linearlyimplicit: whether to use the linearly implicit Euler method instead of the explicit midpoint rule
+		:param kmax: number of rows of the extrapolation table (default to 9, or 12 if linearlyimplicit)
+		:param rtol: relative tolerance (scalar or per component, 1e-3 if only atol is given)
+		:param atol: absolute tolerance (scalar or per component, 1e-6 if only rtol is given)
+		:param dtype: floating-point type of the stored states (the steps being computed in float64), see ThetaMethod
+		:param layout: layout of the stored states, 'time' (x[i,j]) or 'component' (x[j,i]), see ThetaMethod
+		:param solution: whether to return the states as an ODESolution
+		:type f: Callable
+		:type iv: np.array[float]
+		:type t0: np.float
+		:type tn: np.float
+		:type h: np.float
+		:type ETOL: np.float
+		:type df: Callable
+		:type linearlyimplicit: bool
+		:type kmax: int
+		:type rtol: np.float or np.array[float]
+		:type atol: np.float or np.array[float]
+		:type dtype: np.dtype
+		:type layout: str
+		:type solution: bool
+		:return: Vector x containing solution of component j at time i (x[i,j]), and corresponding stepsizes hi
+		:rtype: np.array[float,float] (ODESolution if solution), np.array[float]
+
+	"""
+
+	if h is not None and h <= 0.0:
+		raise ValueError('The stepsize h must be positive')
+
+	if (tn - t0) <= 0.0:
+		raise ValueError('The final time must be greater than the initial time')
+
+	if ETOL <= 0.0:
+		raise ValueError('The numerical tolerance must be positive')
+
+	if kmax is None:
+		kmax = 12 if linearlyimplicit else 9;
+
+	if kmax < 3:
+		raise ValueError('The extrapolation table must have at least 3 rows')
+
+	if linearlyimplicit and df is None:
+		raise NotImplementedError('Automatic differentiation not implemented yet. Please provide the Jacobian of f')
+
+	norm = _wrmsnorm(rtol, atol, iv.size);
+
+	H = min(h if h is not None else 0.01, tn - t0);
+	k = min(max(np.int(-0.6*np.log10(ETOL) + 1.5), 1), kmax-2);	# initial row (as in ODEX)
+
+	N = 64;
+	buf, x = _allocate(N, iv.size, dtype, layout);
+	hi = np.empty((N,1), float);
+	x[0,:] = iv;
+	hi[0] = 0.0;
+
+	xi = np.array(iv, float);		# current state in full precision (x may have a reduced precision)
+	tcount = t0;
+	i = 1;
+	while tcount < tn:
+		if i >= N:
+			N *= 2;
+			buf, x = _grow(buf, N, layout);
+			hi = np.resize(hi, (N,1));
+
+		last = (tcount + H >= tn);
+		xi, hi[i], H, k = _Extrapolation_step(f, df, xi, tcount, (tn - tcount if last else H), k, ETOL, kmax, linearlyimplicit, norm);
+		x[i,:] = xi;
+		tcount = tn if (last and hi[i] == tn - tcount) else tcount + hi[i,0];
+		i += 1;
+
+	return _result(buf, hi, i, solution, t0=t0, layout=layout);
+
+
+def GBSSolver(f, iv : Array[float], t0 : float, tn : float, h : float = None, ETOL : float = 1.0e-10, rtol = None, atol = None, dtype = float, layout : str = 'time', solution : bool = False) -> Tuple[Array[float], Array[float]]:
+	"""Function implementing the Gragg-Bulirsch-Stoer extrapolation method for ODEs numerical solution.
+	It leverages the ExtrapolationSolver function.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param f: function in x' = f(t,x)
+		:param iv: vector of initial values
+		:param t0: initial time
+		:param tn: final time
+		:param h: initial step size (guess)
+		:param ETOL: Error tolerance
+		:param rtol: relative tolerance, see ExtrapolationSolver
+		:param atol: absolute tolerance, see ExtrapolationSolver
+		:param dtype: floating-point type of the stored states (the steps being computed in float64), see ThetaMethod
+		:param layout: layout of the stored states, 'time' (x[i,j]) or 'component' (x[j,i]), see ThetaMethod
+		:param solution: whether to return the states as an ODESolution
+		:type f: Callable
+		:type iv: np.array[float]
+		:type t0: np.float
+		:type tn: np.float
+		:type h: np.float
+		:type ETOL: np.float
+		:type rtol: np.float or np.array[float]
+		:type atol: np.float or np.array[float]
+		:type dtype: np.dtype
+		:type layout: str
+		:type solution: bool
+		:return: Vector x containing solution of component j at time i (x[i,j]), and corresponding stepsizes hi
+		:rtype: np.array[float,float] (ODESolution if solution), np.array[float]
+
+	"""
+
+	return ExtrapolationSolver(f, iv, t0, tn, h, ETOL, rtol=rtol, atol=atol, dtype=dtype, layout=layout, solution=solution);
+
+
+def LinearlyImplicitExtrapolationSolver(f, iv : Array[float], t0 : float, tn : float, h : float = None, ETOL : float = 1.0e-10, df = None, rtol = None, atol = None, dtype = float, layout : str = 'time', solution : bool = False) -> Tuple[Array[float], Array[float]]:
+	"""Function implementing the linearly implicit Euler extrapolation method for stiff ODEs numerical solution.
+	It leverages the ExtrapolationSolver function.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param f: function in x' = f(t,x)
+		:param iv: vector of initial values
+		:param t0: initial time
+		:param tn: final time
+		:param h: initial step size (guess)
+		:param ETOL: Error tolerance
+		:param df: Jacobian of f
+		:param rtol: relative tolerance, see ExtrapolationSolver
+		:param atol: absolute tolerance, see ExtrapolationSolver
+		:param dtype: floating-point type of the stored states (the steps being computed in float64), see ThetaMethod
+		:param layout: layout of the stored states, 'time' (x[i,j]) or 'component' (x[j,i]), see ThetaMethod
+		:param solution: whether to return the states as an ODESolution
+		:type f: Callable
+		:type iv: np.array[float]
+		:type t0: np.float
+		:type tn: np.float
+		:type h: np.float
+		:type ETOL: np.float
+		:type df: Callable
+		:type rtol: np.float or np.array[float]
+		:type atol: np.float or np.array[float]
+		:type dtype: np.dtype
+		:type layout: str
+		:type solution: bool
+		:return: Vector x containing solution of component j at time i (x[i,j]), and corresponding stepsizes hi
+		:rtype: np.array[float,float] (ODESolution if solution), np.array[float]
+
+	"""
+
+	return ExtrapolationSolver(f, iv, t0, tn, h, ETOL, df, linearlyimplicit=True, rtol=rtol, atol=atol, dtype=dtype, layout=layout, solution=solution);
@@ -0,0 +1,92 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# File implementing the finite-difference approximation of the Jacobian of an ODE.
+#
+
+import numpy as np
+from typing import Callable
+
+from ._executor import _chunks, _nworkers
+
+def FDJacobian(f, executor = None, eps : float = None, workers : int = None) -> Callable:
+	"""Function returning the finite-difference approximation of the Jacobian of f.
+
+	The ODE is of the form: x' = f(t,x), x being a vector in n-dimensions
+	Column j of the Jacobian is approximated by the forward difference (f(t,x + d_j e_j) - f(t,x))/d_j.
+	The n evaluations of f are independent: if an executor is provided, they are dispatched to it
+	in workers chunks of columns (one per worker). The result does not depend on the executor nor on workers.
+	A thread pool is effective when f releases the GIL (NumPy/SciPy heavy); with a process pool,
+	f must be picklable.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param f: function in x' = f(t,x)
+		:param executor: executor evaluating the columns (None for serial evaluation)
+		:param eps: relative perturbation (default to the square root of the machine precision)
+		:param workers: number of workers of the executor (default to the number of CPUs)
+		:type f: Callable
+		:type executor: concurrent.futures.Executor
+		:type eps: np.float
+		:type workers: int
+		:return: Jacobian df(t,x) of f
+		:rtype: Callable
+
+	"""
+
+	if eps is None:
+		eps = np.sqrt(np.finfo(float).eps);
+
+	if eps <= 0.0:
+		raise ValueError('The perturbation must be positive')
+
+	if workers is not None and workers < 1:
+		raise ValueError('The number of workers must be positive')
+
+	def df(t, x):
+		x = np.asarray(x, float);
+		fx = np.asarray(f(t, x), float);
+		d = eps*np.maximum(np.abs(x), 1.0);
+
+		J = np.empty((fx.size, x.size), float);
+		if executor is None:
+			J[:,:] = _FD_columns(f, t, x, fx, d, range(x.size));
+		else:
+			chunks = _chunks(x.size, _nworkers(workers));
+			futures = [executor.submit(_FD_columns, f, t, x, fx, d, cols) for cols in chunks];
+			for cols, future in zip(chunks, futures):
+				J[:, cols.start:cols.stop] = future.result();
+		return J;
+
+	return df;
+
+
+def _FD_columns(f, t, x, fx, d, cols):
+	"""Internal function computing the finite-difference approximation of some columns of the Jacobian of f.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param f: function in x' = f(t,x)
+		:param t: current time
+		:param x: current state
+		:param fx: f(t,x)
+		:param d: perturbations of the components of x
+		:param cols: indices of the columns
+		:type f: Callable
+		:type t: np.float
+		:type x: np.array[float]
+		:type fx: np.array[float]
+		:type d: np.array[float]
+		:type cols: range
+		:return: columns cols of the Jacobian
+		:rtype: np.array[float,float]
+
+	"""
+	J = np.empty((fx.size, len(cols)), float);
+	for k, j in enumerate(cols):
+		xj = np.copy(x);
+		xj[j] += d[j];
+		J[:,k] = (np.asarray(f(t, xj), float) - fx)/(xj[j] - x[j]);
+	return J;
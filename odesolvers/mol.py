@@ -0,0 +1,298 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# File implementing finite-difference operators for the method of lines (PDEs discretized in space).
+#
+
+import numpy as np
+import scipy.sparse
+from math import factorial
+from nptyping import Array
+
+from ._linalg import _tobanded
+
+def FDWeights(offsets, order : int, dx : float) -> Array[float]:
+	"""Function computing the finite-difference weights approximating a derivative from the values at given offsets.
+
+	The derivative of the given order at grid point i is approximated by sum_k w[k] u[i + offsets[k]],
+	exactly for polynomials of degree smaller than the number of offsets.
+	E.g. FDWeights([-1, 0, 1], 2, dx) is [1, -2, 1]/dx^2, and FDWeights([-1, 0], 1, dx) is [-1, 1]/dx (upwind).
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param offsets: offsets of the points of the stencil
+		:param order: order of the derivative
+		:param dx: grid spacing
+		:type offsets: list[int]
+		:type order: int
+		:type dx: np.float
+		:return: weights w of the stencil
+		:rtype: np.array[float]
+
+	"""
+
+	offsets = np.asarray(offsets, float);
+
+	if order < 0 or order >= offsets.size:
+		raise ValueError('The stencil must have more points than the order of the derivative')
+
+	if np.unique(offsets).size != offsets.size:
+		raise ValueError('The offsets of the stencil must be distinct')
+
+	# Taylor expansion: sum_k w[k] offsets[k]^m/m! = (m == order)
+	V = np.array([offsets**m/factorial(m) for m in range(offsets.size)]);
+	rhs = np.zeros(offsets.size);
+	rhs[order] = 1.0;
+
+	return np.linalg.solve(V, rhs)/dx**order;
+
+
+def _boundary(bc, width : int, side : str):
+	"""Internal function checking a boundary condition, returning it as (kind, value).
+	"""
+	if width == 0:
+		return None;
+	if bc is None:
+		raise ValueError(f'The stencil needs a boundary condition on the {side}')
+	if bc == 'periodic':
+		return ('periodic', None);
+	if not (isinstance(bc, tuple) and len(bc) == 2 and bc[0] in ('dirichlet', 'neumann')):
+		raise ValueError("The boundary conditions must be ('dirichlet', g), ('neumann', g) or 'periodic'")
+	if width > 1:
+		raise ValueError('Dirichlet and Neumann boundary conditions need a stencil reaching one point beyond the grid')
+	return bc;
+
+
+class FDOperator:
+	"""Class implementing a linear finite-difference operator on a 1-D grid, for the method of lines.
+
+	The operator is (L u)[i] = sum_k weights[k] u[i + offsets[k]], u being the vector of the n unknowns on the grid,
+	and the values beyond the grid being given by the boundary conditions on the left and right:
+	- ('dirichlet', g): the value at the boundary point (one spacing beyond the first/last unknown) is g;
+	- ('neumann', g): the derivative at the first/last unknown (the boundary point) is g (ghost point);
+	- 'periodic' (on both sides): u[i + n] = u[i];
+	- None: no boundary condition, if the stencil does not reach beyond the grid on that side.
+	g is a constant, or a function of t (as well as a vector, for FDOperator2D).
+
+	The operator can be passed as f(t,x) to the solvers (x' = L x + g).
+	It is evaluated by vectorized slice operations (O(n), the matrix being never used),
+	and its Jacobian L is available in the banded format ((l, u), ab) (sparse if periodic), for the implicit solvers:
+	each Newton iteration then costs O(n) as well (instead of O(n^3) with a dense Jacobian).
+
+	"""
+
+	def __init__(self, offsets, weights, n : int, dx : float = 1.0, left = None, right = None):
+		"""Constructor.
+
+		- **parameters**, **types**, **return** and **return types**::
+			:param offsets: offsets of the points of the stencil
+			:param weights: weights of the stencil (e.g. computed with FDWeights)
+			:param n: number of unknowns of the grid
+			:param dx: grid spacing (for the Neumann boundary conditions)
+			:param left: boundary condition on the left
+			:param right: boundary condition on the right
+			:type offsets: list[int]
+			:type weights: np.array[float]
+			:type n: int
+			:type dx: np.float
+			:type left: tuple or str
+			:type right: tuple or str
+
+		"""
+		offsets = np.asarray(offsets, int);
+		weights = np.asarray(weights, float);
+
+		if offsets.shape != weights.shape or offsets.size == 0:
+			raise ValueError('The stencil must have as many weights as offsets')
+
+		if n < max(2, np.max(np.abs(offsets))):
+			raise ValueError('The grid must have more points than the width of the stencil')
+
+		if (left == 'periodic') != (right == 'periodic'):
+			raise ValueError('Periodic boundary conditions must be set on both sides')
+
+		self._offsets = offsets;
+		self._weights = weights;
+		self._n = n;
+		self._dx = dx;
+		self._l = max(0, -np.min(offsets));		# number of ghost points on the left
+		self._r = max(0, np.max(offsets));		# number of ghost points on the right
+		self._left = _boundary(left, self._l, 'left');
+		self._right = _boundary(right, self._r, 'right');
+		self._matrix = None;
+		self._banded = None;
+
+	@property
+	def shape(self):
+		return (self._n, self._n);
+
+	def _value(self, bc, t):
+		"""Internal function evaluating the value g of a boundary condition at time t.
+		"""
+		return bc[1](t) if callable(bc[1]) else bc[1];
+
+	def _apply(self, t : float, u, axis : int = 0):
+		"""Internal function applying the operator along an axis of u (by slices of a padded copy of u).
+		"""
+		u = np.moveaxis(np.asarray(u, float), axis, 0);
+		n, l, r = self._n, self._l, self._r;
+
+		upad = np.empty((l + n + r,) + u.shape[1:], float);
+		upad[l:l+n] = u;
+
+		if self._left is not None:
+			kind = self._left[0];
+			if kind == 'periodic':
+				upad[:l] = u[n-l:];
+			elif kind == 'dirichlet':
+				upad[0] = self._value(self._left, t);
+			else:
+				upad[0] = u[1] - 2*self._dx*self._value(self._left, t);
+		if self._right is not None:
+			kind = self._right[0];
+			if kind == 'periodic':
+				upad[l+n:] = u[:r];
+			elif kind == 'dirichlet':
+				upad[l+n] = self._value(self._right, t);
+			else:
+				upad[l+n] = u[n-2] + 2*self._dx*self._value(self._right, t);
+
+		y = np.zeros(u.shape, float);
+		for o, w in zip(self._offsets, self._weights):
+			y += w*upad[l+o:l+o+n];
+
+		return np.moveaxis(y, 0, axis);
+
+	def __call__(self, t : float, x):
+		"""Function evaluating the operator, L x + g, at time t.
+
+		- **parameters**, **types**, **return** and **return types**::
+			:param t: current time
+			:param x: state at current time
+			:type t: np.float
+			:type x: np.array[float]
+			:return: Derivative of state at current time
+			:rtype: np.array[float]
+
+		"""
+		return self._apply(t, x);
+
+	@property
+	def matrix(self):
+		"""Matrix L of the operator (scipy.sparse, CSC), the boundary values g being excluded.
+		"""
+		if self._matrix is None:
+			n = self._n;
+			rows, cols, data = [], [], [];
+			for o, w in zip(self._offsets, self._weights):
+				i = np.arange(n);
+				j = i + o;
+				inside = (j >= 0) & (j < n);
+				rows.append(i[inside]); cols.append(j[inside]); data.append(np.full(np.count_nonzero(inside), w));
+
+				# ghost points depending on the unknowns
+				for bc, ghost, image in [(self._left, j < 0, lambda j: -j), (self._right, j >= n, lambda j: 2*(n-1) - j)]:
+					if bc is None or not np.any(ghost) or bc[0] == 'dirichlet':
+						continue;
+					jghost = np.mod(j[ghost], n) if bc[0] == 'periodic' else image(j[ghost]);
+					rows.append(i[ghost]); cols.append(jghost); data.append(np.full(np.count_nonzero(ghost), w));
+
+			self._matrix = scipy.sparse.csc_matrix((np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))), shape=(n, n));
+		return self._matrix;
+
+	@property
+	def banded(self):
+		"""Matrix L of the operator in the banded format ((l, u), ab) (None with periodic boundary conditions).
+		"""
+		if self._banded is None and not self._periodic():
+			self._banded = _tobanded(self.matrix);
+		return self._banded;
+
+	def _periodic(self) -> bool:
+		return any(bc is not None and bc[0] == 'periodic' for bc in (self._left, self._right));
+
+	def _fingerprintdata(self):
+		"""Internal function returning the data defining the operator, for the fingerprint of SolverCache
+		(the matrices computed lazily being excluded).
+		"""
+		return (self._offsets, self._weights, self._n, self._dx, self._left, self._right);
+
+	def jacobian(self, t : float = None, x = None, diagonal = None):
+		"""Function returning the Jacobian of the operator, L + diag(diagonal), to be passed as df to the implicit solvers.
+
+		The diagonal allows to add the Jacobian of a pointwise (e.g. reaction) term r(t,x), with diagonal = dr/dx.
+		The Jacobian is banded ((l, u), ab), or sparse with periodic boundary conditions.
+
+		- **parameters**, **types**, **return** and **return types**::
+			:param t: current time (not used, the operator being linear)
+			:param x: state at current time (not used, the operator being linear)
+			:param diagonal: diagonal to be added to L
+			:type t: np.float
+			:type x: np.array[float]
+			:type diagonal: np.array[float]
+			:return: Jacobian of the operator
+			:rtype: ((int, int), np.array[float,float]) or scipy.sparse matrix
+
+		"""
+		if self._periodic():
+			return self.matrix if diagonal is None else (self.matrix + scipy.sparse.diags(diagonal)).tocsc();
+
+		if diagonal is None:
+			return self.banded;
+		(l, u), ab = self.banded;
+		ab = ab.copy();
+		ab[u] += diagonal;
+		return ((l, u), ab);
+
+
+class FDOperator2D(FDOperator):
+	"""Class implementing a linear finite-difference operator on a 2-D grid, for the method of lines.
+
+	The operator is the sum of two 1-D operators, Lx along the first axis and Ly along the second one
+	(e.g. the Laplacian, Lx and Ly being second derivatives), acting on the unknowns u[i,j] on a grid of nx x ny points,
+	stored as the vector x = u.ravel() (row-major).
+	The boundary values g of Lx (resp. Ly) can be vectors of size ny (resp. nx).
+	The banded Jacobian has bandwidths proportional to ny (the second axis should be the shortest one).
+
+	"""
+
+	def __init__(self, Lx : FDOperator, Ly : FDOperator):
+		"""Constructor.
+
+		- **parameters**, **types**, **return** and **return types**::
+			:param Lx: operator along the first axis
+			:param Ly: operator along the second axis
+			:type Lx: FDOperator
+			:type Ly: FDOperator
+
+		"""
+		self._Lx = Lx;
+		self._Ly = Ly;
+		self._n = Lx.shape[0]*Ly.shape[0];
+		self._matrix = None;
+		self._banded = None;
+
+	def __call__(self, t : float, x):
+		"""Function evaluating the operator, Lx u + Ly u + g, at time t (see FDOperator).
+		"""
+		u = np.reshape(x, (self._Lx.shape[0], self._Ly.shape[0]));
+		return np.ravel(self._Lx._apply(t, u, 0) + self._Ly._apply(t, u, 1));
+
+	@property
+	def matrix(self):
+		"""Matrix of the operator (scipy.sparse, CSC), the boundary values g being excluded.
+		"""
+		if self._matrix is None:
+			Ix = scipy.sparse.identity(self._Lx.shape[0]);
+			Iy = scipy.sparse.identity(self._Ly.shape[0]);
+			self._matrix = (scipy.sparse.kron(self._Lx.matrix, Iy) + scipy.sparse.kron(Ix, self._Ly.matrix)).tocsc();
+		return self._matrix;
+
+	def _periodic(self) -> bool:
+		return self._Lx._periodic() or self._Ly._periodic();
+
+	def _fingerprintdata(self):
+		return (self._Lx, self._Ly);
@@ -0,0 +1,164 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# File implementing the Parareal parallel-in-time integration algorithm.
+#
+
+import warnings
+import functools
+import numpy as np
+from nptyping import Array
+
+from ._executor import _get_executor
+
+def Parareal(f, iv : Array[float], t0 : float, tn : float, coarse, fine, nslices : int, TOL : float = 1.0e-8, maxiter : int = None, workers : int = None, executor = 'process', h : float = None) -> Array[float]:
+	"""Function implementing the Parareal algorithm for ODEs numerical solution.
+
+	The ODE to be solved is of the form: x' = f(t,x), x being a vector in n-dimensions
+	The interval [t0, tn] is split into nslices time slices. At each iteration k, the accurate
+	fine propagator is run on all the slices in parallel, starting from the current guesses U_k at
+	the slice boundaries, and the guesses are corrected sequentially with the cheap coarse propagator:
+		U_{k+1}[n+1] = G(U_{k+1}[n]) + F(U_k[n]) - G(U_k[n])
+	The iteration stops when the slice boundaries change less than TOL (in the infinity norm).
+	After k iterations the first k slices are exact, so at most nslices iterations are performed.
+	If maxiter iterations are performed without converging, a RuntimeWarning is issued: the trajectory
+	returned may then be discontinuous at the slice boundaries.
+
+	The propagators are solvers with signature solver(f, iv, t0, tn), e.g.
+	functools.partial(ExplicitEulerSolver, h=0.1) or functools.partial(ThetaMethod, h=0.001, theta=0.5, df=df).
+	A fixed-step fine solver must take a whole number m of steps h on each slice: the slice boundaries are then
+	t0 + k m h, and the fine trajectories are kept up to the end of their slice (solvers taking ceil((tb-ta)/h) steps
+	may take an extra step because of rounding). h is the keyword h of the fine propagator if it is a functools.partial,
+	and None (no constraint) for adaptive fine solvers.
+	When running on a process pool, f and the propagators must be picklable (e.g. module-level functions).
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param f: function in x' = f(t,x)
+		:param iv: vector of initial values
+		:param t0: initial time
+		:param tn: final time
+		:param coarse: coarse propagator
+		:param fine: fine propagator
+		:param nslices: number of time slices
+		:param TOL: Numerical tolerance for convergence
+		:param maxiter: Maximum number of Parareal iterations (default to nslices)
+		:param workers: number of workers of the new pool (if executor is not an Executor)
+		:param executor: executor running the fine propagators, or 'thread' (resp. 'process') for a new thread (resp. process) pool
+		:param h: stepsize of the fine propagator (default to its keyword h, see above)
+		:type f: Callable
+		:type iv: np.array[float]
+		:type t0: np.float
+		:type tn: np.float
+		:type coarse: Callable
+		:type fine: Callable
+		:type nslices: int
+		:type TOL: np.float
+		:type maxiter: int
+		:type workers: int
+		:type executor: concurrent.futures.Executor or str
+		:type h: np.float
+		:return: Vector x containing the fine solution of component j at time i (x[i,j])
+		:rtype: np.array[float,float]
+
+	"""
+
+	if (tn - t0) <= 0.0:
+		raise ValueError('The final time must be greater than the initial time')
+
+	if nslices < 1:
+		raise ValueError('The number of time slices must be positive')
+
+	if TOL <= 0.0:
+		raise ValueError('The numerical tolerance must be positive')
+
+	if maxiter is None or maxiter > nslices:
+		maxiter = nslices;
+
+	if h is None and isinstance(fine, functools.partial):
+		h = fine.keywords.get('h');
+
+	if h is None:
+		m = None;
+		T = np.linspace(t0, tn, nslices+1);		# slice boundaries
+	else:
+		M = np.int(np.rint((tn - t0)/h));		# number of fine steps
+		if M == 0 or M % nslices != 0 or not np.isclose(M*h, tn - t0, rtol=1.0e-10, atol=0.0):
+			raise ValueError('The stepsize of the fine propagator must divide the length of the time slices')
+		m = M//nslices;		# number of fine steps per slice
+		T = t0 + m*h*np.arange(nslices+1);
+		T[-1] = tn;
+
+	# initial guess: sequential coarse sweep
+	U = np.empty((nslices+1, iv.size), float);
+	G = np.empty((nslices, iv.size), float);
+	U[0,:] = iv;
+	for n in range(nslices):
+		G[n,:] = _propagate(coarse, f, U[n,:], T[n], T[n+1])[-1];
+		U[n+1,:] = G[n,:];
+
+	traj = [None]*nslices;		# fine trajectories on each slice
+
+	pool, owned = _get_executor(executor if executor is not None else 'process', workers);
+	try:
+		for k in range(maxiter):
+			# fine propagation in parallel (the first k slices are already exact)
+			futures = {n: pool.submit(_propagate, fine, f, U[n,:], T[n], T[n+1]) for n in range(k, nslices)};
+			for n in range(k, nslices):
+				traj[n] = futures[n].result() if m is None else _slice(futures[n].result(), m);
+
+			# sequential coarse correction
+			Unew = np.copy(U);
+			for n in range(k, nslices):
+				Gnew = _propagate(coarse, f, Unew[n,:], T[n], T[n+1])[-1];
+				Unew[n+1,:] = Gnew + traj[n][-1] - G[n,:];
+				G[n,:] = Gnew;
+
+			err = np.max(np.abs(Unew - U));
+			U = Unew;
+			if err <= TOL:
+				break
+		else:
+			if k+1 < nslices:
+				warnings.warn(f'Parareal has not converged in {maxiter} iterations (change {err:g} > TOL)', RuntimeWarning);
+	finally:
+		if owned:
+			pool.shutdown();
+
+	return np.concatenate([traj[0]] + [traj[n][1:] for n in range(1, nslices)]);
+
+
+def _propagate(solver, f, x0, ta, tb):
+	"""Internal function running a propagator of Parareal on one time slice.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param solver: propagator
+		:param f: function in x' = f(t,x)
+		:param x0: initial condition at time ta
+		:param ta: initial time
+		:param tb: final time
+		:type solver: Callable
+		:type f: Callable
+		:type x0: np.array[float]
+		:type ta: np.float
+		:type tb: np.float
+		:return: Vector x containing solution of component j at time i (x[i,j])
+		:rtype: np.array[float,float]
+
+	"""
+	x = solver(f, x0, ta, tb);
+	if isinstance(x, tuple):	# solvers also returning the stepsizes
+		x = x[0];
+	return x;
+
+
+def _slice(x, m : int):
+	"""Internal function returning the m+1 states of a fine trajectory on a slice of m steps, without the extra step
+	a fixed-step solver may take because of rounding (raising ValueError if it has less states).
+	"""
+	if x.shape[0] < m+1:
+		raise ValueError('The fine propagator must take steps of size h')
+	return x[:m+1];
@@ -13,15 +13,38 @@ import numpy as np
 from nptyping import Array
 from typing import Tuple
 from numpy_ringbuffer import RingBuffer
+from copy import copy
 
-from ._expliciteuler import _ExplicitEuler_step
-from ._predictorcorrector import _PECE_step
+from ._async import _evaluate, _run
+from ._predictorcorrector import _PECE_step, _PECE_step_async
+from ._checkpoint import _save_checkpoint, _load_checkpoint
+from .solution import ODESolution, _allocate, _grow, _result
+from ._errornorm import _wrmsnorm, _tolerances
 
-def AB_AM_PECE2(f, iv : Array[float], t0 : float, tn : float, h : float = None, ETOL : float = 1.0e-5) -> Tuple[Array[float], Array[float]]:
+def AB_AM_PECE2(f, iv : Array[float], t0 : float, tn : float, h : float = None, ETOL : float = 1.0e-5, checkpoint : str = None, checkpointevery : int = 100, controller = None, rtol = None, atol = None, solution : bool = False, dtype = float, layout : str = 'time') -> Tuple[Array[float], Array[float]]:
 	"""Function implementing the predictor-corrector method of order 2, using Adams-Bashforth and Adams-Moulton.
 
 	The ODE to be solved is of the form: x' = f(t,x), x being a vector in n-dimensions
 
+	If solution is True, the states are returned as an ODESolution (with the times t and statistics on the steps),
+	which keeps the state of the solver, so that the integration can be continued to a later final time
+	with AB_AM_PECE2_continue. Otherwise they are returned as an array.
+	The states can be stored with a reduced precision (e.g. dtype = np.float32, halving the memory),
+	the steps being always computed in float64, and component-major (layout = 'component'), see ThetaMethod.
+
+	If checkpoint is provided, the state of the solver (including the multistep history and the predicted
+	stepsize) is saved to that file every checkpointevery steps, and the integration can be continued
+	from there with AB_AM_PECE2_resume. The states and stepsizes computed so far are kept in the files
+	checkpoint + '.x' and checkpoint + '.hi', to which each checkpoint appends only its new steps.
+
+	The stepsize is selected by the given controller (see IController, PIController, GustafssonController),
+	or by default by the original strategy: shrinking by (0.9*ETOL/(h*lte))^(1/3) until the step is accepted,
+	and doubling the following stepsize only if lte <= 0.01*ETOL.
+
+	By default, a step is accepted if h times the 2-norm of the local error estimate lte is within ETOL.
+	If rtol and/or atol are provided, a step is accepted if lte is within the tolerances in the weighted RMS norm
+	sqrt(mean((lte_j/(atol_j + rtol_j |x_j|))^2)): this is needed when the components have very different scales.
+
 	- **parameters**, **types**, **return** and **return types**::
 		:param f: function in x' = f(t,x)
 		:param iv: vector of initial values
@@ -29,17 +52,41 @@ def AB_AM_PECE2(f, iv : Array[float], t0 : float, tn : float, h : float = None,
 		:param tn: final time
 		:param h: step size
 		:param ETOL: Error tolerance
+		:param checkpoint: checkpoint file (None for no checkpoints)
+		:param checkpointevery: number of steps between two checkpoints
+		:param controller: stepsize controller (None for the original strategy)
+		:param rtol: relative tolerance (scalar or per component, 1e-3 if only atol is given)
+		:param atol: absolute tolerance (scalar or per component, 1e-6 if only rtol is given)
+		:param solution: whether to return the states as an ODESolution
+		:param dtype: floating-point type of the stored states
+		:param layout: layout of the stored states, 'time' (x[i,j]) or 'component' (x[j,i])
 		:type f: Callable
 		:type iv: np.array[float]
 		:type t0: np.float
 		:type tn: np.float
 		:type h: np.float
 		:type TOL: np.float
+		:type checkpoint: str
+		:type checkpointevery: int
+		:type controller: StepController
+		:type rtol: np.float or np.array[float]
+		:type atol: np.float or np.array[float]
+		:type solution: bool
+		:type dtype: np.dtype
+		:type layout: str
 		:return: Vector x containing solution of component j at time i (x[i,j]), and corresponding stepsizes hi
-		:rtype: np.array[float,float], np.array[float]
+		:rtype: np.array[float,float] (ODESolution if solution), np.array[float]
 
 	"""
 
+	return _run(_AB_AM_PECE2_async(f, iv, t0, tn, h, ETOL, checkpoint, checkpointevery, controller, rtol, atol, solution, dtype, layout));
+
+
+async def _AB_AM_PECE2_async(f, iv : Array[float], t0 : float, tn : float, h : float = None, ETOL : float = 1.0e-5, checkpoint : str = None, checkpointevery : int = 100, controller = None, rtol = None, atol = None, solution : bool = False, dtype = float, layout : str = 'time') -> Tuple[Array[float], Array[float]]:
+	"""Internal coroutine implementing AB_AM_PECE2 and AB_AM_PECE2Async, f being possibly a coroutine function.
+	See AB_AM_PECE2 for the parameters.
+	"""
+
 	if h is not None and h <= 0.0:
 		raise ValueError('The stepsize h must be positive')
 
@@ -49,6 +96,11 @@ def AB_AM_PECE2(f, iv : Array[float], t0 : float, tn : float, h : float = None,
 	if ETOL <= 0.0:
 		raise ValueError('The numerical tolerance must be positive')
 
+	if checkpointevery < 1:
+		raise ValueError('The number of steps between checkpoints must be positive')
+
+	_wrmsnorm(rtol, atol, iv.size);		# checking the tolerances
+
 	# circular buffers to store previous function evaluations and stepsizes
 	fprevAB = RingBuffer(2, dtype=((np.float, iv.size) if iv.size > 1 else np.float));
 	hprev = RingBuffer(1, dtype=np.float);		# -1 wrt fprevAB size
@@ -56,7 +108,7 @@ def AB_AM_PECE2(f, iv : Array[float], t0 : float, tn : float, h : float = None,
 	N = np.int(np.ceil((tn - t0)/(h if h is not None else 0.01)));	# number of steps (guess in case h is None)
 	# x collects the states, hi the corresponding stepsizes
 	# preallocating the x and hi arrays (+1 for including initial condition)
-	x = np.empty((np.int(N+1),iv.size), float);
+	buf, x = _allocate(np.int(N+1), iv.size, dtype, layout);
 	hi = np.empty((np.int(N+1),1), float);
 
 	x[0,:] = iv;
@@ -68,28 +120,231 @@ def AB_AM_PECE2(f, iv : Array[float], t0 : float, tn : float, h : float = None,
 	else:
 		hi[1] = h;
 
-	x[1,:] = _ExplicitEuler_step(f,x[0,:],t0,hi[1]);
-	fprevAB.append(f(t0,x[0,:]));
-	fprevAB.append(f(t0+hi[1],x[1,:]));
+	xi = np.array(iv, float);		# current state in full precision (x may have a reduced precision)
+	f0 = await _evaluate(f, t0, xi);
+	xi = xi + hi[1]*f0;
+	x[1,:] = xi;
+	fprevAB.append(f0);
+	fprevAB.append(await _evaluate(f, t0+hi[1], xi));
 	hprev.append(hi[1]);
 
 	tcount = t0 + hi[1];		# to check for termination
 	i : np.uint = 2;			# to check for vector sizes
-	hfuture : np.float = hi[1];	# guess on future stepsize (updated at every iteration)
+	hfuture : np.float = hi[1,0];	# guess on future stepsize (updated at every iteration)
+
+	if controller is not None:
+		controller = copy(controller);		# the history of the controller is specific to this integration
+		controller.reset();
+
+	buf, hi, n, state = await _AB_AM_PECE2_loop_async(f, buf, hi, i, N, t0, tcount, hfuture, fprevAB, hprev, h, ETOL, tn, controller, checkpoint, checkpointevery,
+														rtol, atol, 0, xi, layout, solution);
+	return _result(buf, hi, n, solution, state, state['t0'], layout, h);
+
+
+def AB_AM_PECE2_continue(f, sol : ODESolution, tn : float, checkpoint : str = None, checkpointevery : int = 100) -> Tuple[Array[float], Array[float]]:
+	"""Function continuing an AB_AM_PECE2 solution to a later final time.
+
+	The integration continues from the last state of sol with its multistep history and predicted stepsize,
+	exactly as if the original integration had been run up to the new final time.
+	The new steps are appended in place to sol (and to its storage, which is enlarged if needed).
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param f: function in x' = f(t,x)
+		:param sol: solution returned by AB_AM_PECE2 with solution=True (or AB_AM_PECE2_continue, AB_AM_PECE2_resume)
+		:param tn: new final time
+		:param checkpoint: checkpoint file (None for no checkpoints)
+		:param checkpointevery: number of steps between two checkpoints
+		:type f: Callable
+		:type sol: ODESolution
+		:type tn: np.float
+		:type checkpoint: str
+		:type checkpointevery: int
+		:return: Vector x containing solution of component j at time i (x[i,j]), and corresponding stepsizes hi
+		:rtype: ODESolution, np.array[float]
+
+	"""
+
+	if not isinstance(sol, ODESolution) or sol._state is None or sol._state.get('solver') != 'AB_AM_PECE2':
+		raise ValueError('The solution has not been computed by AB_AM_PECE2 (with solution=True)')
+
+	state = sol._state;
+
+	if tn <= state['tcount']:
+		raise ValueError('The final time must be greater than the current final time of the solution')
+
+	if checkpointevery < 1:
+		raise ValueError('The number of steps between checkpoints must be positive')
+
+	buf, hi, i = sol._x, sol._hi, len(sol);
+
+	# enlarging the storage once, for the expected number of additional steps
+	N = hi.shape[0];
+	Nneeded = i + np.int(np.ceil((tn - state['tcount'].item())/state['hfuture'])) + 1;
+	if Nneeded > N:
+		N = Nneeded;
+		buf = _grow(buf, N, sol.layout)[0];
+		hi = np.resize(hi, (N,1));
+
+	sol._x, sol._hi, sol._n, sol._state = _run(_AB_AM_PECE2_loop_async(f, buf, hi, i, N, state['t0'], state['tcount'], state['hfuture'], state['fprevAB'], state['hprev'],
+																		state['h'], state['ETOL'], tn, state['controller'], checkpoint, checkpointevery,
+																		state['rtol'], state['atol'], 0, state['xi'], sol.layout, True));
+
+	return sol, sol.hi;
+
+
+def AB_AM_PECE2_resume(f, checkpoint : str, controller = None, solution : bool = None) -> Tuple[Array[float], Array[float]]:
+	"""Function continuing an AB_AM_PECE2 integration from a checkpoint.
+
+	The integration continues exactly (bit-for-bit) as the original one would have,
+	with the same settings (including the storage of the states, and whether they are returned as an ODESolution),
+	and keeps saving checkpoints to the same file.
+	The function f and the stepsize controller are not stored in the checkpoint, and must be provided again
+	(the history of the controller is restored).
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param f: function in x' = f(t,x)
+		:param checkpoint: checkpoint file written by AB_AM_PECE2
+		:param controller: stepsize controller of the original integration
+		:param solution: whether to return the states as an ODESolution, see AB_AM_PECE2 (None for the setting of the original integration)
+		:type f: Callable
+		:type checkpoint: str
+		:type controller: StepController
+		:type solution: bool
+		:return: Vector x containing solution of component j at time i (x[i,j]), and corresponding stepsizes hi
+		:rtype: np.array[float,float] (ODESolution if solution), np.array[float]
+
+	"""
+
+	state = _load_checkpoint(checkpoint, 'AB_AM_PECE2');
+
+	i = int(state['i']);
+	N = int(state['N']);
+	n = state['x'].shape[1];
+
+	layout = str(state.get('layout', 'time'));
+	if solution is None:
+		solution = bool(state.get('solution', False));
+
+	buf, x = _allocate(N, n, state['x'].dtype, layout);
+	hi = np.empty((N,1), float);
+	x[:i,:] = state['x'];
+	hi[:i] = state['hi'];
+
+	fprevAB = RingBuffer(2, dtype=((np.float, n) if n > 1 else np.float));
+	hprev = RingBuffer(1, dtype=np.float);
+	for fp in state['fprevAB']:
+		fprevAB.append(fp);
+	for hp in state['hprev']:
+		hprev.append(hp);
+
+	h = state['h'].item() if bool(state['fixed']) else None;
+
+	if ('controller' in state) != (controller is not None):
+		raise ValueError('The stepsize controller must be provided if and only if the original integration used one')
+
+	if controller is not None:
+		controller = copy(controller);
+		_restore_controller(controller, state['controller']);
+
+	t0 = state['t0'].item() if 't0' in state else (state['tcount'] - np.sum(state['hi'])).item();
+
+	buf, hi, n, state = _run(_AB_AM_PECE2_loop_async(f, buf, hi, i, N, t0, state['tcount'], state['hfuture'].item(), fprevAB, hprev, h,
+													state['ETOL'].item(), state['tn'].item(), controller, checkpoint, int(state['checkpointevery']),
+													state.get('rtol'), state.get('atol'), i, state.get('xi'), layout, solution));
+	return _result(buf, hi, n, solution, state, state['t0'], layout, h);
+
+
+async def _AB_AM_PECE2_loop_async(f, buf, hi, i, N, t0, tcount, hfuture, fprevAB, hprev, h, ETOL, tn, controller, checkpoint, checkpointevery, rtol = None, atol = None, saved = 0, xi = None, layout = 'time', solution = False):
+	"""Internal coroutine running the steps of the predictor-corrector method until tn is reached.
+	See AB_AM_PECE2 for the parameters not listed here.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param buf: preallocated buffer of the states (see _allocate), filled up to step i-1
+		:param hi: preallocated stepsizes, filled up to row i-1
+		:param i: index of the next step
+		:param N: number of rows of x and hi
+		:param t0: initial time
+		:param tcount: current time
+		:param hfuture: guess on the next stepsize
+		:param fprevAB: previous function evaluations
+		:param hprev: previous step sizes
+		:param controller: stepsize controller (None for the original strategy)
+		:param rtol: relative tolerance
+		:param atol: absolute tolerance
+		:param saved: number of rows of x and hi already in the checkpoint
+		:param xi: state at step i-1 in full precision (None for the one stored in buf)
+		:param layout: layout of buf
+		:param solution: whether the states are returned as an ODESolution (saved in the checkpoint)
+		:type buf: np.array[float,float]
+		:type hi: np.array[float]
+		:type i: int
+		:type N: int
+		:type t0: np.float
+		:type tcount: np.float
+		:type hfuture: np.float
+		:type fprevAB: RingBuffer(np.array[float])
+		:type hprev: Ringbuffer(float)
+		:type controller: StepController
+		:type rtol: np.float or np.array[float]
+		:type atol: np.float or np.array[float]
+		:type saved: int
+		:type xi: np.array[float]
+		:type layout: str
+		:type solution: bool
+		:return: buffers of the states and of the stepsizes, number of steps, state of the solver
+		:rtype: np.array[float,float], np.array[float], int, dict
+
+	"""
+
+	x = buf if layout == 'time' else buf.T;
+	xi = np.array(x[i-1,:] if xi is None else xi, float);
+
+	norm = _wrmsnorm(rtol, atol, x.shape[1]);
+	tolerances = _tolerances(rtol, atol);
 
 	while tcount < tn:
 		if i >= N:
 			N *= 2;
-			x = np.resize(x, (N,iv.size));
+			buf, x = _grow(buf, N, layout);
 			hi = np.resize(hi, (N,1));
 
-		x[i,:], hi[i], hfuture = _PECE_step(f,x[i-1,:],tcount,h,fprevAB,hprev,hfuture,ETOL);
+		xi, hi[i], hfuture = await _PECE_step_async(f,xi,tcount,h,fprevAB,hprev,hfuture,ETOL,controller,norm);
+		x[i,:] = xi;
 		tcount += hi[i];
-		fprevAB.append(f(tcount,x[i,:]));
+		fprevAB.append(await _evaluate(f, tcount, xi));
 		hprev.append(hi[i]);
 		i += 1;
 
-	return x[:i,:], hi[:i];
+		if checkpoint is not None and i % checkpointevery == 0:
+			_save_checkpoint(checkpoint, {'x': (x[:i,:], saved), 'hi': (hi[:i], saved)}, solver='AB_AM_PECE2', i=i, N=N, t0=t0, tcount=tcount, hfuture=hfuture,
+								fprevAB=np.array(fprevAB), hprev=np.array(hprev), fixed=(h is not None), h=(h if h is not None else 0.0),
+								ETOL=ETOL, tn=tn, checkpointevery=checkpointevery, xi=xi, layout=layout, solution=solution,
+								**_controller_state(controller), **tolerances);
+			saved = i;
+
+	state = {'solver': 'AB_AM_PECE2', 't0': t0, 'tcount': tcount, 'hfuture': hfuture, 'fprevAB': fprevAB, 'hprev': hprev, 'h': h, 'ETOL': ETOL,
+				'controller': controller, 'rtol': rtol, 'atol': atol, 'xi': xi, 'layout': layout};
+
+	return buf, hi, i, state;
+
+
+def _controller_state(controller) -> dict:
+	"""Internal function returning the history of a stepsize controller to be saved in a checkpoint.
+	"""
+	if controller is None:
+		return {};
+	return {'controller': np.array([np.nan if controller.errprev is None else controller.errprev,
+									np.nan if controller.hprev is None else controller.hprev,
+									controller.rejected, controller.nrejected], float)};
+
+
+def _restore_controller(controller, history):
+	"""Internal function restoring the history of a stepsize controller saved by _controller_state.
+	"""
+	controller.errprev = None if np.isnan(history[0]) else history[0].item();
+	controller.hprev = None if np.isnan(history[1]) else history[1].item();
+	controller.rejected = bool(history[2]);
+	controller.nrejected = int(history[3]);
 
 
 def AB_AM_PECE2_interpatT(f, t : float, tvec : Array[float], xvec : Array[float]) -> Array[float]:
@@ -0,0 +1,147 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# File implementing the Runge-Kutta-Chebyshev method, stabilized explicit method for mildly stiff (e.g. diffusion) problems.
+#
+
+import numpy as np
+from nptyping import Array
+from typing import Tuple
+from copy import copy
+
+from ._rkc import _RKC_step, _spectralradius
+from .controllers import PIController
+from .solution import _allocate, _grow, _result
+from ._errornorm import _wrmsnorm
+
+def RKCSolver(f, iv : Array[float], t0 : float, tn : float, h : float = None, ETOL : float = 1.0e-5, rho = None, rhoevery : int = 25, smax : int = 250, controller = None, rtol = None, atol = None, dtype = float, layout : str = 'time', solution : bool = False) -> Tuple[Array[float], Array[float]]:
+	"""Function implementing the Runge-Kutta-Chebyshev method (RKC, second order) for ODEs numerical solution, with adaptive stepsize.
+
+	The ODE to be solved is of the form: x' = f(t,x), x being a vector in n-dimensions,
+	the eigenvalues of the Jacobian of f lying close to the negative real axis, e.g. discretized diffusion (see FDOperator).
+	The method is explicit (f only is evaluated, no Jacobian nor linear system is needed), and its number of stages s
+	is chosen at each step to make it stable: the interval of stability [-0.653 s^2, 0] grows quadratically with s,
+	so that the cost of a step of size h is proportional to sqrt(h rho), rho being the spectral radius of the Jacobian,
+	instead of h rho for explicit Euler. The stepsize is then limited by the accuracy only.
+
+	The spectral radius is estimated by nonlinear power iteration on f (as in RKC), at the first step,
+	then every rhoevery steps and after rejected steps (warm started from the previous dominant direction).
+	It can also be given, as a constant or a function rho(t,x) (e.g. 4 D/dx^2 for the diffusion x' = D x_ss).
+	The local error is measured in the RMS norm weighted by ETOL (1 + |x_j|) or, if rtol and/or atol are provided,
+	by atol_j + rtol_j |x_j|. The last step is shortened to end exactly at tn.
+	If solution is True, the states are returned as an ODESolution (with the times t and statistics on the steps),
+	otherwise as an array.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param f: function in x' = f(t,x)
+		:param iv: vector of initial values
+		:param t0: initial time
+		:param tn: final time
+		:param h: initial step size (guess, None for an automatic choice)
+		:param ETOL: Error tolerance (relative, and absolute for small components)
+		:param rho: spectral radius of the Jacobian of f (None for its estimation by power iteration)
+		:param rhoevery: number of steps between two estimates of the spectral radius
+		:param smax: maximum number of stages (limiting the stepsize)
+		:param controller: stepsize controller (None for a PIController)
+		:param rtol: relative tolerance (scalar or per component, 1e-3 if only atol is given)
+		:param atol: absolute tolerance (scalar or per component, 1e-6 if only rtol is given)
+		:param dtype: floating-point type of the stored states (the steps being computed in float64), see ThetaMethod
+		:param layout: layout of the stored states, 'time' (x[i,j]) or 'component' (x[j,i]), see ThetaMethod
+		:param solution: whether to return the states as an ODESolution
+		:type f: Callable
+		:type iv: np.array[float]
+		:type t0: np.float
+		:type tn: np.float
+		:type h: np.float
+		:type ETOL: np.float
+		:type rho: np.float or Callable
+		:type rhoevery: int
+		:type smax: int
+		:type controller: StepController
+		:type rtol: np.float or np.array[float]
+		:type atol: np.float or np.array[float]
+		:type dtype: np.dtype
+		:type layout: str
+		:type solution: bool
+		:return: Vector x containing solution of component j at time i (x[i,j]), and corresponding stepsizes hi
+		:rtype: np.array[float,float] (ODESolution if solution), np.array[float]
+
+	"""
+
+	if h is not None and h <= 0.0:
+		raise ValueError('The stepsize h must be positive')
+
+	if (tn - t0) <= 0.0:
+		raise ValueError('The final time must be greater than the initial time')
+
+	if ETOL <= 0.0:
+		raise ValueError('The numerical tolerance must be positive')
+
+	if rhoevery < 1:
+		raise ValueError('The number of steps between two estimates of the spectral radius must be positive')
+
+	if smax < 3:
+		raise ValueError('The maximum number of stages must be at least 3')
+
+	if rho is not None and not callable(rho) and rho < 0.0:
+		raise ValueError('The spectral radius must be non-negative')
+
+	norm = _wrmsnorm(rtol, atol, iv.size);
+	if norm is None:
+		errnorm = lambda v, x, y: np.sqrt(np.mean((v/(ETOL*(1.0 + np.maximum(np.abs(x), np.abs(y)))))**2));
+	else:
+		errnorm = norm;
+
+	controller = copy(controller) if controller is not None else PIController();	# the history of the controller is specific to this integration
+	controller.reset();
+
+	N = 64;
+	buf, x = _allocate(N, iv.size, dtype, layout);
+	hi = np.empty((N,1), float);
+	x[0,:] = iv;
+	hi[0] = 0.0;
+
+	xi = np.array(iv, float);		# current state in full precision (x may have a reduced precision)
+	fi = f(t0, xi);
+	v = None;				# dominant direction of the Jacobian (power iteration)
+
+	def spectralradius(t, xt, ft, v):
+		if rho is None:
+			return _spectralradius(f, t, xt, ft, v);
+		return (rho(t, xt) if callable(rho) else rho), v;
+
+	sigma, v = spectralradius(t0, xi, fi, v);
+
+	if h is None:
+		# initial stepsize as in RKC: stable for explicit Euler, then limited by a rough estimate of the local error
+		H = min(tn - t0, 1.0/sigma if sigma > 0.0 else np.inf);
+		est = errnorm(H*(f(t0 + H, xi + H*fi) - fi), xi, xi);
+		if est > 0.01:
+			H *= np.sqrt(0.01/est);
+	else:
+		H = min(h, tn - t0);
+
+	tcount = t0;
+	i = 1;
+	nrejected = 0;
+	while tcount < tn:
+		if i >= N:
+			N *= 2;
+			buf, x = _grow(buf, N, layout);
+			hi = np.resize(hi, (N,1));
+
+		if i > 1 and (i % rhoevery == 1 or controller.nrejected > nrejected):
+			sigma, v = spectralradius(tcount, xi, fi, v);
+			nrejected = controller.nrejected;
+
+		last = (tcount + H >= tn);
+		xi, hi[i], H, fi, _ = _RKC_step(f, xi, tcount, (tn - tcount if last else H), fi, sigma, smax, controller, errnorm);
+		x[i,:] = xi;
+		tcount = tn if (last and hi[i] == tn - tcount) else tcount + hi[i,0];
+		i += 1;
+
+	return _result(buf, hi, i, solution, t0=t0, layout=layout);
@@ -0,0 +1,113 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# File implementing the Rosenbrock (linearly implicit) methods for stiff ODEs numerical solution.
+#
+
+import numpy as np
+from nptyping import Array
+from typing import Tuple
+from copy import copy
+
+from ._rosenbrock import _Rosenbrock_step, _ROS34PW2
+from .controllers import PIController
+from .solution import _allocate, _grow, _result
+from ._errornorm import _wrmsnorm
+
+def RosenbrockSolver(f, iv : Array[float], t0 : float, tn : float, h : float = None, ETOL : float = 1.0e-5, df = None, controller = None, rtol = None, atol = None, dtype = float, layout : str = 'time', solution : bool = False) -> Tuple[Array[float], Array[float]]:
+	"""Function implementing the Rosenbrock method ROS34PW2 (Rang and Angermann) for stiff ODEs numerical solution, with adaptive stepsize.
+
+	The ODE to be solved is of the form: x' = f(t,x), x being a vector in n-dimensions
+	The method is linearly implicit: each step evaluates the Jacobian df once and factorizes I/(h gamma) - df once,
+	the 4 stages being obtained by solving linear systems with this matrix, without Newton iterations
+	(whereas the implicit methods, e.g. ThetaMethod, evaluate df and solve at every Newton iteration).
+	ROS34PW2 is of order 3, L-stable and stiffly accurate, and its embedded method of order 2 gives the local error estimate.
+	The Jacobian can be dense, banded ((l, u), ab) or sparse, as in ThetaMethod; the derivative of f with respect to t
+	(for non-autonomous problems) is approximated by finite differences.
+	The local error is measured in the RMS norm weighted by ETOL (1 + |x_j|) or, if rtol and/or atol are provided,
+	by atol_j + rtol_j |x_j|. The last step is shortened to end exactly at tn.
+	If solution is True, the states are returned as an ODESolution (with the times t and statistics on the steps),
+	otherwise as an array.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param f: function in x' = f(t,x)
+		:param iv: vector of initial values
+		:param t0: initial time
+		:param tn: final time
+		:param h: initial step size (guess)
+		:param ETOL: Error tolerance (relative, and absolute for small components)
+		:param df: Jacobian of f
+		:param controller: stepsize controller (None for a PIController)
+		:param rtol: relative tolerance (scalar or per component, 1e-3 if only atol is given)
+		:param atol: absolute tolerance (scalar or per component, 1e-6 if only rtol is given)
+		:param dtype: floating-point type of the stored states (the steps being computed in float64), see ThetaMethod
+		:param layout: layout of the stored states, 'time' (x[i,j]) or 'component' (x[j,i]), see ThetaMethod
+		:param solution: whether to return the states as an ODESolution
+		:type f: Callable
+		:type iv: np.array[float]
+		:type t0: np.float
+		:type tn: np.float
+		:type h: np.float
+		:type ETOL: np.float
+		:type df: Callable
+		:type controller: StepController
+		:type rtol: np.float or np.array[float]
+		:type atol: np.float or np.array[float]
+		:type dtype: np.dtype
+		:type layout: str
+		:type solution: bool
+		:return: Vector x containing solution of component j at time i (x[i,j]), and corresponding stepsizes hi
+		:rtype: np.array[float,float] (ODESolution if solution), np.array[float]
+
+	"""
+
+	if h is not None and h <= 0.0:
+		raise ValueError('The stepsize h must be positive')
+
+	if (tn - t0) <= 0.0:
+		raise ValueError('The final time must be greater than the initial time')
+
+	if ETOL <= 0.0:
+		raise ValueError('The numerical tolerance must be positive')
+
+	if df is None:
+		raise NotImplementedError('Automatic differentiation not implemented yet. Please provide the Jacobian of f')
+
+	norm = _wrmsnorm(rtol, atol, iv.size);
+	if norm is None:
+		errnorm = lambda v, x, y: np.sqrt(np.mean((v/(ETOL*(1.0 + np.maximum(np.abs(x), np.abs(y)))))**2));
+	else:
+		errnorm = norm;
+
+	controller = copy(controller) if controller is not None else PIController();	# the history of the controller is specific to this integration
+	controller.reset();
+
+	H = min(h if h is not None else 0.01, tn - t0);
+
+	N = 64;
+	buf, x = _allocate(N, iv.size, dtype, layout);
+	hi = np.empty((N,1), float);
+	x[0,:] = iv;
+	hi[0] = 0.0;
+
+	xi = np.array(iv, float);		# current state in full precision (x may have a reduced precision)
+	tcount = t0;
+	i = 1;
+	while tcount < tn:
+		if i >= N:
+			N *= 2;
+			buf, x = _grow(buf, N, layout);
+			hi = np.resize(hi, (N,1));
+
+		last = (tcount + H >= tn);
+		fi = f(tcount, xi);
+		xi, hi[i], H = _Rosenbrock_step(f, df, xi, tcount, (tn - tcount if last else H), fi, controller, errnorm, _ROS34PW2);
+		x[i,:] = xi;
+		tcount = tn if (last and hi[i] == tn - tcount) else tcount + hi[i,0];
+		i += 1;
+
+	return _result(buf, hi, i, solution, t0=t0, layout=layout);
@@ -0,0 +1,96 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# File implementing the forward sensitivity analysis of the theta method.
+#
+
+import numpy as np
+from nptyping import Array
+from typing import Tuple
+
+from ._errornorm import _wrmsnorm
+from ._thetamethod import _Theta_step_sens
+
+def ThetaMethodSensitivity(f, iv : Array[float], t0 : float, tn : float, h : float, theta : float, df, dfp, S0 : Array[float] = None, TOL : float = 1.0e-5, NEWTITER : int = 10, rtol = None, atol = None) -> Tuple[Array[float], Array[float]]:
+	"""Function implementing the Theta method together with the forward sensitivities of the solution
+		with respect to the parameters of the ODE.
+
+	The ODE to be solved is of the form: x' = f(t,x;p), x being a vector in n-dimensions, p a vector of m parameters.
+	The sensitivities S = dx/dp (n x m) are integrated alongside the state, differentiating the theta scheme itself:
+		(I - (1-theta)h df_{n+1}) S_{n+1} = S_n + theta h (df_n S_n + dfp_n) + (1-theta)h dfp_{n+1}
+	They are the exact derivatives of the numerical solution (up to the Newton tolerance), and are obtained
+	reusing the factorization of the Newton iteration matrix: m parameters cost m back-substitutions per step,
+	instead of the 2m additional integrations of finite differences.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param f: function in x' = f(t,x;p), for the nominal parameters
+		:param iv: vector of initial values
+		:param t0: initial time
+		:param tn: final time
+		:param h: step size
+		:param theta: value between 0 and 1
+		:param df: Jacobian of f with respect to x (n x n)
+		:param dfp: Jacobian of f with respect to p (n x m)
+		:param S0: sensitivities of the initial values (default to zero, i.e. iv independent of p)
+		:param TOL: Numerical tolerance for convergence
+		:param NEWTITER: Maximum number of Newton iterations to be performed
+		:param rtol: relative tolerance of the Newton iteration (scalar or per component), see ThetaMethod
+		:param atol: absolute tolerance of the Newton iteration (scalar or per component), see ThetaMethod
+		:type f: Callable
+		:type iv: np.array[float]
+		:type t0: np.float
+		:type tn: np.float
+		:type h: np.float
+		:type theta: np.float
+		:type df: Callable
+		:type dfp: Callable
+		:type S0: np.array[float,float]
+		:type TOL: np.float
+		:type NEWTITER: (unsigned) int
+		:type rtol: np.float or np.array[float]
+		:type atol: np.float or np.array[float]
+		:return: Vector x containing solution of component j at time i (x[i,j]),
+				and S containing the sensitivity of component j to parameter k at time i (S[i,j,k])
+		:rtype: np.array[float,float], np.array[float,float,float]
+
+	"""
+
+	if h <= 0.0:
+		raise ValueError('The stepsize h must be positive')
+
+	if (tn - t0) <= 0.0:
+		raise ValueError('The final time must be greater than the initial time')
+
+	if not 0 <= theta <= 1:
+		raise ValueError('Theta has to be between 0 and 1')
+
+	if TOL <= 0.0:
+		raise ValueError('The numerical tolerance must be positive')
+
+	if (theta != 1) and (NEWTITER < 0.0):
+		raise ValueError('The maximum number of Newton Iteration steps must be positive')
+
+	if df is None or dfp is None:
+		raise NotImplementedError('Automatic differentiation not implemented yet. Please provide the Jacobians of f')
+
+	if S0 is None:
+		S0 = np.zeros((iv.size, np.reshape(dfp(t0, iv), (iv.size, -1)).shape[1]));
+
+	norm = _wrmsnorm(rtol, atol, iv.size);
+
+	N : np.int = np.int(np.ceil((tn - t0)/h));	# number of steps
+
+	# preallocating the arrays (+1 for including initial condition)
+	x = np.empty((np.int(N+1),iv.size), float);
+	S = np.empty((np.int(N+1),iv.size,S0.shape[-1]), float);
+	x[0,:] = iv;
+	S[0] = np.reshape(S0, S.shape[1:]);
+
+	for i in range(N):
+		x[i+1,:], S[i+1] = _Theta_step_sens(f,df,dfp,x[i,:],S[i],(t0+h*i),h,theta,TOL,NEWTITER,norm);
+
+	return x, S;
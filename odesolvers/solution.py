@@ -0,0 +1,223 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# File implementing the solution object returned by the solvers.
+#
+
+import numpy as np
+from numpy.lib.mixins import NDArrayOperatorsMixin
+
+class ODESolution(NDArrayOperatorsMixin):
+	"""Class containing the numerical solution of an ODE.
+
+	It behaves as the array x of the states (x[i,j] being component j at step i),
+	so that it can be indexed, sliced, used in arithmetic and passed to NumPy functions as such
+	(the results being arrays), the attributes of the array (e.g. T, size, ndim) being available too.
+	The states are stored in a preallocated buffer, possibly larger than the solution:
+	solvers continuing an integration append new steps to the same buffer.
+	The buffer is either time-major (layout 'time', one row per step) or component-major
+	(layout 'component', one row per component, so that each component is contiguous),
+	and can have a reduced precision (e.g. float32) while the solver computes in float64.
+	It also keeps the internal state of the solver, needed to continue the integration.
+
+	"""
+
+	def __init__(self, x, hi, n : int, state : dict = None, t0 : float = 0.0, layout : str = 'time', hfixed : float = None):
+		"""Constructor.
+
+		- **parameters**, **types**, **return** and **return types**::
+			:param x: buffer of the states
+			:param hi: buffer of the stepsizes
+			:param n: number of steps stored in the buffers (including the initial condition)
+			:param state: internal state of the solver
+			:param t0: initial time
+			:param layout: layout of x, 'time' (x[i,j]) or 'component' (x[j,i])
+			:param hfixed: stepsize, if fixed (None for variable stepsizes)
+			:type x: np.array[float,float]
+			:type hi: np.array[float]
+			:type n: int
+			:type state: dict
+			:type t0: np.float
+			:type layout: str
+			:type hfixed: np.float
+
+		"""
+		if layout not in ('time', 'component'):
+			raise ValueError("The layout must be 'time' or 'component'")
+
+		self._x = x;
+		self._hi = hi;
+		self._n = n;
+		self._state = state;
+		self._t0 = t0;
+		self._layout = layout;
+		self._hfixed = hfixed;
+		self._t = None;		# cached times
+
+	@property
+	def x(self):
+		"""States (view on the buffer): x[i,j] is component j at step i.
+		"""
+		if self._layout == 'component':
+			return self._x[:,:self._n].T;
+		return self._x[:self._n];
+
+	@property
+	def hi(self):
+		"""Stepsizes (view on the buffer): hi[i] is the stepsize leading to step i (hi[0] = 0).
+		"""
+		return self._hi[:self._n];
+
+	@property
+	def h(self):
+		"""Stepsizes as a vector (view on the buffer): h[i] is the stepsize leading to step i (h[0] = 0).
+		"""
+		return self._hi[:self._n,0];
+
+	@property
+	def t(self):
+		"""Times of the steps: t[i] is the time of step i.
+		They are t0 + i h for a fixed stepsize h, otherwise accumulated from the stepsizes (as done by the solvers), and cached.
+		"""
+		if self._t is None or self._t.size != self._n:
+			if self._hfixed is not None:
+				self._t = self._t0 + self._hfixed*np.arange(self._n);
+			else:
+				self._t = np.cumsum(np.concatenate(([self._t0], self.h[1:])));
+		return self._t;
+
+	@property
+	def layout(self):
+		return self._layout;
+
+	@property
+	def stats(self):
+		"""Dictionary of statistics on the steps: number of steps, minimum and maximum stepsize.
+		"""
+		h = self.h[1:];
+		return {'nsteps': h.size, 'hmin': (h.min() if h.size else 0.0), 'hmax': (h.max() if h.size else 0.0)};
+
+	@property
+	def shape(self):
+		return self.x.shape;
+
+	@property
+	def dtype(self):
+		return self._x.dtype;
+
+	def component(self, j : int):
+		"""Function returning component j at all the steps (view on the buffer, contiguous with layout 'component').
+
+		- **parameters**, **types**, **return** and **return types**::
+			:param j: index of the component
+			:type j: int
+			:return: Vector containing component j at step i
+			:rtype: np.array[float]
+
+		"""
+		if self._layout == 'component':
+			return self._x[j,:self._n];
+		return self._x[:self._n,j];
+
+	def __len__(self):
+		return self._n;
+
+	def __getitem__(self, key):
+		return self.x[key];
+
+	def __array__(self, dtype = None, copy = None):
+		return np.asarray(self.x, dtype=dtype);
+
+	def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+		# arithmetic and ufuncs operate on the states (see NDArrayOperatorsMixin)
+		inputs = tuple(v.x if isinstance(v, ODESolution) else v for v in inputs);
+		if 'out' in kwargs:
+			kwargs['out'] = tuple(v.x if isinstance(v, ODESolution) else v for v in kwargs['out']);
+		return getattr(ufunc, method)(*inputs, **kwargs);
+
+	def __getattr__(self, name):
+		# the other attributes of the array of the states (e.g. T, size, ndim, copy)
+		if name.startswith('_'):
+			raise AttributeError(name)
+		return getattr(self.x, name);
+
+	def __repr__(self):
+		return f'ODESolution({self.x!r})';
+
+
+def _allocate(N : int, n : int, dtype = float, layout : str = 'time'):
+	"""Internal function preallocating the buffer of the states.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param N: number of steps (including the initial condition)
+		:param n: number of components
+		:param dtype: floating-point type of the buffer
+		:param layout: layout of the buffer, 'time' or 'component'
+		:type N: int
+		:type n: int
+		:type dtype: np.dtype
+		:type layout: str
+		:return: buffer, and view on the buffer indexed as x[i,j]
+		:rtype: np.array[float,float], np.array[float,float]
+
+	"""
+	if np.dtype(dtype).kind != 'f':
+		raise ValueError('The storage type must be a floating-point type')
+
+	if layout == 'time':
+		buf = np.empty((N,n), dtype);
+		return buf, buf;
+	if layout == 'component':
+		buf = np.empty((n,N), dtype);
+		return buf, buf.T;
+
+	raise ValueError("The layout must be 'time' or 'component'")
+
+
+def _grow(buf, N : int, layout : str = 'time'):
+	"""Internal function enlarging the buffer of the states to N steps, keeping the steps already stored.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param buf: buffer of the states (see _allocate)
+		:param N: new number of steps
+		:param layout: layout of the buffer, 'time' or 'component'
+		:type buf: np.array[float,float]
+		:type N: int
+		:type layout: str
+		:return: new buffer, and view on the new buffer indexed as x[i,j]
+		:rtype: np.array[float,float], np.array[float,float]
+
+	"""
+	old = buf if layout == 'time' else buf.T;
+	newbuf, x = _allocate(N, old.shape[1], buf.dtype, layout);
+	x[:min(N, old.shape[0])] = old[:N];
+	return newbuf, x;
+
+
+def _result(buf, hi, n : int, solution : bool, state : dict = None, t0 : float = 0.0, layout : str = 'time', hfixed : float = None):
+	"""Internal function returning the states and the stepsizes computed by an adaptive solver: an ODESolution on the buffers
+	(see ODESolution for the other parameters), or arrays trimmed to the n steps (copies in the same layout,
+	not retaining the buffers, possibly twice as large).
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param buf: buffer of the states (see _allocate)
+		:param hi: buffer of the stepsizes
+		:param n: number of steps stored in the buffers (including the initial condition)
+		:param solution: whether to return an ODESolution
+		:type buf: np.array[float,float]
+		:type hi: np.array[float]
+		:type n: int
+		:type solution: bool
+		:return: states x[i,j] and stepsizes hi
+		:rtype: ODESolution or np.array[float,float], np.array[float]
+
+	"""
+	if solution:
+		sol = ODESolution(buf, hi, n, state, t0=t0, layout=layout, hfixed=hfixed);
+		return sol, sol.hi;
+	x = buf if layout == 'time' else buf.T;
+	return x[:n].copy(order='K'), hi[:n].copy();
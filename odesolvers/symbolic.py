@@ -0,0 +1,146 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# File implementing a symbolic front end generating the right hand side and the Jacobian of an ODE.
+#
+
+import numpy as np
+from typing import Tuple, Callable
+
+def SymbolicODE(rhs, states, t = None, params : dict = None, batch : bool = False) -> Tuple[Callable, Callable]:
+	"""Function generating NumPy code for the right hand side f and its exact Jacobian df
+		from a symbolic (SymPy) definition of the ODE.
+
+	The ODE to be defined is of the form: x' = f(t,x), x being a vector in n-dimensions.
+	Common subexpressions of f and df are computed only once, and constant entries
+	(including the zero entries of the Jacobian) are precomputed at generation time.
+	The generated functions can be passed directly to ThetaMethod, AB_AM_PECE2, etc.
+
+	With batch = True, the generated functions are vectorized over states:
+	x has shape (m,n) (or any (...,n)), f returns an array of the same shape and df an array of shape (...,n,n).
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param rhs: symbolic expressions of the components of f
+		:param states: symbols of the components of x
+		:param t: symbol of the time (if f is time dependent)
+		:param params: values to be substituted for the parameters appearing in rhs
+		:param batch: whether to generate functions vectorized over states
+		:type rhs: list[sympy.Expr]
+		:type states: list[sympy.Symbol]
+		:type t: sympy.Symbol
+		:type params: dict[sympy.Symbol, float]
+		:type batch: bool
+		:return: function f in x' = f(t,x), Jacobian df of f
+		:rtype: Callable, Callable
+
+	"""
+	try:
+		import sympy
+	except ImportError:
+		raise ImportError('SymbolicODE requires sympy. Please install odesolvers[symbolic]')
+
+	states = list(states);
+	rhs = sympy.Matrix(list(rhs));
+
+	if len(states) == 0:
+		raise ValueError('At least one state is required')
+
+	if rhs.shape[0] != len(states):
+		raise ValueError('The number of expressions must match the number of states')
+
+	if params:
+		rhs = rhs.subs(params);
+
+	# replacing user symbols with internal ones, not clashing with the generated code
+	n = len(states);
+	xs = sympy.symbols(f'_x0:{n}');
+	ts = sympy.Symbol('_t');
+	subs = dict(zip(states, xs));
+	if t is not None:
+		subs[t] = ts;
+	rhs = rhs.xreplace(subs);
+	jac = rhs.jacobian(xs);
+
+	free = set().union(*[e.free_symbols for e in list(rhs) + list(jac)]) - set(xs) - {ts};
+	if free:
+		raise ValueError(f'Unknown symbols in rhs: {sorted(str(s) for s in free)}. Please provide their values in params')
+
+	f = _generate('f', [((i,), rhs[i]) for i in range(n)], (n,), xs, ts, batch);
+	df = _generate('df', [((i,j), jac[i,j]) for i in range(n) for j in range(n)], (n,n), xs, ts, batch);
+
+	return f, df;
+
+
+def _generate(name, entries, shape, xs, ts, batch):
+	"""Internal function generating (and compiling) the source of a function
+		filling an array of given shape with the given symbolic entries.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param name: name of the generated function
+		:param entries: pairs (index, expression)
+		:param shape: shape of the output for a single state
+		:param xs: internal symbols of the states
+		:param ts: internal symbol of the time
+		:param batch: whether to generate a function vectorized over states
+		:type name: str
+		:type entries: list[tuple[tuple[int], sympy.Expr]]
+		:type shape: tuple[int]
+		:type xs: tuple[sympy.Symbol]
+		:type ts: sympy.Symbol
+		:type batch: bool
+		:return: generated function of (t,x)
+		:rtype: Callable
+
+	"""
+	import sympy
+	try:
+		from sympy.printing.numpy import NumPyPrinter
+	except ImportError:		# older sympy versions
+		from sympy.printing.pycode import NumPyPrinter
+
+	printer = NumPyPrinter({'fully_qualified_modules': True, 'inline': True});
+
+	# constant entries are stored once in a template array, copied at every call
+	template = np.zeros(shape, float);
+	variable = [];
+	for index, expr in entries:
+		if expr.free_symbols:
+			variable.append((index, expr));
+		else:
+			template[index] = float(expr);
+
+	replacements, reduced = sympy.cse([expr for _, expr in variable], symbols=sympy.numbered_symbols('_c'));
+
+	used = set().union(*[e.free_symbols for e in reduced], *[e.free_symbols for _, e in replacements]);
+	prefix = '..., ' if batch else '';
+
+	lines = [f'def {name}(t, x):'];
+	if ts in used:
+		lines.append('\t_t = t');
+	for i, xi in enumerate(xs):
+		if xi in used:
+			lines.append(f'\t{xi} = x[{prefix}{i}]');
+	for sym, expr in replacements:
+		lines.append(f'\t{sym} = {printer.doprint(expr)}');
+	if batch:
+		lines.append(f'\tout = numpy.empty(numpy.shape(x)[:-1] + {shape!r}, float)');
+		lines.append('\tout[...] = _template');
+	else:
+		lines.append('\tout = _template.copy()');
+	for (index, _), expr in zip(variable, reduced):
+		idx = prefix + ', '.join(str(k) for k in index);
+		lines.append(f'\tout[{idx}] = {printer.doprint(expr)}');
+	lines.append('\treturn out');
+
+	source = '\n'.join(lines) + '\n';
+	namespace = {'numpy': np, '_template': template};
+	exec(compile(source, f'<SymbolicODE {name}>', 'exec'), namespace);
+
+	fun = namespace[name];
+	fun.source = source;		# generated code, kept for inspection
+
+	return fun;
@@ -0,0 +1,110 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# File implementing symplectic integrators for second-order (e.g. mechanical, Hamiltonian) ODEs numerical solution.
+#
+
+import numpy as np
+from nptyping import Array
+from typing import Tuple
+
+from ._symplectic import _compositions, _composition, _Composition_step
+
+def SymplecticComposition(a, q0 : Array[float], v0 : Array[float], t0 : float, tn : float, h : float, order : int = 4) -> Tuple[Array[float], Array[float]]:
+	"""Function implementing symmetric compositions of the Stormer-Verlet method for second-order ODEs numerical solution.
+
+	The ODE to be solved is of the form: q'' = a(t,q), q being a vector in n-dimensions
+	(e.g. positions of a mechanical system, a being the forces divided by the masses).
+	Positions and velocities are kept separate, and only the acceleration is evaluated (never the Jacobian).
+
+	Order = 2 is the Stormer-Verlet (velocity Verlet, leapfrog) method, see StormerVerlet.
+	Order = 4 is the triple jump composition (3 substeps per step).
+	Order = 6 and 8 are Yoshida's compositions (7 and 15 substeps per step).
+	Each substep costs one evaluation of a.
+
+	For Hamiltonian systems with H = v^T M v/2 + V(q) (a = -M^-1 grad V), the methods are symplectic and time-reversible:
+	the energy error stays bounded (no drift) over long times, with stepsizes for which
+	the non-symplectic methods (e.g. ExplicitEulerSolver, AB_AM_PECE2 on the first-order system) drift or blow up.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param a: acceleration in q'' = a(t,q)
+		:param q0: vector of initial positions
+		:param v0: vector of initial velocities
+		:param t0: initial time
+		:param tn: final time
+		:param h: step size
+		:param order: order of the method (2, 4, 6 or 8)
+		:type a: Callable
+		:type q0: np.array[float]
+		:type v0: np.array[float]
+		:type t0: np.float
+		:type tn: np.float
+		:type h: np.float
+		:type order: int
+		:return: Vectors q and v containing position and velocity of component j at time i (q[i,j], v[i,j])
+		:rtype: np.array[float,float], np.array[float,float]
+
+	"""
+
+	if h <= 0.0:
+		raise ValueError('The stepsize h must be positive')
+
+	if (tn - t0) <= 0.0:
+		raise ValueError('The final time must be greater than the initial time')
+
+	if order not in _compositions:
+		raise ValueError('The order must be 2, 4, 6 or 8')
+
+	if np.shape(q0) != np.shape(v0):
+		raise ValueError('The initial positions and velocities must have the same size')
+
+	gammas = _composition(order);
+
+	N : np.int = np.int(np.ceil((tn - t0)/h));	# number of steps
+
+	# preallocating the arrays (+1 for including initial condition)
+	q = np.empty((np.int(N+1),np.size(q0)), float);
+	v = np.empty((np.int(N+1),np.size(v0)), float);
+	q[0,:] = q0;
+	v[0,:] = v0;
+
+	ai = a(t0, q[0,:]);		# the acceleration at the end of a step is reused at the beginning of the next one
+	for i in range(N):
+		q[i+1,:], v[i+1,:], ai = _Composition_step(a, q[i,:], v[i,:], ai, (t0+h*i), h, gammas);
+
+	return q, v;
+
+
+def StormerVerlet(a, q0 : Array[float], v0 : Array[float], t0 : float, tn : float, h : float) -> Tuple[Array[float], Array[float]]:
+	"""Function implementing the Stormer-Verlet (velocity Verlet, leapfrog) method for second-order ODEs numerical solution.
+	It leverages the SymplecticComposition function.
+
+	The ODE to be solved is of the form: q'' = a(t,q), q being a vector in n-dimensions
+	Stormer-Verlet method implements the numerical scheme (of order 2, symplectic, one evaluation of a per step):
+		v_{n+1/2} = v_n + h/2 a(t_n,q_n)
+		q_{n+1} = q_n + h v_{n+1/2}
+		v_{n+1} = v_{n+1/2} + h/2 a(t_{n+1},q_{n+1})
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param a: acceleration in q'' = a(t,q)
+		:param q0: vector of initial positions
+		:param v0: vector of initial velocities
+		:param t0: initial time
+		:param tn: final time
+		:param h: step size
+		:type a: Callable
+		:type q0: np.array[float]
+		:type v0: np.array[float]
+		:type t0: np.float
+		:type tn: np.float
+		:type h: np.float
+		:return: Vectors q and v containing position and velocity of component j at time i (q[i,j], v[i,j])
+		:rtype: np.array[float,float], np.array[float,float]
+
+	"""
+
+	return SymplecticComposition(a, q0, v0, t0, tn, h, 2);
@@ -0,0 +1,91 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Test discrete adjoint of the theta method.
+#
+
+import unittest
+import numpy as np
+
+import odesolvers
+
+from .test_sensitivity import lotkavolterra
+
+class TestThetaMethodAdjoint(unittest.TestCase):
+	def setUp(self):
+		# common initial and final time for all tests
+		self.t0 : np.float = 0.0;
+		self.tn : np.float = 1.0;
+		self.h : np.float = 0.01;
+		self.iv = np.array([1.0, 0.5]);
+		self.f, self.df, self.dfp = lotkavolterra(np.array([1.1, 0.4]));
+		# J = |x_N|^2 / 2
+		self.dg = lambda x: x;
+
+	def testAgainstSensitivities(self):
+		for theta in [0.0, 0.5, 1.0]:
+			xN, gp, giv = odesolvers.ThetaMethodAdjoint(self.f, self.iv, self.t0, self.tn, self.h, theta, self.df, self.dfp, self.dg, TOL=1.0e-13);
+			x, S = odesolvers.ThetaMethodSensitivity(self.f, self.iv, self.t0, self.tn, self.h, theta, self.df, self.dfp, TOL=1.0e-13);
+			_, Siv = odesolvers.ThetaMethodSensitivity(self.f, self.iv, self.t0, self.tn, self.h, theta, self.df, lambda t, x: np.zeros((2,2)), S0=np.identity(2), TOL=1.0e-13);
+
+			np.testing.assert_allclose(xN, x[-1], atol=1.0e-12);
+			np.testing.assert_allclose(gp, np.dot(S[-1].T, xN), atol=1.0e-10);
+			np.testing.assert_allclose(giv, np.dot(Siv[-1].T, xN), atol=1.0e-10);
+
+	def testRunningCost(self):
+		# J = integral of q = a x_0^2 / 2 (p = (a, b)), by the theta rule, and of |x|^2 / 2 with a terminal cost
+		a = 1.1;
+		dq = lambda t, x: np.array([a*x[0], 0.0]);
+		dqp = lambda t, x: np.array([x[0]**2/2, 0.0]);
+		for theta in [0.0, 0.5, 1.0]:
+			x, S = odesolvers.ThetaMethodSensitivity(self.f, self.iv, self.t0, self.tn, self.h, theta, self.df, self.dfp, TOL=1.0e-13);
+			_, Siv = odesolvers.ThetaMethodSensitivity(self.f, self.iv, self.t0, self.tn, self.h, theta, self.df, lambda t, x: np.zeros((2,2)), S0=np.identity(2), TOL=1.0e-13);
+			w = self.h*np.full(len(x), 1.0);		# weights of the theta rule
+			w[0], w[-1] = theta*self.h, (1-theta)*self.h;
+
+			_, gp, giv = odesolvers.ThetaMethodAdjoint(self.f, self.iv, self.t0, self.tn, self.h, theta, self.df, self.dfp, None, TOL=1.0e-13, dq=dq, dqp=dqp);
+			np.testing.assert_allclose(gp, sum(wn*(np.dot(Sn.T, dq(0.0, xn)) + dqp(0.0, xn)) for wn, xn, Sn in zip(w, x, S)), atol=1.0e-10);
+			np.testing.assert_allclose(giv, sum(wn*np.dot(Sn.T, dq(0.0, xn)) for wn, xn, Sn in zip(w, x, Siv)), atol=1.0e-10);
+
+			_, gp, giv = odesolvers.ThetaMethodAdjoint(self.f, self.iv, self.t0, self.tn, self.h, theta, self.df, self.dfp, self.dg, TOL=1.0e-13, dq=lambda t, x: x);
+			np.testing.assert_allclose(gp, np.dot(S[-1].T, x[-1]) + sum(wn*np.dot(Sn.T, xn) for wn, xn, Sn in zip(w, x, S)), atol=1.0e-10);
+			np.testing.assert_allclose(giv, np.dot(Siv[-1].T, x[-1]) + sum(wn*np.dot(Sn.T, xn) for wn, xn, Sn in zip(w, x, Siv)), atol=1.0e-10);
+
+	def testSnapshots(self):
+		# the gradient does not depend on the checkpointing schedule
+		ref = odesolvers.ThetaMethodAdjoint(self.f, self.iv, self.t0, self.tn, self.h, 0.5, self.df, self.dfp, self.dg, snapshots=100);
+		for s in [0, 1, 3, None]:
+			res = odesolvers.ThetaMethodAdjoint(self.f, self.iv, self.t0, self.tn, self.h, 0.5, self.df, self.dfp, self.dg, snapshots=s);
+			for a, b in zip(res, ref):
+				np.testing.assert_array_equal(a, b);
+
+	def testDeepSchedule(self):
+		# a single snapshot over many steps (recursing on the number of snapshots only, not on the steps)
+		h : np.float = 1/1500;
+		ref = odesolvers.ThetaMethodAdjoint(self.f, self.iv, self.t0, self.tn, h, 1.0, self.df, self.dfp, self.dg);
+		res = odesolvers.ThetaMethodAdjoint(self.f, self.iv, self.t0, self.tn, h, 1.0, self.df, self.dfp, self.dg, snapshots=1);
+		for a, b in zip(res, ref):
+			np.testing.assert_array_equal(a, b);
+
+	def testRecomputations(self):
+		# with the default ceil(log2(100)) = 7 snapshots, binomial(7+3, 7) >= 100 steps are reversed with 3 sweeps
+		count = [0];
+		def f(t, x):
+			count[0] += 1;
+			return self.f(t, x);
+
+		odesolvers.ThetaMethodAdjoint(f, self.iv, self.t0, self.tn, self.h, 1.0, self.df, self.dfp, self.dg);
+		N = 100;
+		self.assertLessEqual(count[0], (1 + 3 + 1)*N);	# forward pass, sweeps and reversed steps
+
+	def testErrorHandling(self):
+		with self.assertRaises(NotImplementedError): odesolvers.ThetaMethodAdjoint(self.f, self.iv, self.t0, self.tn, self.h, 0.5, self.df, None, self.dg);
+		with self.assertRaises(ValueError): odesolvers.ThetaMethodAdjoint(self.f, self.iv, self.t0, self.tn, self.h, 0.5, self.df, self.dfp, self.dg, snapshots=-1);
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,125 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Test asyncio solvers against a local stand-in model server with artificial latency.
+#
+
+import json
+import time
+import asyncio
+import unittest
+import numpy as np
+
+import odesolvers
+
+from .test_helpers import *
+
+LATENCY : float = 0.02;		# artificial latency of the model server [s]
+
+async def handle(reader, writer):
+	"""Function serving stableode, one JSON request per line, with artificial latency.
+	"""
+	while True:
+		line = await reader.readline();
+		if not line:
+			break
+		request = json.loads(line.decode());
+		await asyncio.sleep(LATENCY);
+		xprime = stableode(request['t'], np.array(request['x']));
+		writer.write((json.dumps(xprime.tolist()) + '\n').encode());
+		await writer.drain();
+	writer.close();
+	await writer.wait_closed();
+
+def remoteode(port):
+	"""Function returning a coroutine function evaluating stableode on the model server.
+	"""
+	async def f(t, x):
+		reader, writer = await asyncio.open_connection('127.0.0.1', port);
+		writer.write((json.dumps({'t': float(np.ravel(t)[0]), 'x': np.ravel(x).tolist()}) + '\n').encode());
+		xprime = np.array(json.loads((await reader.readline()).decode()));
+		writer.close();
+		await writer.wait_closed();
+		return xprime;
+	return f;
+
+class TestAsyncSolvers(unittest.TestCase):
+	def setUp(self):
+		# common initial and final time for all tests
+		self.t0 : np.float = 0.0;
+		self.tn : np.float = 0.05;
+		self.h : np.float = 0.01;
+		self.loop = asyncio.new_event_loop();
+		self.server = self.loop.run_until_complete(asyncio.start_server(handle, '127.0.0.1', 0));
+		self.f = remoteode(self.server.sockets[0].getsockname()[1]);
+
+	def tearDown(self):
+		self.server.close();
+		self.loop.run_until_complete(self.server.wait_closed());
+		self.loop.close();
+
+	def testThetaMethod(self):
+		iv = np.array([1.0]);
+		for theta in [1, 0.5]:
+			y = self.loop.run_until_complete(odesolvers.ThetaMethodAsync(self.f, iv, self.t0, self.tn, self.h, theta, stableodeJ));
+			yref = odesolvers.ThetaMethod(stableode, iv, self.t0, self.tn, self.h, theta, stableodeJ);
+
+			np.testing.assert_array_equal(y, yref);
+
+	def testAB_AM_PECE2(self):
+		iv = np.array([1.0]);
+		for h in [None, self.h]:
+			y, hi = self.loop.run_until_complete(odesolvers.AB_AM_PECE2Async(self.f, iv, self.t0, self.tn, h));
+			yref, hiref = odesolvers.AB_AM_PECE2(stableode, iv, self.t0, self.tn, h);
+
+			np.testing.assert_array_equal(y, yref);
+			np.testing.assert_array_equal(hi, hiref);
+
+	def testSettings(self):
+		# the asyncio solvers share the implementation of the solvers, and accept their settings
+		iv = np.array([1.0]);
+		sol = self.loop.run_until_complete(odesolvers.ThetaMethodAsync(self.f, iv, self.t0, self.tn, self.h, 0.5, stableodeJ, solution=True, dtype=np.float32));
+		yref = odesolvers.ThetaMethod(stableode, iv, self.t0, self.tn, self.h, 0.5, stableodeJ, solution=True, dtype=np.float32);
+
+		self.assertIsInstance(sol, odesolvers.ODESolution);
+		np.testing.assert_array_equal(sol, yref);
+
+		sol, hi = self.loop.run_until_complete(odesolvers.AB_AM_PECE2Async(self.f, iv, self.t0, self.tn, solution=True));
+		self.assertIsInstance(sol, odesolvers.ODESolution);
+
+		# a coroutine function cannot be evaluated by the synchronous solvers
+		async def f(t, x):
+			await asyncio.sleep(0);
+			return stableode(t, x);
+		with self.assertRaises(TypeError):
+			odesolvers.ThetaMethod(f, iv, self.t0, self.tn, self.h, 0.5, stableodeJ);
+
+	def testEnsembleConcurrent(self):
+		ivs = [np.array([float(k)]) for k in range(8)];
+		nsteps : np.int = np.int(np.ceil((self.tn - self.t0)/self.h));
+
+		start = time.perf_counter();
+		ys = self.loop.run_until_complete(odesolvers.EnsembleAsync(odesolvers.ThetaMethodAsync, self.f, ivs, self.t0, self.tn, self.h, 1));
+		elapsed = time.perf_counter() - start;
+
+		for iv, y in zip(ivs, ys):
+			np.testing.assert_array_equal(y, odesolvers.ExplicitEulerSolver(stableode, iv, self.t0, self.tn, self.h));
+		# waits overlap: much faster than evaluating the members one after the other
+		self.assertLess(elapsed, 0.5*len(ivs)*nsteps*LATENCY);
+
+	def testEnsembleMaxConcurrent(self):
+		ivs = [np.array([float(k)]) for k in range(4)];
+
+		ys = self.loop.run_until_complete(odesolvers.EnsembleAsync(odesolvers.ThetaMethodAsync, self.f, ivs, self.t0, self.tn, self.h, 1, maxconcurrent=2));
+
+		self.assertEqual(len(ys), len(ivs));
+		with self.assertRaises(ValueError):
+			self.loop.run_until_complete(odesolvers.EnsembleAsync(odesolvers.ThetaMethodAsync, self.f, ivs, self.t0, self.tn, self.h, 1, maxconcurrent=0));
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -91,6 +91,15 @@ class TestBackwardEuler(unittest.TestCase):
 		self.assertEqual(y[0,1],iv[1]);
 		self.assertLess(np.absolute(y[N,1]-y[0,1]),3);
 
+	def testJacobianFree(self):
+		iv = np.array([1.0, 2.0]);
+		h : np.float = 0.05;
+
+		y = odesolvers.ImplicitEulerSolver(stiffode, iv, self.t0, self.tn, h, jacobianfree=True, TOL=1.0e-8);
+		yref = odesolvers.ImplicitEulerSolver(stiffode, iv, self.t0, self.tn, h, stiffodeJ, TOL=1.0e-8);
+
+		np.testing.assert_allclose(y, yref, atol=1.0e-6);
+
 	def testNewtonItConvergenceFail(self):
 		iv = np.array([1.0, 2.0]);
 		h : np.float = 0.01;
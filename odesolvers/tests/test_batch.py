@@ -0,0 +1,153 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Test the batches of solver jobs and their command-line runner.
+#
+
+import io
+import os
+import sys
+import json
+import shutil
+import subprocess
+import tempfile
+import unittest
+import contextlib
+import numpy as np
+
+import odesolvers
+from odesolvers.batch import RunBatch, main
+
+from .test_helpers import *
+
+class TestBatch(unittest.TestCase):
+	def setUp(self):
+		# common initial and final time for all tests
+		self.t0 : np.float = 0.0;
+		self.tn : np.float = 1.0;
+		self.iv = np.array([1.0, 2.0]);
+		self.tmpdir = tempfile.mkdtemp();
+		self.jobfile = os.path.join(self.tmpdir, 'jobs.json');
+		self.config = {
+			'workers': 2,
+			'output': 'results',
+			'problems': {
+				'stiff': {'f': 'odesolvers.tests.test_helpers:stiffode', 'df': 'odesolvers.tests.test_helpers:stiffodeJ',
+						'iv': self.iv.tolist(), 't0': self.t0, 'tn': self.tn},
+				'multivariable': {'f': 'odesolvers.tests.test_helpers:multivariableode', 'df': 'odesolvers.tests.test_helpers:multivariableodeJ',
+						'iv': self.iv.tolist(), 't0': self.t0, 'tn': self.tn},
+			},
+			'solvers': {
+				'trapezoidal': {'solver': 'ThetaMethod', 'h': 0.01, 'theta': 0.5},
+				'pece': {'solver': 'AB_AM_PECE2', 'h': None, 'ETOL': 1.0e-6, 'solution': True, 'outputs': ['x', 'hi']},
+			},
+		};
+
+	def tearDown(self):
+		shutil.rmtree(self.tmpdir);
+
+	def write(self):
+		with open(self.jobfile, 'w') as fh:
+			json.dump(self.config, fh);
+
+	def testBatch(self):
+		self.write();
+		summary = RunBatch(self.jobfile);
+		output = os.path.join(self.tmpdir, 'results');
+
+		self.assertEqual(summary['failed'], 0);
+		self.assertEqual([job['name'] for job in summary['jobs']], ['stiff-trapezoidal', 'stiff-pece', 'multivariable-trapezoidal', 'multivariable-pece']);
+		with open(os.path.join(output, 'summary.json')) as fh:
+			self.assertEqual(json.load(fh)['jobs'], summary['jobs']);
+
+		# same results as the solvers (the Jacobian being passed to ThetaMethod only)
+		with np.load(os.path.join(output, 'stiff-trapezoidal.npz')) as data:
+			self.assertEqual(data.files, ['x']);
+			np.testing.assert_array_equal(data['x'], odesolvers.ThetaMethod(stiffode, self.iv, self.t0, self.tn, 0.01, 0.5, stiffodeJ));
+
+		y, hi = odesolvers.AB_AM_PECE2(multivariableode, self.iv, self.t0, self.tn, None, ETOL=1.0e-6, solution=True);
+		with np.load(os.path.join(output, 'multivariable-pece.npz')) as data:
+			np.testing.assert_array_equal(data['x'], y);
+			np.testing.assert_array_equal(data['hi'], hi);
+			np.testing.assert_array_equal(data['t'], y.t);
+
+		record = summary['jobs'][3];
+		self.assertEqual(record['status'], 'ok');
+		self.assertEqual(record['nsteps'], y.stats['nsteps']);
+		self.assertEqual(record['hmax'], y.stats['hmax']);
+		self.assertGreater(record['seconds'], 0.0);
+		self.assertEqual(summary['jobs'][0]['nsteps'], 100);
+
+	def testJobs(self):
+		# explicit jobs, settings overriding those of the solver, output directory and cache
+		# (strings of a problem other than module:attribute being passed as such)
+		self.config['problems']['stiff']['layout'] = 'component';
+		self.config['jobs'] = [{'problem': 'stiff', 'solver': 'trapezoidal'},
+								{'name': 'implicit', 'problem': 'stiff', 'solver': 'trapezoidal', 'settings': {'theta': 0.0, 'rtol': [1.0e-6, 1.0e-6]}}];
+		self.config['cache'] = 'cache';
+		self.write();
+
+		output = os.path.join(self.tmpdir, 'other');
+		for _ in range(2):
+			summary = RunBatch(self.jobfile, workers=1, output=output);
+		self.assertEqual(len(odesolvers.SolverCache(os.path.join(self.tmpdir, 'cache'))), 2);
+
+		with np.load(os.path.join(output, 'implicit.npz')) as data:
+			np.testing.assert_array_equal(data['x'], odesolvers.ThetaMethod(stiffode, self.iv, self.t0, self.tn, 0.01, 0.0, stiffodeJ, rtol=np.array([1.0e-6, 1.0e-6])));
+
+	def testFailures(self):
+		self.config['solvers']['broken'] = {'solver': 'ThetaMethod', 'h': -0.01, 'theta': 0.5};
+		self.config['solvers']['missing'] = {'solver': 'odesolvers:NoSolver'};
+		self.write();
+
+		summary = RunBatch(self.jobfile);
+		self.assertEqual(summary['failed'], 4);
+		errors = {job['name']: job.get('error') for job in summary['jobs']};
+		self.assertEqual(errors['stiff-broken'], 'ValueError: The stepsize h must be positive');
+		self.assertTrue(errors['stiff-missing'].startswith('AttributeError'));
+		self.assertIsNone(errors['stiff-pece']);
+
+	def testCommandLine(self):
+		self.write();
+		out = io.StringIO();
+		with contextlib.redirect_stdout(out):
+			self.assertEqual(main([self.jobfile, '--workers', '1']), 0);
+		self.assertEqual(len(json.loads(out.getvalue())['jobs']), 4);
+
+		self.config['solvers']['broken'] = {'solver': 'ThetaMethod', 'h': -0.01, 'theta': 0.5};
+		self.write();
+		with contextlib.redirect_stdout(io.StringIO()):
+			self.assertEqual(main([self.jobfile]), 1);
+
+		# run as a module, the package not importing it beforehand
+		process = subprocess.run([sys.executable, '-W', 'error::RuntimeWarning', '-m', 'odesolvers.batch', '--help'], capture_output=True, text=True);
+		self.assertEqual(process.returncode, 0);
+		self.assertNotIn('RuntimeWarning', process.stderr);
+
+	def testErrors(self):
+		self.config['jobs'] = [{'problem': 'stiff', 'solver': 'unknown'}];
+		self.write();
+		with self.assertRaises(ValueError):
+			RunBatch(self.jobfile);
+
+		self.config['jobs'] = [{'problem': 'stiff', 'solver': 'pece'}, {'problem': 'stiff', 'solver': 'pece'}];
+		self.write();
+		with self.assertRaises(ValueError):
+			RunBatch(self.jobfile);
+
+		del self.config['problems'];
+		self.write();
+		with self.assertRaises(ValueError):
+			RunBatch(self.jobfile);
+
+		with contextlib.redirect_stderr(io.StringIO()):
+			with self.assertRaises(SystemExit):
+				main([os.path.join(self.tmpdir, 'missing.json')]);
+
+
+if __name__ == '__main__':
+	unittest.main()
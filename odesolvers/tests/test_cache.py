@@ -0,0 +1,166 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Test the on-disk cache of the results of the solvers.
+#
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+
+import odesolvers
+
+from .test_helpers import *
+
+def decayode(a):
+	"""Function returning the ODE x' = -a x (a being captured in a closure).
+	"""
+	def f(t, x):
+		return -a*x;
+	return f;
+
+class TestSolverCache(unittest.TestCase):
+	def setUp(self):
+		# common initial and final time for all tests
+		self.t0 : np.float = 0.0;
+		self.tn : np.float = 1.0;
+		self.iv = np.array([1.0, 2.0]);
+		self.tmpdir = tempfile.mkdtemp();
+		self.cache = odesolvers.SolverCache(os.path.join(self.tmpdir, 'cache'));
+		self.calls = 0;
+
+	def tearDown(self):
+		shutil.rmtree(self.tmpdir);
+
+	def solver(self, f, *args, **kwargs):
+		self.calls += 1;
+		return odesolvers.AB_AM_PECE2(f, *args, **kwargs);
+
+	def testHit(self):
+		yref, hiref = odesolvers.AB_AM_PECE2(multivariableode, self.iv, self.t0, self.tn, None, ETOL=1.0e-6, solution=True);
+
+		for _ in range(3):
+			y, hi = self.cache(self.solver, multivariableode, self.iv, self.t0, self.tn, None, ETOL=1.0e-6, solution=True);
+			np.testing.assert_array_equal(y, yref);
+			np.testing.assert_array_equal(hi, hiref);
+			np.testing.assert_array_equal(y.t, yref.t);
+		self.assertEqual(self.calls, 1);
+		self.assertEqual(len(self.cache), 1);
+
+		# hits are read-only memory-mapped arrays, the stepsizes being stored once
+		self.assertIsInstance(y._x, np.memmap);
+		self.assertFalse(y.x.flags.writeable);
+		self.assertEqual(len([name for name in os.listdir(os.path.join(self.cache._directory, os.listdir(self.cache._directory)[0])) if name.endswith('.npy')]), 2);
+
+		# the cached solution has no solver state
+		with self.assertRaises(ValueError):
+			odesolvers.AB_AM_PECE2_continue(multivariableode, y, 2.0);
+
+	def testKey(self):
+		key = self.cache.key(self.solver, decayode(1.0), self.iv, self.t0, self.tn, 0.1);
+
+		# same code and captured data
+		self.assertEqual(self.cache.key(self.solver, decayode(1.0), self.iv.copy(), self.t0, self.tn, 0.1), key);
+
+		# captured data, code, initial values, interval, stepsize, tolerances and solver
+		others = [self.cache.key(self.solver, decayode(2.0), self.iv, self.t0, self.tn, 0.1),
+					self.cache.key(self.solver, lambda t, x: -1.0*x, self.iv, self.t0, self.tn, 0.1),
+					self.cache.key(self.solver, decayode(1.0), self.iv + 1.0e-12, self.t0, self.tn, 0.1),
+					self.cache.key(self.solver, decayode(1.0), self.iv, self.t0, 2*self.tn, 0.1),
+					self.cache.key(self.solver, decayode(1.0), self.iv, self.t0, self.tn, 0.05),
+					self.cache.key(self.solver, decayode(1.0), self.iv, self.t0, self.tn, 0.1, ETOL=1.0e-6),
+					self.cache.key(odesolvers.AB_AM_PECE2, decayode(1.0), self.iv, self.t0, self.tn, 0.1)];
+		self.assertEqual(len(set(others + [key])), len(others) + 1);
+
+		# library version
+		with mock.patch('odesolvers.cache.__version__', '0.0.0'):
+			self.assertNotEqual(self.cache.key(self.solver, decayode(1.0), self.iv, self.t0, self.tn, 0.1), key);
+
+	def testOperator(self):
+		# operators are keyed on their stencil and boundary conditions, not on the matrices computed lazily
+		def laplacian(n, right = 0.0):
+			dx = 1.0/(n+1);
+			return odesolvers.FDOperator([-1, 0, 1], odesolvers.FDWeights([-1, 0, 1], 2, dx), n, dx, ('dirichlet', 0.0), ('dirichlet', right));
+
+		iv = np.ones(20);
+		L = laplacian(20);
+		key = self.cache.key(odesolvers.ThetaMethod, L, iv, self.t0, self.tn, 0.1, 0.5, L.jacobian);
+		L.jacobian();
+		self.assertEqual(self.cache.key(odesolvers.ThetaMethod, L, iv, self.t0, self.tn, 0.1, 0.5, L.jacobian), key);
+		self.assertEqual(self.cache.key(odesolvers.ThetaMethod, laplacian(20), iv, self.t0, self.tn, 0.1, 0.5, L.jacobian), key);
+		self.assertNotEqual(self.cache.key(odesolvers.ThetaMethod, laplacian(20, 1.0), iv, self.t0, self.tn, 0.1, 0.5, L.jacobian), key);
+
+		L2 = odesolvers.FDOperator2D(laplacian(4), laplacian(5));
+		key = self.cache.key(odesolvers.ThetaMethod, L2, iv, self.t0, self.tn, 0.1, 0.5, L2.jacobian);
+		L2.jacobian();
+		self.assertEqual(self.cache.key(odesolvers.ThetaMethod, L2, iv, self.t0, self.tn, 0.1, 0.5, L2.jacobian), key);
+
+		for _ in range(2):
+			self.cache(self.solver, L, iv, self.t0, self.tn, 0.1);
+		self.assertEqual(self.calls, 1);
+
+	def testMiss(self):
+		self.cache(self.solver, decayode(1.0), self.iv, self.t0, self.tn, 0.1);
+		y, _ = self.cache(self.solver, decayode(2.0), self.iv, self.t0, self.tn, 0.1);
+		self.assertEqual(self.calls, 2);
+		np.testing.assert_array_equal(y, odesolvers.AB_AM_PECE2(decayode(2.0), self.iv, self.t0, self.tn, 0.1)[0]);
+
+	def testSolution(self):
+		cached = self.cache.cached(odesolvers.ThetaMethod);
+		self.assertEqual(cached.__name__, 'ThetaMethod');
+
+		for layout in ['time', 'component']:
+			yref = odesolvers.ThetaMethod(stiffode, self.iv, self.t0, self.tn, 0.01, 0.5, stiffodeJ, solution=True, layout=layout);
+			for _ in range(2):
+				y = cached(stiffode, self.iv, self.t0, self.tn, 0.01, 0.5, stiffodeJ, solution=True, layout=layout);
+				self.assertEqual(y.layout, layout);
+				np.testing.assert_array_equal(y.x, yref.x);
+				np.testing.assert_array_equal(y.component(1), yref.component(1));
+		self.assertEqual(len(self.cache), 2);
+
+	def testEviction(self):
+		solve = lambda tn: self.cache(self.solver, multivariableode, self.iv, self.t0, tn, 0.01);
+
+		solve(1.0);
+		size = self.cache.size;
+		self.cache._maxbytes = 2.5*size;
+
+		solve(1.0 + 1.0e-9);
+		solve(1.0);						# most recently used
+		solve(1.0 + 2.0e-9);			# evicts the least recently used entry
+		self.assertEqual(len(self.cache), 2);
+		self.assertLessEqual(self.cache.size, 2.5*size);
+		self.assertEqual(self.calls, 3);
+
+		solve(1.0);
+		self.assertEqual(self.calls, 3);
+		solve(1.0 + 1.0e-9);
+		self.assertEqual(self.calls, 4);
+
+		# results larger than the cache are not stored
+		self.cache(self.solver, multivariableode, self.iv, self.t0, 10.0, 0.01);
+		self.assertEqual(len(self.cache), 2);
+
+		self.cache.clear();
+		self.assertEqual(len(self.cache), 0);
+		self.assertEqual(self.cache.size, 0);
+
+	def testNotCached(self):
+		solver = lambda f, iv: {'x': iv};
+		self.assertIs(self.cache(solver, constantode, self.iv)['x'], self.iv);
+		self.assertEqual(len(self.cache), 0);
+
+	def testErrors(self):
+		with self.assertRaises(ValueError):
+			odesolvers.SolverCache(self.tmpdir, 0);
+
+
+if __name__ == '__main__':
+	unittest.main()
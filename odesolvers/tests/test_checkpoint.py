@@ -0,0 +1,142 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Test checkpoint and resume of the solvers.
+#
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+import odesolvers
+
+from .test_helpers import *
+
+class Interrupted(Exception):
+	pass
+
+def interruptafter(f, ncalls):
+	"""Function wrapping f, simulating a job killed after ncalls evaluations.
+	"""
+	count = [0];
+	def g(t, x):
+		count[0] += 1;
+		if count[0] > ncalls:
+			raise Interrupted();
+		return f(t, x);
+	return g;
+
+class TestCheckpoint(unittest.TestCase):
+	def setUp(self):
+		# common initial and final time for all tests
+		self.t0 : np.float = 0.0;
+		self.tn : np.float = 1.0;
+		self.iv = np.array([1.0, 2.0]);
+		self.tmpdir = tempfile.mkdtemp();
+		self.checkpoint = os.path.join(self.tmpdir, 'checkpoint.npz');
+
+	def tearDown(self):
+		shutil.rmtree(self.tmpdir);
+
+	def testThetaMethod(self):
+		h : np.float = 0.01;
+		yref = odesolvers.ThetaMethod(stiffode, self.iv, self.t0, self.tn, h, 0.5, stiffodeJ);
+
+		with self.assertRaises(Interrupted):
+			odesolvers.ThetaMethod(interruptafter(stiffode, 200), self.iv, self.t0, self.tn, h, 0.5, stiffodeJ,
+									checkpoint=self.checkpoint, checkpointevery=7);
+		y = odesolvers.ThetaMethod_resume(stiffode, self.checkpoint, stiffodeJ);
+
+		np.testing.assert_array_equal(y, yref);
+
+	def testFDJacobian(self):
+		# resuming an integration with the finite-difference Jacobian on an executor (not necessarily the same)
+		h : np.float = 0.01;
+		yref = odesolvers.ThetaMethod(stiffode, self.iv, self.t0, self.tn, h, 0.5, executor='thread', workers=2);
+
+		with self.assertRaises(Interrupted):
+			odesolvers.ThetaMethod(interruptafter(stiffode, 200), self.iv, self.t0, self.tn, h, 0.5, executor='thread', workers=2,
+									checkpoint=self.checkpoint, checkpointevery=7);
+		with self.assertRaises(NotImplementedError): odesolvers.ThetaMethod_resume(stiffode, self.checkpoint);
+		y = odesolvers.ThetaMethod_resume(stiffode, self.checkpoint, executor='thread');
+
+		np.testing.assert_array_equal(y, yref);
+
+	def testAB_AM_PECE2(self):
+		for h in [None, 0.01]:
+			yref, hiref = odesolvers.AB_AM_PECE2(stiffode, self.iv, self.t0, self.tn, h, ETOL=1.0e-4);
+
+			with self.assertRaises(Interrupted):
+				odesolvers.AB_AM_PECE2(interruptafter(stiffode, 150), self.iv, self.t0, self.tn, h, ETOL=1.0e-4,
+										checkpoint=self.checkpoint, checkpointevery=7);
+			y, hi = odesolvers.AB_AM_PECE2_resume(stiffode, self.checkpoint);
+
+			np.testing.assert_array_equal(y, yref);
+			np.testing.assert_array_equal(hi, hiref);
+
+	def testIncremental(self):
+		# the state file does not grow with the solution, whose new rows only are appended to checkpoint.x
+		h : np.float = 0.01;
+		yref = odesolvers.ThetaMethod(stiffode, self.iv, self.t0, self.tn, h, 0.5, stiffodeJ);
+
+		sizes = [];
+		for ncalls in [60, 150]:
+			with self.assertRaises(Interrupted):
+				odesolvers.ThetaMethod(interruptafter(stiffode, ncalls), self.iv, self.t0, self.tn, h, 0.5, stiffodeJ,
+										checkpoint=self.checkpoint, checkpointevery=5);
+			sizes.append(os.path.getsize(self.checkpoint));
+			self.assertEqual(os.path.getsize(self.checkpoint + '.x') % (8*self.iv.size), 0);
+		self.assertEqual(sizes[0], sizes[1]);
+
+		# rows beyond the saved count (job killed between the two writes) are ignored, and overwritten
+		with open(self.checkpoint + '.x', 'ab') as fh:
+			np.full(6, np.nan).tofile(fh);
+
+		# interrupted again after resuming, then resumed
+		with self.assertRaises(Interrupted):
+			odesolvers.ThetaMethod_resume(interruptafter(stiffode, 40), self.checkpoint, stiffodeJ);
+		y = odesolvers.ThetaMethod_resume(stiffode, self.checkpoint, stiffodeJ);
+
+		np.testing.assert_array_equal(y, yref);
+
+	def testStorage(self):
+		# the storage of the states, and whether an ODESolution is returned, are restored when resuming
+		h : np.float = 0.01;
+		settings = {'solution': True, 'dtype': np.float32, 'layout': 'component'};
+		yref = odesolvers.ThetaMethod(stiffode, self.iv, self.t0, self.tn, h, 0.5, stiffodeJ, **settings);
+
+		with self.assertRaises(Interrupted):
+			odesolvers.ThetaMethod(interruptafter(stiffode, 200), self.iv, self.t0, self.tn, h, 0.5, stiffodeJ,
+									checkpoint=self.checkpoint, checkpointevery=7, **settings);
+		y = odesolvers.ThetaMethod_resume(stiffode, self.checkpoint, stiffodeJ);
+
+		self.assertIsInstance(y, odesolvers.ODESolution);
+		self.assertEqual((y.dtype, y.layout), (np.float32, 'component'));
+		np.testing.assert_array_equal(y, yref);
+		np.testing.assert_array_equal(y.t, yref.t);
+
+		yref, hiref = odesolvers.AB_AM_PECE2(stiffode, self.iv, self.t0, self.tn, ETOL=1.0e-4, **settings);
+		with self.assertRaises(Interrupted):
+			odesolvers.AB_AM_PECE2(interruptafter(stiffode, 150), self.iv, self.t0, self.tn, ETOL=1.0e-4,
+									checkpoint=self.checkpoint, checkpointevery=7, **settings);
+		y, hi = odesolvers.AB_AM_PECE2_resume(stiffode, self.checkpoint);
+
+		self.assertIsInstance(y, odesolvers.ODESolution);
+		self.assertEqual((y.dtype, y.layout), (np.float32, 'component'));
+		np.testing.assert_array_equal(y, yref);
+		np.testing.assert_array_equal(hi, hiref);
+
+	def testWrongSolver(self):
+		odesolvers.ThetaMethod(stableode, np.array([1.0]), self.t0, self.tn, 0.1, 1, checkpoint=self.checkpoint, checkpointevery=2);
+
+		with self.assertRaises(ValueError): odesolvers.AB_AM_PECE2_resume(stableode, self.checkpoint);
+
+
+if __name__ == '__main__':
+	unittest.main()
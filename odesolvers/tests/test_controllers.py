@@ -0,0 +1,111 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Test stepsize controllers.
+#
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+import odesolvers
+
+from .test_helpers import *
+from .test_checkpoint import Interrupted, interruptafter
+
+def vanderpol(t, x):
+	"""Function containing Van der Pol's equation with eta = 2.
+	"""
+	return np.array([x[1], 2*((1 - x[0]*x[0])*x[1] - x[0])]);
+
+class RecordingController(odesolvers.IController):
+	"""Elementary controller recording the exponents k it is given (shared by its copies).
+	"""
+	def __init__(self):
+		super().__init__();
+		self.exponents = [];
+
+	def accept(self, h, err, k):
+		self.exponents.append(k);
+		return super().accept(h, err, k);
+
+	def reject(self, h, err, k):
+		self.exponents.append(k);
+		return super().reject(h, err, k);
+
+class TestControllers(unittest.TestCase):
+	def setUp(self):
+		# common initial and final time for all tests
+		self.t0 : np.float = 0.0;
+		self.tn : np.float = 11.0;
+		self.iv = np.array([2.0, 0.0]);
+		self.controllers = [odesolvers.IController(), odesolvers.PIController(), odesolvers.GustafssonController()];
+
+	def testAccuracy(self):
+		iv = np.array([1.0, 2.0]);
+		for controller in self.controllers:
+			sol, hi = odesolvers.AB_AM_PECE2(multivariableode, iv, 0.0, 5.0, ETOL=1.0e-6, controller=controller, solution=True);
+			t = sol.t;
+			yex = np.stack([(1 + 2*t)*np.exp(-t), 2*np.exp(-t)], axis=1);
+
+			self.assertLess(np.max(np.abs(sol - yex)), 1.0e-3);
+			# the controller passed is not modified
+			self.assertIsNone(controller.errprev);
+
+	def testRejections(self):
+		nrejected = [];
+		for controller in self.controllers:
+			sol, hi = odesolvers.AB_AM_PECE2(vanderpol, self.iv, self.t0, self.tn, ETOL=1.0e-4, controller=controller, solution=True);
+			nrejected.append(sol._state['controller'].nrejected);
+
+		# the PI controller damps the stepsize oscillations of the elementary controller
+		self.assertLess(nrejected[1], nrejected[0]/5);
+		self.assertLess(nrejected[2], nrejected[0]);
+
+	def testExponent(self):
+		# h |lte| / ETOL (default) is of order h^4, the weighted norm of lte of order h^3
+		for tolerances, k in [({}, 4), ({'rtol': 1.0e-4, 'atol': 1.0e-6}, 3)]:
+			controller = RecordingController();
+			odesolvers.AB_AM_PECE2(vanderpol, self.iv, self.t0, self.tn, ETOL=1.0e-4, controller=controller, **tolerances);
+			self.assertEqual(set(controller.exponents), {k});
+
+	def testContinue(self):
+		for controller in self.controllers:
+			yref, hiref = odesolvers.AB_AM_PECE2(vanderpol, self.iv, self.t0, self.tn, ETOL=1.0e-4, controller=controller);
+			sol, hi = odesolvers.AB_AM_PECE2(vanderpol, self.iv, self.t0, 5.0, ETOL=1.0e-4, controller=controller, solution=True);
+			sol, hi = odesolvers.AB_AM_PECE2_continue(vanderpol, sol, self.tn);
+
+			np.testing.assert_array_equal(hi, hiref);
+
+	def testResume(self):
+		tmpdir = tempfile.mkdtemp();
+		checkpoint = os.path.join(tmpdir, 'checkpoint.npz');
+		try:
+			controller = odesolvers.PIController();
+			yref, hiref = odesolvers.AB_AM_PECE2(vanderpol, self.iv, self.t0, self.tn, ETOL=1.0e-4, controller=controller);
+
+			with self.assertRaises(Interrupted):
+				odesolvers.AB_AM_PECE2(interruptafter(vanderpol, 300), self.iv, self.t0, self.tn, ETOL=1.0e-4,
+										checkpoint=checkpoint, checkpointevery=7, controller=controller);
+			with self.assertRaises(ValueError): odesolvers.AB_AM_PECE2_resume(vanderpol, checkpoint);
+			y, hi = odesolvers.AB_AM_PECE2_resume(vanderpol, checkpoint, controller);
+
+			np.testing.assert_array_equal(y, yref);
+			np.testing.assert_array_equal(hi, hiref);
+		finally:
+			shutil.rmtree(tmpdir);
+
+	def testErrorHandling(self):
+		with self.assertRaises(ValueError): odesolvers.IController(safety=1.5);
+		with self.assertRaises(ValueError): odesolvers.PIController(facmin=0.0);
+		with self.assertRaises(ValueError): odesolvers.GustafssonController(facmax=0.5);
+
+
+if __name__ == '__main__':
+	unittest.main()
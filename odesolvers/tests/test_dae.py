@@ -0,0 +1,122 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Test mass matrices and differential-algebraic equations (DAEs) in the Theta method.
+#
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import scipy.sparse
+
+import odesolvers
+
+from .test_helpers import *
+from .test_checkpoint import Interrupted, interruptafter
+
+def robertson(t, y):
+	"""Function containing Robertson's chemical kinetics as an index-1 DAE (M = diag(1,1,0)).
+	"""
+	return np.array([-0.04*y[0] + 1.0e4*y[1]*y[2], 0.04*y[0] - 1.0e4*y[1]*y[2] - 3.0e7*y[1]*y[1], y[0] + y[1] + y[2] - 1]);
+
+def robertsonJ(t, y):
+	"""Function containing the Jacobian of robertson.
+	"""
+	return np.array([[-0.04, 1.0e4*y[2], 1.0e4*y[1]], [0.04, -1.0e4*y[2] - 6.0e7*y[1], -1.0e4*y[1]], [1.0, 1.0, 1.0]]);
+
+def robertsonode(t, y):
+	"""Function containing Robertson's chemical kinetics as an ODE.
+	"""
+	return np.array([-0.04*y[0] + 1.0e4*y[1]*y[2], 0.04*y[0] - 1.0e4*y[1]*y[2] - 3.0e7*y[1]*y[1], 3.0e7*y[1]*y[1]]);
+
+def robertsonodeJ(t, y):
+	"""Function containing the Jacobian of robertsonode.
+	"""
+	return np.array([[-0.04, 1.0e4*y[2], 1.0e4*y[1]], [0.04, -1.0e4*y[2] - 6.0e7*y[1], -1.0e4*y[1]], [0.0, 6.0e7*y[1], 0.0]]);
+
+class TestDAE(unittest.TestCase):
+	def setUp(self):
+		# common initial and final time for all tests
+		self.t0 : np.float = 0.0;
+		self.tn : np.float = 40.0;
+		self.iv = np.array([1.0, 0.0, 0.0]);
+		self.M = np.diag([1.0, 1.0, 0.0]);
+		self.tolerances = {'rtol': 1.0e-6, 'atol': 1.0e-10};
+
+	def testLinearDAE(self):
+		# x1' = x2, 0 = x2 - cos(t): x1 = sin(t)
+		f = lambda t, x: np.array([x[1], x[1] - np.cos(t)]);
+		df = lambda t, x: np.array([[0.0, 1.0], [0.0, 1.0]]);
+		M = np.array([[1.0, 0.0], [0.0, 0.0]]);
+
+		errors = [];
+		for h in [0.01, 0.005]:
+			x = odesolvers.ImplicitEulerSolver(f, np.array([0.0, 1.0]), 0.0, 1.0, h, df, M=M);
+			t = h*np.arange(x.shape[0]);
+
+			np.testing.assert_allclose(x[:,1], np.cos(t), atol=1.0e-10);
+			errors.append(np.max(np.abs(x[:,0] - np.sin(t))));
+		self.assertAlmostEqual(errors[0]/errors[1], 2.0, delta=0.1);
+
+	def testMassMatrix(self):
+		# 2 x' = -x: x = exp(-t/2), with the trapezoidal rule (order 2)
+		errors = [];
+		for h in [0.1, 0.05]:
+			x = odesolvers.ThetaMethod(stableode, np.array([1.0]), 0.0, 1.0, h, 0.5, stableodeJ, M=np.array([[2.0]]));
+			t = h*np.arange(x.shape[0]);
+			errors.append(np.max(np.abs(x[:,0] - np.exp(-t/2))));
+		self.assertAlmostEqual(np.log2(errors[0]/errors[1]), 2.0, delta=0.1);
+
+	def testRobertson(self):
+		h : np.float = 0.1;
+		y = odesolvers.ImplicitEulerSolver(robertson, self.iv, self.t0, self.tn, h, robertsonJ, M=self.M, **self.tolerances);
+
+		# the algebraic equation (conservation of mass) is satisfied at every step
+		np.testing.assert_allclose(np.sum(y, axis=1), 1.0, atol=1.0e-14);
+
+		yref = odesolvers.ImplicitEulerSolver(robertsonode, self.iv, self.t0, self.tn, h, robertsonodeJ, **self.tolerances);
+		np.testing.assert_allclose(y, yref, atol=1.0e-12);
+
+	def testFormats(self):
+		h : np.float = 0.1;
+		y = odesolvers.ImplicitEulerSolver(robertson, self.iv, self.t0, self.tn, h, robertsonJ, M=self.M, **self.tolerances);
+
+		ys = odesolvers.ImplicitEulerSolver(robertson, self.iv, self.t0, self.tn, h, lambda t, y: scipy.sparse.csr_matrix(robertsonJ(t, y)),
+											M=scipy.sparse.diags([1.0, 1.0, 0.0]), **self.tolerances);
+		yb = odesolvers.ImplicitEulerSolver(robertson, self.iv, self.t0, self.tn, h, robertsonJ,
+											M=((0, 0), np.array([[1.0, 1.0, 0.0]])), **self.tolerances);
+		yj = odesolvers.ThetaMethod(robertson, self.iv, self.t0, self.tn, h, 0, jacobianfree=True, M=self.M, **self.tolerances);
+
+		np.testing.assert_allclose(ys, y, atol=1.0e-12);
+		np.testing.assert_allclose(yb, y, atol=1.0e-12);
+		np.testing.assert_allclose(yj, y, atol=1.0e-4);
+
+	def testCheckpoint(self):
+		tmpdir = tempfile.mkdtemp();
+		try:
+			checkpoint = os.path.join(tmpdir, 'checkpoint.npz');
+			yref = odesolvers.ImplicitEulerSolver(robertson, self.iv, self.t0, 1.0, 0.1, robertsonJ, M=self.M);
+
+			with self.assertRaises(Interrupted):
+				odesolvers.ThetaMethod(interruptafter(robertson, 40), self.iv, self.t0, 1.0, 0.1, 0, robertsonJ,
+										checkpoint=checkpoint, checkpointevery=3, M=self.M);
+			with self.assertRaises(ValueError): odesolvers.ThetaMethod_resume(robertson, checkpoint, robertsonJ);
+			y = odesolvers.ThetaMethod_resume(robertson, checkpoint, robertsonJ, M=self.M);
+
+			np.testing.assert_array_equal(y, yref);
+		finally:
+			shutil.rmtree(tmpdir);
+
+	def testErrorHandling(self):
+		with self.assertRaises(ValueError): odesolvers.ThetaMethod(robertson, self.iv, self.t0, self.tn, 0.1, 1, M=self.M);
+		with self.assertRaises(ValueError): odesolvers.ThetaMethod(robertson, self.iv, self.t0, self.tn, 0.1, 0, robertsonJ, M=np.identity(2));
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,118 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Test the solver of delay differential equations.
+#
+
+import unittest
+import numpy as np
+
+import odesolvers
+from odesolvers._dde import _History
+
+from .test_helpers import *
+
+def delayode(t, x, z):
+	"""Function containing the DDE x'(t) = -x(t - 1).
+	"""
+	return -z[0];
+
+def delayodeJ(t, x, z):
+	"""Function containing the Jacobian of delayode with respect to x.
+	"""
+	return np.zeros((1,1));
+
+def delayodeexact(t):
+	"""Function containing the exact solution of delayode on [0,3], with history x(t) = 1 for t <= 0 (method of steps).
+	"""
+	return 1 - t + np.maximum(t - 1, 0)**2/2 - np.maximum(t - 2, 0)**3/6;
+
+class TestDDE(unittest.TestCase):
+	def setUp(self):
+		# common initial and final time for all tests
+		self.t0 : np.float = 0.0;
+		self.tn : np.float = 3.0;
+		self.iv = np.array([1.0]);
+
+	def testExact(self):
+		for theta, order in [(0.5, 2), (0, 1), (1, 1)]:
+			errors = [];
+			for h in [0.1, 0.05]:
+				x = odesolvers.DDESolver(delayode, self.iv, [1.0], self.t0, self.tn, h, theta, delayodeJ);
+				t = self.t0 + h*np.arange(x.shape[0]);
+				errors.append(np.max(np.abs(x[:,0] - delayodeexact(t))));
+			self.assertLess(errors[1], 0.05);
+			self.assertAlmostEqual(np.log2(errors[0]/errors[1]), order, delta=0.1);
+
+	def testHistory(self):
+		# history function, several delays, and a system: x' = -x(t - 0.5) + y(t - 1), y' = -y
+		f = lambda t, x, z: np.array([-z[0,0] + z[1,1], -x[1]]);
+		df = lambda t, x, z: np.array([[0.0, 0.0], [0.0, -1.0]]);
+		history = lambda t: np.array([np.cos(t), np.exp(-t)]);
+
+		x = odesolvers.DDESolver(f, history, [0.5, 1.0], self.t0, self.tn, 0.01, 0.5, df);
+		xref = odesolvers.DDESolver(f, history, [0.5, 1.0], self.t0, self.tn, 0.0025, 0.5, df);
+
+		np.testing.assert_allclose(x[:,1], np.exp(-0.01*np.arange(x.shape[0])), atol=1.0e-4);
+		np.testing.assert_allclose(x, xref[::4], atol=1.0e-4);
+
+	def testShortDelay(self):
+		# delay shorter than the stepsize: the last step is extrapolated
+		x = odesolvers.DDESolver(delayode, self.iv, [0.01], self.t0, 1.0, 0.05, 0.5, delayodeJ);
+		xref = odesolvers.DDESolver(delayode, self.iv, [0.01], self.t0, 1.0, 0.0005, 0.5, delayodeJ);
+
+		self.assertLess(abs(x[-1,0] - xref[-1,0]), 1.0e-4);
+
+	def testStepHalving(self):
+		# stiff nonlinear DDE x' = -5 x^3 + x(t - 1)/2: the Newton iteration of the first steps fails with h = 0.1
+		f = lambda t, x, z: -5.0*x**3 + 0.5*z[0];
+		df = lambda t, x, z: np.array([[-15.0*x[0]**2]]);
+		iv = np.array([5.0]);
+
+		with self.assertRaises(ArithmeticError):
+			odesolvers.DDESolver(f, iv, [1.0], self.t0, self.tn, 0.1, 0.5, df, maxhalvings=0);
+
+		# the failing steps are performed as substeps, the solution being still returned at t0 + i h
+		x = odesolvers.DDESolver(f, iv, [1.0], self.t0, self.tn, 0.1, 0.5, df);
+		xref = odesolvers.DDESolver(f, iv, [1.0], self.t0, self.tn, 0.001, 0.5, df);
+
+		self.assertEqual(x.shape, (31, 1));
+		np.testing.assert_allclose(x[10:], xref[1000::100], atol=0.1);
+
+	def testBoundedHistory(self):
+		# the buffer keeps only the steps within the maximum delay
+		h, delay = 0.1, 1.0;
+		hist = _History(self.iv, self.t0, self.iv, np.zeros(1), capacity=4);
+		for i in range(1, 10000):
+			t = h*i;
+			hist.append(t, np.array([t**3]), np.array([3*t**2]));
+			hist.prune(t - delay);
+
+		self.assertLessEqual(len(hist), delay/h + 2);
+		self.assertLessEqual(hist.capacity, 4*(delay/h + 2));
+
+		# cubic Hermite interpolation is exact on cubic polynomials
+		t = h*9999;
+		tq = np.array([t - 1.0, t - 0.55, t - 0.01234]);
+		np.testing.assert_allclose(hist(tq)[:,0], tq**3, rtol=1.0e-12);
+
+		# before the initial time, the history
+		hist = _History(lambda t: np.array([2*t]), self.t0, self.iv, np.zeros(1));
+		np.testing.assert_array_equal(hist(np.array([-1.0, -0.5]))[:,0], [-2.0, -1.0]);
+
+	def testErrorHandling(self):
+		with self.assertRaises(ValueError): odesolvers.DDESolver(delayode, self.iv, [1.0], self.t0, self.tn, -0.1, 0.5, delayodeJ);
+		with self.assertRaises(ValueError): odesolvers.DDESolver(delayode, self.iv, [1.0], self.tn, self.t0, 0.1, 0.5, delayodeJ);
+		with self.assertRaises(ValueError): odesolvers.DDESolver(delayode, self.iv, [1.0], self.t0, self.tn, 0.1, 2, delayodeJ);
+		with self.assertRaises(ValueError): odesolvers.DDESolver(delayode, self.iv, [0.0], self.t0, self.tn, 0.1, 0.5, delayodeJ);
+		with self.assertRaises(ValueError): odesolvers.DDESolver(delayode, self.iv, [], self.t0, self.tn, 0.1, 0.5, delayodeJ);
+		with self.assertRaises(ValueError): odesolvers.DDESolver(delayode, self.iv, [1.0], self.t0, self.tn, 0.1, 0.5, delayodeJ, maxhalvings=-1);
+		with self.assertRaises(NotImplementedError): odesolvers.DDESolver(delayode, self.iv, [1.0], self.t0, self.tn, 0.1, 0.5);
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,100 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Test exponential integrators.
+#
+
+import unittest
+import numpy as np
+import scipy.sparse
+from scipy.linalg import expm
+
+import odesolvers
+from odesolvers._exponential import _expv
+
+def stiffodeN(t, x):
+	"""Function containing the nonlinear part of stiffode, written as x' = A x + N(t,x).
+	"""
+	return np.array([0.0, 100*np.sin(t) + np.cos(t)]);
+
+def stiffodesol(t, iv):
+	"""Function containing the exact solution of stiffode.
+	"""
+	return np.array([iv[0]*np.exp(-t), np.sin(t) + iv[1]*np.exp(-100*t)]);
+
+class TestExponentialIntegrator(unittest.TestCase):
+	def setUp(self):
+		# common initial and final time for all tests
+		self.t0 : np.float = 0.0;
+		self.tn : np.float = 1.0;
+		self.iv = np.array([1.0, 2.0]);
+		self.A = np.array([[-1.0, 0.0], [0.0, -100.0]]);
+
+	def testLinearExact(self):
+		h : np.float = 0.25;
+
+		for solver in [odesolvers.ExponentialEulerSolver, odesolvers.ETDRK2Solver]:
+			y = solver(self.A, None, self.iv, self.t0, self.tn, h);
+
+			np.testing.assert_allclose(y[-1], expm(self.tn*self.A).dot(self.iv), rtol=1.0e-12, atol=1.0e-14);
+
+	def testStiffODE(self):
+		# stepsize far beyond the stability limit of explicit Euler (h < 0.02)
+		h : np.float = 0.1;
+
+		y = odesolvers.ExponentialEulerSolver(self.A, stiffodeN, self.iv, self.t0, self.tn, h);
+		self.assertLess(np.max(np.abs(y[-1] - stiffodesol(self.tn, self.iv))), 1.0e-1);
+
+		y = odesolvers.ETDRK2Solver(self.A, stiffodeN, self.iv, self.t0, self.tn, h);
+		self.assertLess(np.max(np.abs(y[-1] - stiffodesol(self.tn, self.iv))), 1.0e-3);
+
+	def testOrder(self):
+		# error of ETD2RK decreases quadratically with the stepsize
+		errors = [];
+		for h in [0.025, 0.0125]:
+			y = odesolvers.ETDRK2Solver(self.A, stiffodeN, self.iv, self.t0, self.tn, h);
+			errors.append(np.max(np.abs(y[-1] - stiffodesol(self.tn, self.iv))));
+
+		self.assertGreater(errors[0]/errors[1], 3.5);
+
+	def testKrylov(self):
+		n : np.int = 200;
+		A = -2*np.identity(n) + np.diag(np.ones(n-1), 1) + np.diag(np.ones(n-1), -1);
+		A *= (n+1)**2;
+		N = lambda t, x: np.cos(x);
+		iv = np.sin(np.pi*np.linspace(0.0, 1.0, n+2)[1:-1]);
+
+		y = odesolvers.ETDRK2Solver(A, N, iv, self.t0, 0.01, 0.005);
+		ysparse = odesolvers.ETDRK2Solver(scipy.sparse.csr_matrix(A), N, iv, self.t0, 0.01, 0.005, krylovdim=100);
+
+		np.testing.assert_allclose(ysparse, y, atol=1.0e-6);
+
+		# ||hA|| ~ 1.6e4, far beyond the default subspaces of dimension 30: substeps keep the error within krylovtol
+		for solver in [odesolvers.ExponentialEulerSolver, odesolvers.ETDRK2Solver]:
+			y = solver(A, N, iv, self.t0, 0.2, 0.1);
+			ysparse = solver(scipy.sparse.csr_matrix(A), N, iv, self.t0, 0.2, 0.1);
+			np.testing.assert_allclose(ysparse, y, atol=1.0e-8);
+
+		# the error estimate not being met within the maximum number of substeps is reported
+		with self.assertRaises(ArithmeticError):
+			_expv(lambda v: 0.1*A.dot(v), np.ones(n), 5, 1.0e-8, maxsteps=10);
+
+	def testErrorHandling(self):
+		# negative time step
+		with self.assertRaises(ValueError): odesolvers.ExponentialEulerSolver(self.A, None, self.iv, self.t0, self.tn, -0.1);
+		# time flowing negatively
+		with self.assertRaises(ValueError): odesolvers.ExponentialEulerSolver(self.A, None, self.iv, self.tn, self.t0, 0.1);
+		# unsupported order
+		with self.assertRaises(ValueError): odesolvers.ExponentialIntegrator(self.A, None, self.iv, self.t0, self.tn, 0.1, 3);
+		# matrix size not matching the initial values
+		with self.assertRaises(ValueError): odesolvers.ExponentialEulerSolver(np.identity(3), None, self.iv, self.t0, self.tn, 0.1);
+		# non-positive Krylov tolerance
+		with self.assertRaises(ValueError): odesolvers.ExponentialEulerSolver(self.A, None, self.iv, self.t0, self.tn, 0.1, krylovtol=0.0);
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,97 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Test extrapolation methods.
+#
+
+import unittest
+from unittest import mock
+import numpy as np
+
+import odesolvers
+from odesolvers import _extrapolation
+from odesolvers._expliciteuler import _ExplicitEuler_step
+
+from .test_helpers import *
+
+class TestExtrapolation(unittest.TestCase):
+	def setUp(self):
+		# common initial and final time for all tests
+		self.t0 : np.float = 0.0;
+		self.tn : np.float = 5.0;
+		self.iv = np.array([1.0, 2.0]);
+
+	def testGBS(self):
+		for ETOL in [1.0e-6, 1.0e-10, 1.0e-12]:
+			sol, hi = odesolvers.GBSSolver(multivariableode, self.iv, self.t0, self.tn, ETOL=ETOL, solution=True);
+			t = sol.t;
+			yex = np.stack([(1 + 2*t)*np.exp(-t), 2*np.exp(-t)], axis=1);
+
+			self.assertEqual(t[-1], self.tn);
+			self.assertLess(np.max(np.abs(sol - yex)), 10*ETOL);
+
+		# stringent tolerance reached with few steps
+		self.assertLess(len(sol), 20);
+
+	def testLinearlyImplicit(self):
+		for ETOL in [1.0e-6, 1.0e-10]:
+			sol, hi = odesolvers.LinearlyImplicitExtrapolationSolver(stiffode, self.iv, self.t0, self.tn, ETOL=ETOL, df=stiffodeJ, solution=True);
+			t = sol.t;
+			yex = np.stack([np.exp(-t), np.sin(t) + 2*np.exp(-100*t)], axis=1);
+
+			self.assertEqual(t[-1], self.tn);
+			self.assertLess(np.max(np.abs(sol - yex)), 100*ETOL);
+
+		# the stepsize is not limited by the stiffness (|h lambda| > 2 for explicit methods)
+		self.assertGreater(np.max(hi), 0.02);
+
+	def testGraggSequence(self):
+		# started with one Explicit Euler step, reusing f(ti,xi): n-1 evaluations of f for n substeps
+		count = [0];
+		def f(t, x):
+			count[0] += 1;
+			return multivariableode(t, x);
+
+		H, n = 0.1, 4;
+		fi = multivariableode(self.t0, self.iv);
+		with mock.patch.object(_extrapolation, '_ExplicitEuler_step', wraps=_ExplicitEuler_step) as euler:
+			x = _extrapolation._Gragg_sequence(f, self.iv, self.t0, H, n, fi);
+		euler.assert_called_once();
+		self.assertEqual(count[0], n-1);
+
+		h = H/n;
+		xs = [self.iv, self.iv + h*fi];
+		for m in range(1, n):
+			xs.append(xs[-2] + 2*h*multivariableode(self.t0 + m*h, xs[-1]));
+		np.testing.assert_array_equal(x, xs[-1]);
+
+	def testArrays(self):
+		# by default the states and stepsizes are arrays trimmed to the steps (not retaining the growth buffer)
+		sol, hiref = odesolvers.GBSSolver(multivariableode, self.iv, self.t0, self.tn, ETOL=1.0e-8, solution=True);
+		y, hi = odesolvers.GBSSolver(multivariableode, self.iv, self.t0, self.tn, ETOL=1.0e-8);
+
+		self.assertIs(type(y), np.ndarray);
+		self.assertIsNone(y.base);
+		self.assertIsNone(hi.base);
+		np.testing.assert_array_equal(y, sol);
+		np.testing.assert_array_equal(hi, hiref);
+
+	def testErrorHandling(self):
+		# time flowing negatively
+		with self.assertRaises(ValueError): odesolvers.GBSSolver(multivariableode, self.iv, self.tn, self.t0);
+		# Negative numerical tolerance
+		with self.assertRaises(ValueError): odesolvers.GBSSolver(multivariableode, self.iv, self.t0, self.tn, ETOL=-1.0);
+		# Negative stepsize
+		with self.assertRaises(ValueError): odesolvers.GBSSolver(multivariableode, self.iv, self.t0, self.tn, h=-0.1);
+		# Too small extrapolation table
+		with self.assertRaises(ValueError): odesolvers.ExtrapolationSolver(multivariableode, self.iv, self.t0, self.tn, kmax=2);
+		# Jacobian not provided
+		with self.assertRaises(NotImplementedError): odesolvers.LinearlyImplicitExtrapolationSolver(stiffode, self.iv, self.t0, self.tn);
+
+
+if __name__ == '__main__':
+	unittest.main()
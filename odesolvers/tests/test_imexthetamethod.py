@@ -0,0 +1,92 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Test implicit-explicit Theta method.
+#
+
+import unittest
+import numpy as np
+
+import odesolvers
+
+from .test_helpers import *
+
+def zeroode(t, x):
+	"""Function containing the ODE x' = 0.
+	"""
+	return np.zeros(x.size);
+
+def stiffodestiff(t, x):
+	"""Function containing the stiff (linear) part of stiffode.
+	"""
+	return np.array([-x[0], -100*x[1]]);
+
+def stiffodenonstiff(t, x):
+	"""Function containing the non-stiff part of stiffode.
+	"""
+	return np.array([0.0, 100*np.sin(t) + np.cos(t)]);
+
+class TestIMEXThetaMethod(unittest.TestCase):
+	def setUp(self):
+		# common initial and final time for all tests
+		self.t0 : np.float = 0.0;
+		self.tn : np.float = 0.3;
+		self.iv = np.array([1.0, 2.0]);
+
+	def testFullyImplicit(self):
+		h : np.float = 0.05;
+
+		y = odesolvers.IMEXThetaMethod(stiffode, zeroode, self.iv, self.t0, self.tn, h, 0.1, stiffodeJ);
+		yref = odesolvers.ThetaMethod(stiffode, self.iv, self.t0, self.tn, h, 0.1, stiffodeJ);
+
+		np.testing.assert_allclose(y, yref, rtol=1.0e-12);
+
+	def testConstantJacobian(self):
+		h : np.float = 0.05;
+		N : np.uint = np.uint(np.ceil((self.tn - self.t0)/h));	# final step
+
+		y = odesolvers.IMEXThetaMethod(stiffodestiff, stiffodenonstiff, self.iv, self.t0, self.tn, h, 0, stiffodeJ, TOL=1.0e-12);
+		yconst = odesolvers.IMEXThetaMethod(stiffodestiff, stiffodenonstiff, self.iv, self.t0, self.tn, h, 0, stiffodeJ(0.0, self.iv));
+
+		np.testing.assert_allclose(yconst, y, rtol=1.0e-10);
+		self.assertLess(np.absolute(y[N,1]-y[0,1]),3);		# stable, while explicit Euler is not
+
+	def testReactionDiffusion(self):
+		# Fisher-KPP equation u_t = u_xx + u(1 - u), diffusion on a banded matrix
+		n : np.int = 100;
+		ab = np.zeros((3,n));
+		ab[0,1:] = ab[2,:-1] = (n+1)**2;
+		ab[1,:] = -2*(n+1)**2;
+		D = ((1,1), ab);
+
+		def diffusion(t, u):
+			uprime = -2*u;
+			uprime[1:] += u[:-1];
+			uprime[:-1] += u[1:];
+			return (n+1)**2*uprime;
+
+		reaction = lambda t, u: u*(1 - u);
+		iv = np.exp(-100*np.linspace(0.0, 1.0, n)**2);
+
+		y = odesolvers.IMEXThetaMethod(diffusion, reaction, iv, self.t0, 0.5, 0.01, 0, D);
+
+		self.assertTrue(np.all(y >= -1.0e-12));
+		self.assertTrue(np.all(y <= 1.0 + 1.0e-12));
+
+	def testErrorHandling(self):
+		# negative time step
+		with self.assertRaises(ValueError): odesolvers.IMEXThetaMethod(stiffodestiff, stiffodenonstiff, self.iv, self.t0, self.tn, -0.1, 0, stiffodeJ);
+		# theta out of bounds
+		with self.assertRaises(ValueError): odesolvers.IMEXThetaMethod(stiffodestiff, stiffodenonstiff, self.iv, self.t0, self.tn, 0.1, 2, stiffodeJ);
+		# Jacobian size not matching the initial values
+		with self.assertRaises(ValueError): odesolvers.IMEXThetaMethod(stiffodestiff, stiffodenonstiff, self.iv, self.t0, self.tn, 0.1, 0, np.identity(3));
+		# Automatic differentiation
+		with self.assertRaises(NotImplementedError): odesolvers.IMEXThetaMethod(stiffodestiff, stiffodenonstiff, self.iv, self.t0, self.tn, 0.1, 0);
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,66 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Test Theta method for linear ODEs.
+#
+
+import unittest
+import numpy as np
+import scipy.sparse
+
+import odesolvers
+
+from .test_helpers import *
+
+def stiffodeforcing(t):
+	"""Function containing the forcing term of stiffode, written as x' = A x + b(t).
+	"""
+	return np.array([0.0, 100*np.sin(t) + np.cos(t)]);
+
+class TestLinearThetaMethod(unittest.TestCase):
+	def setUp(self):
+		# common initial and final time for all tests
+		self.t0 : np.float = 0.0;
+		self.tn : np.float = 0.3;
+		self.h : np.float = 0.05;
+		self.iv = np.array([1.0, 2.0]);
+		self.A = np.array([[-1.0, 0.0], [0.0, -100.0]]);
+
+	def testStiffODE(self):
+		for theta in [0, 0.1, 0.5, 1]:
+			y = odesolvers.LinearThetaMethod(self.A, self.iv, self.t0, self.tn, self.h, theta, stiffodeforcing);
+			yref = odesolvers.ThetaMethod(stiffode, self.iv, self.t0, self.tn, self.h, theta, stiffodeJ, TOL=1.0e-12);
+
+			np.testing.assert_allclose(y, yref, rtol=1.0e-10);
+
+	def testMatrixFormats(self):
+		n : np.int = 50;
+		A = -2*np.identity(n) + np.diag(np.ones(n-1), 1) + np.diag(np.ones(n-1), -1);
+		ab = np.zeros((3,n));
+		ab[0,1:] = 1.0;
+		ab[1,:] = -2.0;
+		ab[2,:-1] = 1.0;
+		iv = np.linspace(0.0, 1.0, n);
+
+		y = odesolvers.LinearThetaMethod(A, iv, self.t0, self.tn, self.h, 0.5);
+		ybanded = odesolvers.LinearThetaMethod(((1,1), ab), iv, self.t0, self.tn, self.h, 0.5);
+		ysparse = odesolvers.LinearThetaMethod(scipy.sparse.csr_matrix(A), iv, self.t0, self.tn, self.h, 0.5);
+
+		np.testing.assert_allclose(ybanded, y, rtol=1.0e-12);
+		np.testing.assert_allclose(ysparse, y, rtol=1.0e-12);
+
+	def testErrorHandling(self):
+		# time flowing negatively
+		with self.assertRaises(ValueError): odesolvers.LinearThetaMethod(self.A, self.iv, self.tn, self.t0, self.h, 0);
+		# theta out of bounds
+		with self.assertRaises(ValueError): odesolvers.LinearThetaMethod(self.A, self.iv, self.t0, self.tn, self.h, 2);
+		# matrix size not matching the initial values
+		with self.assertRaises(ValueError): odesolvers.LinearThetaMethod(np.identity(3), self.iv, self.t0, self.tn, self.h, 0);
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,110 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Test finite-difference operators for the method of lines.
+#
+
+import unittest
+import numpy as np
+import scipy.sparse
+
+import odesolvers
+
+from .test_helpers import *
+
+class TestMOL(unittest.TestCase):
+	def setUp(self):
+		# heat equation u_t = u_xx on (0,1), u = 0 on the boundary, u(0,x) = sin(pi x)
+		self.n : np.int = 199;
+		self.dx : np.float = 1.0/(self.n + 1);
+		self.x = self.dx*np.arange(1, self.n + 1);
+		self.L = odesolvers.FDOperator([-1, 0, 1], odesolvers.FDWeights([-1, 0, 1], 2, self.dx), self.n, self.dx,
+										('dirichlet', 0.0), ('dirichlet', 0.0));
+
+	def testWeights(self):
+		np.testing.assert_allclose(odesolvers.FDWeights([-1, 0, 1], 2, 0.5), [4.0, -8.0, 4.0]);
+		np.testing.assert_allclose(odesolvers.FDWeights([-1, 0], 1, 0.5), [-2.0, 2.0]);
+		np.testing.assert_allclose(odesolvers.FDWeights([-2, -1, 0, 1, 2], 1, 1.0), [1/12, -2/3, 0.0, 2/3, -1/12], atol=1.0e-14);
+
+	def testOperator(self):
+		# the slice evaluation agrees with the matrix (plus the boundary values)
+		u = np.cos(3*self.x);
+		for left, right, offset in [(('dirichlet', 1.0), ('dirichlet', lambda t: 2*t), [1.0, 2.0]),
+									(('neumann', 1.0), ('neumann', 2.0), [-2.0*self.dx, 4.0*self.dx])]:
+			L = odesolvers.FDOperator([-1, 0, 1], odesolvers.FDWeights([-1, 0, 1], 2, self.dx), self.n, self.dx, left, right);
+			g = np.zeros(self.n);
+			g[0], g[-1] = offset[0]/self.dx**2, offset[1]/self.dx**2;
+			np.testing.assert_allclose(L(1.0, u), L.matrix.dot(u) + g, atol=1.0e-8);
+
+			(l, up), ab = L.banded;
+			self.assertEqual((l, up), (1, 1));
+			np.testing.assert_allclose(odesolvers._linalg._matvec(L.banded, u), L.matrix.dot(u));
+
+		# Neumann boundary conditions: second derivative of a function with the given derivatives
+		L = odesolvers.FDOperator([-1, 0, 1], odesolvers.FDWeights([-1, 0, 1], 2, self.dx), self.n, self.dx, ('neumann', 0.0), ('neumann', 2.0*(self.x[-1] - self.x[0])));
+		u = (self.x - self.x[0])**2;
+		np.testing.assert_allclose(L(0.0, u), 2.0, atol=1.0e-8);
+
+		# periodic boundary conditions (fourth-order stencil), with a sparse Jacobian
+		L = odesolvers.FDOperator([-2, -1, 0, 1, 2], odesolvers.FDWeights([-2, -1, 0, 1, 2], 1, self.dx), self.n, self.dx, 'periodic', 'periodic');
+		u = np.sin(2*np.pi*self.x);
+		np.testing.assert_allclose(L(0.0, u), L.matrix.dot(u));
+		self.assertIsNone(L.banded);
+		self.assertTrue(scipy.sparse.issparse(L.jacobian()));
+
+	def testHeatEquation(self):
+		y = odesolvers.ThetaMethod(self.L, np.sin(np.pi*self.x), 0.0, 0.1, 0.01, 0.5, self.L.jacobian);
+		np.testing.assert_allclose(y[-1], np.exp(-np.pi**2*0.1)*np.sin(np.pi*self.x), atol=1.0e-3);
+
+		# same result as with the dense Jacobian
+		A = self.L.matrix.toarray();
+		yd = odesolvers.ThetaMethod(lambda t, x: A.dot(x), np.sin(np.pi*self.x), 0.0, 0.1, 0.01, 0.5, lambda t, x: A);
+		np.testing.assert_allclose(y, yd, atol=1.0e-12);
+
+		# and with the sparse Jacobian
+		ys = odesolvers.ThetaMethod(self.L, np.sin(np.pi*self.x), 0.0, 0.1, 0.01, 0.5, lambda t, x: self.L.matrix);
+		np.testing.assert_allclose(y, ys, atol=1.0e-12);
+
+	def testReactionDiffusion(self):
+		# u_t = u_xx - u^3, the Jacobian of the reaction term being added on the diagonal
+		f = lambda t, u: self.L(t, u) - u**3;
+		df = lambda t, u: self.L.jacobian(t, u, -3*u**2);
+		y = odesolvers.ImplicitEulerSolver(f, np.sin(np.pi*self.x), 0.0, 0.1, 0.01, df);
+
+		A = self.L.matrix.toarray();
+		yd = odesolvers.ImplicitEulerSolver(f, np.sin(np.pi*self.x), 0.0, 0.1, 0.01, lambda t, u: A - np.diag(3*u**2));
+		np.testing.assert_allclose(y, yd, atol=1.0e-12);
+
+	def test2D(self):
+		# u_t = u_xx + u_yy on the unit square, u = 0 on the boundary
+		nx, ny = 39, 29;
+		dx, dy = 1.0/(nx + 1), 1.0/(ny + 1);
+		Lx = odesolvers.FDOperator([-1, 0, 1], odesolvers.FDWeights([-1, 0, 1], 2, dx), nx, dx, ('dirichlet', 0.0), ('dirichlet', 0.0));
+		Ly = odesolvers.FDOperator([-1, 0, 1], odesolvers.FDWeights([-1, 0, 1], 2, dy), ny, dy, ('dirichlet', 0.0), ('dirichlet', 0.0));
+		L = odesolvers.FDOperator2D(Lx, Ly);
+
+		X, Y = np.meshgrid(dx*np.arange(1, nx + 1), dy*np.arange(1, ny + 1), indexing='ij');
+		u0 = np.ravel(np.sin(np.pi*X)*np.sin(np.pi*Y));
+		np.testing.assert_allclose(L(0.0, u0), L.matrix.dot(u0), atol=1.0e-10);
+		self.assertEqual(L.banded[0], (ny, ny));
+
+		y = odesolvers.ThetaMethod(L, u0, 0.0, 0.05, 0.005, 0.5, L.jacobian);
+		np.testing.assert_allclose(y[-1], np.exp(-2*np.pi**2*0.05)*u0, atol=2.0e-3);
+
+	def testErrorHandling(self):
+		w = odesolvers.FDWeights([-1, 0, 1], 2, self.dx);
+		with self.assertRaises(ValueError): odesolvers.FDWeights([-1, 0], 2, self.dx);
+		with self.assertRaises(ValueError): odesolvers.FDWeights([0, 0, 1], 1, self.dx);
+		with self.assertRaises(ValueError): odesolvers.FDOperator([-1, 0, 1], w[:2], self.n, self.dx, ('dirichlet', 0.0), ('dirichlet', 0.0));
+		with self.assertRaises(ValueError): odesolvers.FDOperator([-1, 0, 1], w, self.n, self.dx, None, ('dirichlet', 0.0));
+		with self.assertRaises(ValueError): odesolvers.FDOperator([-1, 0, 1], w, self.n, self.dx, 'periodic', ('dirichlet', 0.0));
+		with self.assertRaises(ValueError): odesolvers.FDOperator([-1, 0, 1], w, self.n, self.dx, ('robin', 0.0), ('dirichlet', 0.0));
+		with self.assertRaises(ValueError): odesolvers.FDOperator([-2, 0, 2], w, self.n, self.dx, ('dirichlet', 0.0), ('dirichlet', 0.0));
+
+
+if __name__ == '__main__':
+	unittest.main()
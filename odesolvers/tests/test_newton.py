@@ -0,0 +1,114 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Test the Newton iteration of the implicit solvers (contraction rate, initial guess, stepsize halving).
+#
+
+import unittest
+import numpy as np
+
+import odesolvers
+from odesolvers._thetamethod import _Theta_step, _Newton_test
+
+from .test_helpers import *
+
+def arctanode(t, x):
+	"""Function containing the ODE x' = -10 arctan(x), for which the Newton iteration diverges with large stepsizes.
+	"""
+	return -10*np.arctan(x);
+
+def arctanodeJ(t, x):
+	"""Function containing the Jacobian of arctanode.
+	"""
+	return np.diag(-10/(1 + x*x));
+
+def logisticode(t, x):
+	"""Function containing the logistic ODE x' = x(1 - x).
+	"""
+	return x*(1 - x);
+
+def logisticodeJ(t, x):
+	"""Function containing the Jacobian of logisticode.
+	"""
+	return np.diag(1 - 2*x);
+
+def counted(f, count):
+	"""Function wrapping f, counting its evaluations in count[0].
+	"""
+	def g(t, x):
+		count[0] += 1;
+		return f(t, x);
+	return g;
+
+class TestNewton(unittest.TestCase):
+	def setUp(self):
+		# common initial and final time for all tests
+		self.t0 : np.float = 0.0;
+		self.tn : np.float = 4.0;
+
+	def testContractionRate(self):
+		TOL = 1.0e-5;
+		x = np.ones(1);
+		# converged: estimated error rate/(1-rate)*||delta|| within TOL, even if ||delta|| is not
+		self.assertTrue(_Newton_test(np.array([2.0e-5]), TOL, None, None, x, [40.0], 10));
+		self.assertFalse(_Newton_test(np.array([2.0e-5]), TOL, None, None, x, [3.0], 10));
+
+		# a single growth of the correction is tolerated (far from the solution)
+		self.assertFalse(_Newton_test(np.array([5.0e-5]), TOL, None, None, x, [4.0], 10));
+		self.assertFalse(_Newton_test(np.array([3.0e-5]), TOL, None, None, x, [8.0, 5.0], 10));
+
+		# diverging, or too slow to converge within the remaining iterations without accelerating
+		with self.assertRaises(ArithmeticError): _Newton_test(np.array([5.0e-5]), TOL, None, None, x, [3.0, 4.0], 10);
+		with self.assertRaises(ArithmeticError): _Newton_test(np.array([3.0e-5]), TOL, None, None, x, [6.0, 4.0], 4);
+		with self.assertRaises(ArithmeticError): _Newton_test(np.array([np.nan]), TOL, None, None, x, [4.0], 10);
+
+		dnorms = [];
+		self.assertFalse(_Newton_test(np.array([4.0e-5]), TOL, None, None, x, dnorms, 10));
+		self.assertEqual(dnorms, [4.0]);
+
+		# a tolerance below the roundoff of the iterate cannot be certified by the estimate, only met by the correction
+		with self.assertRaises(ArithmeticError): _Newton_test(np.array([2.0e-5]), TOL, None, None, np.array([1.0e12]), [40.0], 10);
+		self.assertTrue(_Newton_test(np.array([0.0]), TOL, None, None, np.array([1.0e12]), [40.0], 10));
+
+	def testInitialGuess(self):
+		# the extrapolated initial guess saves Newton iterations (i.e. Jacobian evaluations)
+		h : np.float = 0.05;
+		iv = np.array([0.1]);
+		count = [0];
+		y = odesolvers.ThetaMethod(logisticode, iv, self.t0, self.tn, h, 0.5, counted(logisticodeJ, count), TOL=1.0e-10);
+
+		countref = [0];
+		yref = np.empty_like(y);
+		yref[0,:] = iv;
+		for i in range(y.shape[0]-1):
+			yref[i+1,:] = _Theta_step(logisticode, counted(logisticodeJ, countref), yref[i,:], self.t0+h*i, h, 0.5, 1.0e-10, 10);
+
+		np.testing.assert_allclose(y, yref, rtol=1.0e-9);
+		self.assertLess(count[0], countref[0]);
+
+	def testStepHalving(self):
+		iv = np.array([5.0]);
+		for h in [0.5, 1.0, 2.0]:
+			with self.assertRaises(ArithmeticError):
+				odesolvers.ThetaMethod(arctanode, iv, self.t0, self.tn, h, 0, arctanodeJ, maxhalvings=0);
+
+			# the failing steps are replaced by smaller ones: the solution is still returned at the times t0 + i h
+			y = odesolvers.ImplicitEulerSolver(arctanode, iv, self.t0, self.tn, h, arctanodeJ);
+			self.assertEqual(y.shape, (np.int(np.ceil((self.tn - self.t0)/h)) + 1, 1));
+			self.assertTrue(np.all(np.diff(y[:,0]) < 0.0));
+			self.assertTrue(np.all(y[1:,0] > 0.0));
+
+		y = odesolvers.IMEXThetaMethod(arctanode, lambda t, x: np.zeros(1), iv, self.t0, self.tn, 1.0, 0, arctanodeJ);
+		self.assertTrue(np.all(np.diff(y[:,0]) < 0.0));
+
+	def testErrorHandling(self):
+		with self.assertRaises(ValueError): odesolvers.ThetaMethod(stableode, np.array([1.0]), self.t0, self.tn, 0.1, 0, stableodeJ, maxhalvings=-1);
+		with self.assertRaises(ValueError): odesolvers.IMEXThetaMethod(stableode, stableode, np.array([1.0]), self.t0, self.tn, 0.1, 0, stableodeJ, maxhalvings=-1);
+
+
+if __name__ == '__main__':
+	unittest.main()
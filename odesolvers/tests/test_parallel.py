@@ -0,0 +1,101 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Test parallel evaluations: finite-difference Jacobians and ensembles.
+#
+
+import unittest
+import numpy as np
+from functools import partial
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+import odesolvers
+
+from .test_helpers import *
+
+class CountingExecutor(Executor):
+	"""Executor running the tasks in the caller, counting them (with no private attributes of the standard executors).
+	"""
+	def __init__(self):
+		self.pool = ThreadPoolExecutor(1);
+		self.nsubmitted = 0;
+
+	def submit(self, fn, *args, **kwargs):
+		self.nsubmitted += 1;
+		return self.pool.submit(fn, *args, **kwargs);
+
+	def shutdown(self, wait = True, **kwargs):
+		self.pool.shutdown(wait);
+
+class TestFDJacobian(unittest.TestCase):
+	def testJacobian(self):
+		x = np.array([0.3, -1.2]);
+		for f, df in [(multivariableode, multivariableodeJ), (stiffode, stiffodeJ)]:
+			np.testing.assert_allclose(odesolvers.FDJacobian(f)(0.5, x), df(0.5, x), rtol=1.0e-6, atol=1.0e-6);
+
+	def testDeterministic(self):
+		# the result does not depend on the executor nor on the number of workers
+		x = np.linspace(-1.0, 1.0, 7);
+		f = lambda t, x: np.sin(x)*np.roll(x, 1);
+		J = odesolvers.FDJacobian(f)(0.0, x);
+		for workers in [1, 2, 3]:
+			with ThreadPoolExecutor(workers) as pool:
+				np.testing.assert_array_equal(odesolvers.FDJacobian(f, pool)(0.0, x), J);
+
+	def testWorkers(self):
+		# the columns are split among the given number of workers, whatever the executor
+		x = np.linspace(-1.0, 1.0, 7);
+		f = lambda t, x: np.sin(x)*np.roll(x, 1);
+		J = odesolvers.FDJacobian(f)(0.0, x);
+		for workers in [1, 3]:
+			with CountingExecutor() as pool:
+				np.testing.assert_array_equal(odesolvers.FDJacobian(f, pool, workers=workers)(0.0, x), J);
+			self.assertEqual(pool.nsubmitted, workers);
+
+	def testThetaMethod(self):
+		iv = np.array([1.0, 2.0]);
+		y = odesolvers.ThetaMethod(stiffode, iv, 0.0, 1.0, 0.01, 0.5, executor='thread', workers=2);
+		yref = odesolvers.ThetaMethod(stiffode, iv, 0.0, 1.0, 0.01, 0.5, df=stiffodeJ);
+		np.testing.assert_allclose(y, yref, atol=1.0e-8);
+
+		y = odesolvers.ImplicitEulerSolver(stiffode, iv, 0.0, 1.0, 0.01, executor='process', workers=2);
+		yref = odesolvers.ImplicitEulerSolver(stiffode, iv, 0.0, 1.0, 0.01, df=stiffodeJ);
+		np.testing.assert_allclose(y, yref, atol=1.0e-8);
+
+	def testErrorHandling(self):
+		with self.assertRaises(ValueError): odesolvers.FDJacobian(stiffode, eps=0.0);
+		with self.assertRaises(ValueError): odesolvers.FDJacobian(stiffode, workers=0);
+		with self.assertRaises(ValueError): odesolvers.ThetaMethod(stiffode, np.array([1.0, 2.0]), 0.0, 1.0, 0.01, 0.5, executor='gpu');
+		with self.assertRaises(ValueError): odesolvers.ThetaMethod(stiffode, np.array([1.0, 2.0]), 0.0, 1.0, 0.01, 0.5, executor='thread', workers=0);
+
+
+class TestEnsemble(unittest.TestCase):
+	def setUp(self):
+		self.ivs = [np.array([1.0, 2.0]), np.array([-1.0, 0.5]), np.array([0.0, 3.0])];
+		self.refs = [odesolvers.ThetaMethod(multivariableode, iv, 0.0, 1.0, 0.01, 0.5, df=multivariableodeJ) for iv in self.ivs];
+
+	def testThreads(self):
+		ys = odesolvers.Ensemble(odesolvers.ThetaMethod, multivariableode, self.ivs, 0.0, 1.0, 0.01, 0.5, df=multivariableodeJ, workers=2);
+		self.assertEqual(len(ys), len(self.ivs));
+		for y, yref in zip(ys, self.refs):
+			np.testing.assert_array_equal(y, yref);
+
+	def testProcesses(self):
+		ys = odesolvers.Ensemble(odesolvers.ThetaMethod, multivariableode, self.ivs, 0.0, 1.0, 0.01, 0.5, df=multivariableodeJ, executor='process', workers=2);
+		for y, yref in zip(ys, self.refs):
+			np.testing.assert_array_equal(y, yref);
+
+	def testExecutor(self):
+		solver = partial(odesolvers.AB_AM_PECE2, ETOL=1.0e-6);
+		with ThreadPoolExecutor(2) as pool:
+			ys = odesolvers.Ensemble(solver, multivariableode, self.ivs, 0.0, 1.0, executor=pool);
+		for y, iv in zip(ys, self.ivs):
+			np.testing.assert_array_equal(y[0], solver(multivariableode, iv, 0.0, 1.0)[0]);
+
+
+if __name__ == '__main__':
+	unittest.main()
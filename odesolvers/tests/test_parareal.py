@@ -0,0 +1,78 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Test Parareal algorithm.
+#
+
+import unittest
+import numpy as np
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+
+import odesolvers
+
+from .test_helpers import *
+
+class TestParareal(unittest.TestCase):
+	def setUp(self):
+		# common initial and final time for all tests
+		self.t0 : np.float = 0.0;
+		self.tn : np.float = 8.0;
+		self.iv = np.array([1.0, 2.0]);
+		self.coarse = partial(odesolvers.ExplicitEulerSolver, h=0.25);
+		self.fine = partial(odesolvers.ThetaMethod, h=1/64, theta=0.5, df=multivariableodeJ, TOL=1.0e-10);
+
+	def testProcessPool(self):
+		y = odesolvers.Parareal(multivariableode, self.iv, self.t0, self.tn, self.coarse, self.fine, 8, workers=2);
+		yref = self.fine(multivariableode, self.iv, self.t0, self.tn);
+
+		self.assertEqual(y.shape, yref.shape);
+		np.testing.assert_allclose(y, yref, atol=1.0e-7);
+
+	def testExecutor(self):
+		with ThreadPoolExecutor(2) as pool:
+			y = odesolvers.Parareal(multivariableode, self.iv, self.t0, self.tn, self.coarse, self.fine, 8, executor=pool);
+		yref = self.fine(multivariableode, self.iv, self.t0, self.tn);
+
+		np.testing.assert_allclose(y, yref, atol=1.0e-7);
+
+	def testMaxIter(self):
+		# after k iterations, the first k slices are exact
+		# (not converged: the trajectory may be discontinuous at the slice boundaries, which is warned about)
+		with ThreadPoolExecutor(2) as pool:
+			with self.assertWarns(RuntimeWarning):
+				y = odesolvers.Parareal(multivariableode, self.iv, self.t0, self.tn, self.coarse, self.fine, 8, maxiter=2, executor=pool);
+		yref = self.fine(multivariableode, self.iv, self.t0, self.tn);
+
+		np.testing.assert_allclose(y[:2*64+1], yref[:2*64+1], atol=1.0e-12);
+
+	def testSliceBoundaries(self):
+		# slices of 20 steps of 0.01, whose length 0.2 is rounded (ceil((tb-ta)/h) = 21 with linspace boundaries)
+		fine = partial(odesolvers.ThetaMethod, h=0.01, theta=0.5, df=multivariableodeJ, TOL=1.0e-10);
+		coarse = partial(odesolvers.ExplicitEulerSolver, h=0.1);
+		with ThreadPoolExecutor(2) as pool:
+			y = odesolvers.Parareal(multivariableode, self.iv, 0.0, 1.0, coarse, fine, 5, executor=pool);
+		yref = fine(multivariableode, self.iv, 0.0, 1.0);
+
+		self.assertEqual(y.shape, (101, self.iv.size));
+		np.testing.assert_allclose(y, yref, atol=1.0e-7);
+
+		# the fine stepsize must divide the slices
+		with self.assertRaises(ValueError): odesolvers.Parareal(multivariableode, self.iv, 0.0, 1.0, coarse, fine, 3, executor='thread');
+		with self.assertRaises(ValueError): odesolvers.Parareal(multivariableode, self.iv, 0.0, 1.0, coarse, fine, 5, executor='thread', h=0.03);
+
+	def testErrorHandling(self):
+		# time flowing negatively
+		with self.assertRaises(ValueError): odesolvers.Parareal(multivariableode, self.iv, self.tn, self.t0, self.coarse, self.fine, 8);
+		# no time slices
+		with self.assertRaises(ValueError): odesolvers.Parareal(multivariableode, self.iv, self.t0, self.tn, self.coarse, self.fine, 0);
+		# Negative numerical tolerance
+		with self.assertRaises(ValueError): odesolvers.Parareal(multivariableode, self.iv, self.t0, self.tn, self.coarse, self.fine, 8, TOL=-0.1);
+
+
+if __name__ == '__main__':
+	unittest.main()
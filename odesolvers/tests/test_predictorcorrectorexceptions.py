@@ -36,6 +36,8 @@ class TestAB_AM_PECE2Exceptions(unittest.TestCase):
 		with self.assertRaises(ValueError): odesolvers.AB_AM_PECE2(stableode, iv, self.tn, self.t0, 0.1);
 		# Negative numerical tolerance
 		with self.assertRaises(ValueError): odesolvers.AB_AM_PECE2(stableode, iv, self.t0, self.tn, 0.1, ETOL=-0.1);
+		# Non-positive number of steps between checkpoints
+		with self.assertRaises(ValueError): odesolvers.AB_AM_PECE2(stableode, iv, self.t0, self.tn, 0.1, checkpoint='checkpoint.npz', checkpointevery=0);
 
 
 if __name__ == '__main__':
@@ -0,0 +1,141 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Test the Runge-Kutta-Chebyshev method.
+#
+
+import unittest
+import numpy as np
+
+import odesolvers
+from odesolvers._rkc import _RKC_coefficients, _RKC_stages, _spectralradius
+
+from .test_helpers import *
+
+class TestRKC(unittest.TestCase):
+	def setUp(self):
+		# heat equation x' = x_ss on (0,1) with homogeneous Dirichlet boundary conditions
+		self.n = 100;
+		dx = 1.0/(self.n + 1);
+		self.s = dx*np.arange(1, self.n + 1);
+		self.L = odesolvers.FDOperator([-1, 0, 1], odesolvers.FDWeights([-1, 0, 1], 2, dx), self.n, dx, left=('dirichlet', 0.0), right=('dirichlet', 0.0));
+		self.rho = 4/dx**2*np.sin(self.n*np.pi/(2*(self.n + 1)))**2;	# spectral radius of L
+		self.calls = 0;
+		self.t0 : np.float = 0.0;
+		self.tn : np.float = 0.2;
+		self.iv = np.sin(np.pi*self.s) + 0.5*np.sin(4*np.pi*self.s);
+
+	def heat(self, t, x):
+		self.calls += 1;
+		return self.L(t, x);
+
+	def exact(self, t):
+		# exact solution of the semi-discretized problem, the sine modes being eigenvectors of L
+		dx = self.s[0];
+		lam = lambda k: -4/dx**2*np.sin(k*np.pi*dx/2)**2;
+		return np.exp(lam(1)*t)*np.sin(np.pi*self.s) + 0.5*np.exp(lam(4)*t)*np.sin(4*np.pi*self.s);
+
+	def testCoefficients(self):
+		for s in [2, 3, 10, 100]:
+			beta = _RKC_coefficients(s)[-1];
+			R = lambda z: _RKC_stages(lambda t, x: z*x, np.ones(1), 0.0, 1.0, s, np.array([z]))[0];
+
+			# second order, stable on [-beta, 0], beta ~ 0.653 s^2
+			self.assertAlmostEqual((R(1.0e-3) - R(-1.0e-3))/2.0e-3, 1.0, places=6);
+			self.assertAlmostEqual((R(1.0e-3) - 2*R(0.0) + R(-1.0e-3))/1.0e-6, 1.0, places=3);
+			self.assertLessEqual(max(abs(R(z)) for z in np.linspace(-beta, 0.0, 1001)), 1.0 + 1.0e-12);
+			self.assertGreater(beta, (0.49 if s == 2 else 0.58)*s**2);
+			self.assertAlmostEqual(_RKC_coefficients(s)[4][s], 1.0, places=12);
+
+	def testOrder(self):
+		# fixed number of stages and stepsize, non-autonomous problem x' = -x + cos(t)
+		f = lambda t, x: -x + np.cos(t);
+		exact = lambda t: 0.5*(np.cos(t) + np.sin(t)) + 0.5*np.exp(-t);
+		errors = [];
+		for N in [20, 40]:
+			h = 1.0/N;
+			x = np.ones(1);
+			for i in range(N):
+				x = _RKC_stages(f, x, i*h, h, 5, f(i*h, x));
+			errors.append(abs(x[0] - exact(1.0)));
+		self.assertAlmostEqual(np.log2(errors[0]/errors[1]), 2.0, delta=0.1);
+
+	def testSpectralRadius(self):
+		fi = self.heat(0.0, self.iv);
+		rho, v = _spectralradius(self.heat, 0.0, self.iv, fi);
+		self.assertGreaterEqual(rho, self.rho);
+		self.assertLess(rho, 1.3*self.rho);
+
+		# warm start from the dominant direction
+		self.calls = 0;
+		rho2, _ = _spectralradius(self.heat, 0.0, self.iv, fi, v);
+		self.assertLessEqual(self.calls, 3);
+		self.assertAlmostEqual(rho2/rho, 1.0, delta=0.02);
+
+		self.assertEqual(_spectralradius(constantode, 0.0, np.ones(1), constantode(0.0, np.ones(1)))[0], 0.0);
+
+	def testHeat(self):
+		# accuracy, with steps far beyond the stability limit of explicit Euler (2/rho), using f only
+		for ETOL, errmax in [(1.0e-4, 1.0e-3), (1.0e-6, 1.0e-5)]:
+			self.calls = 0;
+			y, hi = odesolvers.RKCSolver(self.heat, self.iv, self.t0, self.tn, ETOL=ETOL, solution=True);
+			self.assertEqual(y.t[-1], self.tn);
+			self.assertLess(np.max(np.abs(y[-1] - self.exact(self.tn))), errmax);
+			self.assertGreater(np.max(hi), 50*2/self.rho);
+			self.assertLess(self.calls, 0.5*self.rho*(self.tn - self.t0)/2);
+
+		# given spectral radius, constant or function
+		for rho in [1.2*self.rho, lambda t, x: 1.2*self.rho]:
+			y, _ = odesolvers.RKCSolver(self.heat, self.iv, self.t0, self.tn, 1.0e-4, ETOL=1.0e-6, rho=rho);
+			self.assertLess(np.max(np.abs(y[-1] - self.exact(self.tn))), 1.0e-5);
+
+		# tolerances
+		y, _ = odesolvers.RKCSolver(self.heat, self.iv, self.t0, self.tn, rtol=1.0e-6, atol=1.0e-8);
+		self.assertLess(np.max(np.abs(y[-1] - self.exact(self.tn))), 1.0e-5);
+
+	def testStages(self):
+		# the maximum number of stages limits the stepsize
+		y, hi = odesolvers.RKCSolver(self.heat, self.iv, self.t0, self.tn, ETOL=1.0e-2, rho=1.2*self.rho, smax=5);
+		self.assertLessEqual(np.max(hi[1:]), (4**2 - 1)/(1.54*1.2*self.rho) + 1.0e-15);
+		self.assertLess(np.max(np.abs(y[-1] - self.exact(self.tn))), 1.0e-2);
+
+	def testNonStiff(self):
+		y, hi = odesolvers.RKCSolver(stableode, np.array([1.0]), 0.0, 1.0, ETOL=1.0e-8);
+		np.testing.assert_allclose(y[-1], np.exp(-1.0), rtol=1.0e-5);
+
+		y, hi = odesolvers.RKCSolver(multivariableode, np.array([1.0, 2.0]), 0.0, 1.0, ETOL=1.0e-7, controller=odesolvers.IController());
+		yref, _ = odesolvers.ExtrapolationSolver(multivariableode, np.array([1.0, 2.0]), 0.0, 1.0);
+		np.testing.assert_allclose(y[-1], yref[-1], rtol=1.0e-4);
+
+	def testArrays(self):
+		# by default the states and stepsizes are arrays trimmed to the steps (not retaining the growth buffer)
+		sol, hiref = odesolvers.RKCSolver(self.heat, self.iv, self.t0, self.tn, ETOL=1.0e-4, solution=True);
+		y, hi = odesolvers.RKCSolver(self.heat, self.iv, self.t0, self.tn, ETOL=1.0e-4);
+
+		self.assertIs(type(y), np.ndarray);
+		self.assertIsNone(y.base);
+		self.assertIsNone(hi.base);
+		np.testing.assert_array_equal(y, sol);
+		np.testing.assert_array_equal(hi, hiref);
+
+	def testErrorHandling(self):
+		with self.assertRaises(ValueError):
+			odesolvers.RKCSolver(self.heat, self.iv, self.t0, self.tn, -0.1);
+		with self.assertRaises(ValueError):
+			odesolvers.RKCSolver(self.heat, self.iv, self.tn, self.t0);
+		with self.assertRaises(ValueError):
+			odesolvers.RKCSolver(self.heat, self.iv, self.t0, self.tn, ETOL=0.0);
+		with self.assertRaises(ValueError):
+			odesolvers.RKCSolver(self.heat, self.iv, self.t0, self.tn, rhoevery=0);
+		with self.assertRaises(ValueError):
+			odesolvers.RKCSolver(self.heat, self.iv, self.t0, self.tn, smax=2);
+		with self.assertRaises(ValueError):
+			odesolvers.RKCSolver(self.heat, self.iv, self.t0, self.tn, rho=-1.0);
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,140 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Test the Rosenbrock method ROS34PW2.
+#
+
+import unittest
+import numpy as np
+
+import odesolvers
+from odesolvers._rosenbrock import _Rosenbrock_stages
+
+from .test_helpers import *
+
+def stiffodeexact(t, iv):
+	"""Function containing the exact solution of stiffode.
+	"""
+	return np.array([iv[0]*np.exp(-t), np.sin(t) + iv[1]*np.exp(-100*t)]);
+
+def vanderpol(t, x):
+	"""Function containing Van der Pol's equation with eta = 10.
+	"""
+	return np.array([x[1], 10*((1 - x[0]*x[0])*x[1] - x[0])]);
+
+def vanderpolJ(t, x):
+	"""Function containing the Jacobian of vanderpol.
+	"""
+	return np.array([[0.0, 1.0], [10*(-2*x[0]*x[1] - 1), 10*(1 - x[0]*x[0])]]);
+
+class TestRosenbrock(unittest.TestCase):
+	def setUp(self):
+		# common initial and final time for all tests
+		self.t0 : np.float = 0.0;
+		self.tn : np.float = 2.0;
+		self.iv = np.array([1.0, 2.0]);
+		self.calls = 0;
+
+	def counted(self, df):
+		def J(t, x):
+			self.calls += 1;
+			return df(t, x);
+		return J;
+
+	def testOrder(self):
+		# fixed stepsize on a non-autonomous problem (df/dt by finite differences): order 3, embedded order 2
+		f = lambda t, x: np.array([-2*x[0] + np.sin(3*t), -x[1]**2]);
+		J = lambda t, x: np.array([[-2.0, 0.0], [0.0, -2*x[1]]]);
+		exact = lambda t: np.array([(1 + 3/13)*np.exp(-2*t) + (2*np.sin(3*t) - 3*np.cos(3*t))/13, 1/(1 + t)]);
+
+		def step(x, t, h):
+			fi = f(t, x);
+			dt = 1.0e-8;
+			return _Rosenbrock_stages(f, J(t, x), (f(t + dt, x) - fi)/dt, x, t, h, fi);
+
+		errors, local = [], [];
+		for N in [20, 40]:
+			h = 1.0/N;
+			x = np.ones(2);
+			for i in range(N):
+				x, _ = step(x, i*h, h);
+			errors.append(np.max(np.abs(x - exact(1.0))));
+			x, est = step(np.ones(2), 0.0, h);
+			local.append(np.max(np.abs(x - est - exact(h))));
+		self.assertAlmostEqual(np.log2(errors[0]/errors[1]), 3.0, delta=0.15);
+		self.assertAlmostEqual(np.log2(local[0]/local[1]), 3.0, delta=0.25);
+
+	def testStability(self):
+		# A-stability: |R(z)| <= 1 on the negative real axis and on the imaginary axis
+		def R(z):
+			x, _ = _Rosenbrock_stages(lambda t, x: z*x, np.array([[z]]), np.zeros(1, complex), np.ones(1, complex), 0.0, 1.0, np.array([z]));
+			return abs(x[0]);
+		for z in [-1.0e-2, -1.0, -10.0, -1.0e3, -1.0e8] + [1j*y for y in [1.0e-2, 0.5, 1.0, 10.0, 1.0e3, 1.0e8]]:
+			self.assertLessEqual(R(z), 1.0 + 1.0e-12);
+
+	def testStiff(self):
+		for ETOL in [1.0e-4, 1.0e-7]:
+			self.calls = 0;
+			y, hi = odesolvers.RosenbrockSolver(stiffode, self.iv, self.t0, self.tn, ETOL=ETOL, df=self.counted(stiffodeJ), solution=True);
+			self.assertEqual(y.t[-1], self.tn);
+			np.testing.assert_allclose(y[-1], stiffodeexact(self.tn, self.iv), atol=10*ETOL);
+			self.assertEqual(self.calls, y.stats['nsteps']);		# one Jacobian per step
+
+		y, hi = odesolvers.RosenbrockSolver(stiffode, self.iv, self.t0, self.tn, df=stiffodeJ, rtol=1.0e-6, atol=1.0e-8);
+		np.testing.assert_allclose(y[-1], stiffodeexact(self.tn, self.iv), atol=1.0e-5);
+
+	def testVanderpol(self):
+		yref, _ = odesolvers.ExtrapolationSolver(vanderpol, np.array([2.0, 0.0]), 0.0, 10.0, ETOL=1.0e-12, df=vanderpolJ, linearlyimplicit=True);
+
+		self.calls = 0;
+		y, hi = odesolvers.RosenbrockSolver(vanderpol, np.array([2.0, 0.0]), 0.0, 10.0, ETOL=1.0e-5, df=self.counted(vanderpolJ), controller=odesolvers.GustafssonController(), solution=True);
+		np.testing.assert_allclose(y[-1], yref[-1], atol=1.0e-3);
+		self.assertEqual(self.calls, y.stats['nsteps']);
+
+		# fewer Jacobian evaluations than the trapezoidal rule (Newton) for a similar accuracy
+		self.calls = 0;
+		ytheta = odesolvers.ThetaMethod(vanderpol, np.array([2.0, 0.0]), 0.0, 10.0, 1.0e-3, 0.5, self.counted(vanderpolJ), rtol=1.0e-8, atol=1.0e-10);
+		self.assertLess(np.max(np.abs(y[-1] - yref[-1])), np.max(np.abs(ytheta[-1] - yref[-1])));
+		self.assertGreater(self.calls, 10*y.stats['nsteps']);
+
+	def testFormats(self):
+		# heat equation: banded and sparse Jacobians
+		n = 50;
+		dx = 1.0/(n + 1);
+		L = odesolvers.FDOperator([-1, 0, 1], odesolvers.FDWeights([-1, 0, 1], 2, dx), n, dx, left=('dirichlet', 0.0), right=('dirichlet', 0.0));
+		iv = np.sin(np.pi*dx*np.arange(1, n + 1));
+
+		ydense, _ = odesolvers.RosenbrockSolver(L, iv, 0.0, 0.1, df=lambda t, x: L.matrix.toarray());
+		for df in [L.jacobian, lambda t, x: L.matrix]:
+			y, _ = odesolvers.RosenbrockSolver(L, iv, 0.0, 0.1, df=df);
+			np.testing.assert_allclose(y, ydense, atol=1.0e-12);
+		np.testing.assert_allclose(ydense[-1], iv*np.exp(-4/dx**2*np.sin(np.pi*dx/2)**2*0.1), atol=1.0e-5);
+
+	def testArrays(self):
+		# by default the states and stepsizes are arrays trimmed to the steps (not retaining the growth buffer)
+		sol, hiref = odesolvers.RosenbrockSolver(stiffode, self.iv, self.t0, self.tn, df=stiffodeJ, solution=True);
+		y, hi = odesolvers.RosenbrockSolver(stiffode, self.iv, self.t0, self.tn, df=stiffodeJ);
+
+		self.assertIs(type(y), np.ndarray);
+		self.assertIsNone(y.base);
+		self.assertIsNone(hi.base);
+		np.testing.assert_array_equal(y, sol);
+		np.testing.assert_array_equal(hi, hiref);
+
+	def testErrorHandling(self):
+		with self.assertRaises(ValueError):
+			odesolvers.RosenbrockSolver(stiffode, self.iv, self.t0, self.tn, -0.1, df=stiffodeJ);
+		with self.assertRaises(ValueError):
+			odesolvers.RosenbrockSolver(stiffode, self.iv, self.tn, self.t0, df=stiffodeJ);
+		with self.assertRaises(ValueError):
+			odesolvers.RosenbrockSolver(stiffode, self.iv, self.t0, self.tn, ETOL=0.0, df=stiffodeJ);
+		with self.assertRaises(NotImplementedError):
+			odesolvers.RosenbrockSolver(stiffode, self.iv, self.t0, self.tn);
+
+
+if __name__ == '__main__':
+	unittest.main()
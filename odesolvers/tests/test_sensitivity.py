@@ -0,0 +1,71 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Test forward sensitivity analysis of the theta method.
+#
+
+import unittest
+import numpy as np
+
+import odesolvers
+
+# Lotka-Volterra equations with parameters p = (a, b)
+def lotkavolterra(p):
+	a, b = p;
+	f = lambda t, x: np.array([a*x[0] - x[0]*x[1], -b*x[1] + x[0]*x[1]]);
+	df = lambda t, x: np.array([[a - x[1], -x[0]], [x[1], -b + x[0]]]);
+	dfp = lambda t, x: np.array([[x[0], 0.0], [0.0, -x[1]]]);
+	return f, df, dfp;
+
+
+class TestThetaMethodSensitivity(unittest.TestCase):
+	def setUp(self):
+		# common initial and final time for all tests
+		self.t0 : np.float = 0.0;
+		self.tn : np.float = 2.0;
+		self.h : np.float = 0.01;
+		self.iv = np.array([1.0, 0.5]);
+		self.p = np.array([1.1, 0.4]);
+
+	def finiteDifferences(self, theta, eps = 1.0e-6):
+		S = [];
+		for k in range(self.p.size):
+			dp = np.zeros(self.p.size);
+			dp[k] = eps;
+			fplus, dfplus, _ = lotkavolterra(self.p + dp);
+			fminus, dfminus, _ = lotkavolterra(self.p - dp);
+			xplus = odesolvers.ThetaMethod(fplus, self.iv, self.t0, self.tn, self.h, theta, dfplus, TOL=1.0e-13);
+			xminus = odesolvers.ThetaMethod(fminus, self.iv, self.t0, self.tn, self.h, theta, dfminus, TOL=1.0e-13);
+			S.append((xplus - xminus)/(2*eps));
+		return np.stack(S, axis=-1);
+
+	def testAgainstFiniteDifferences(self):
+		f, df, dfp = lotkavolterra(self.p);
+		for theta in [0.0, 0.5, 1.0]:
+			x, S = odesolvers.ThetaMethodSensitivity(f, self.iv, self.t0, self.tn, self.h, theta, df, dfp, TOL=1.0e-13);
+
+			self.assertEqual(S.shape, (x.shape[0], 2, 2));
+			np.testing.assert_allclose(x, odesolvers.ThetaMethod(f, self.iv, self.t0, self.tn, self.h, theta, df, TOL=1.0e-13), atol=1.0e-12);
+			np.testing.assert_allclose(S, self.finiteDifferences(theta), atol=1.0e-6);
+
+	def testInitialSensitivities(self):
+		# linear decay x' = -p x with x(0) = p: x(t) = p exp(-p t), dx/dp = (1 - p t) exp(-p t)
+		p = 0.7;
+		x, S = odesolvers.ThetaMethodSensitivity(lambda t, x: -p*x, np.array([p]), 0.0, 1.0, 0.001, 0.5,
+													lambda t, x: np.array([[-p]]), lambda t, x: -x, S0=np.array([[1.0]]));
+
+		np.testing.assert_allclose(S[-1,0,0], (1 - p)*np.exp(-p), atol=1.0e-6);
+
+	def testErrorHandling(self):
+		f, df, dfp = lotkavolterra(self.p);
+		with self.assertRaises(NotImplementedError): odesolvers.ThetaMethodSensitivity(f, self.iv, self.t0, self.tn, self.h, 0.5, df, None);
+		with self.assertRaises(ValueError): odesolvers.ThetaMethodSensitivity(f, self.iv, self.t0, self.tn, -self.h, 0.5, df, dfp);
+		with self.assertRaises(ValueError): odesolvers.ThetaMethodSensitivity(f, self.iv, self.t0, self.tn, self.h, 1.5, df, dfp);
+
+
+if __name__ == '__main__':
+	unittest.main()
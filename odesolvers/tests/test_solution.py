@@ -0,0 +1,122 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Test the solution object returned by the solvers.
+#
+
+import unittest
+import numpy as np
+
+import odesolvers
+
+from .test_helpers import *
+
+class TestODESolution(unittest.TestCase):
+	def setUp(self):
+		# common initial and final time for all tests
+		self.t0 : np.float = 1.0;
+		self.tn : np.float = 3.0;
+		self.h : np.float = 0.01;
+		self.iv = np.array([1.0, 2.0]);
+		self.yref = odesolvers.ThetaMethod(multivariableode, self.iv, self.t0, self.tn, self.h, 0.5, multivariableodeJ);
+
+	def testThetaMethod(self):
+		sol = odesolvers.ThetaMethod(multivariableode, self.iv, self.t0, self.tn, self.h, 0.5, multivariableodeJ, solution=True);
+
+		self.assertIsInstance(sol, odesolvers.ODESolution);
+		np.testing.assert_array_equal(sol, self.yref);
+		self.assertEqual(sol.t.shape, (self.yref.shape[0],));
+		np.testing.assert_allclose(sol.t, self.t0 + self.h*np.arange(self.yref.shape[0]), atol=1.0e-12);
+		self.assertEqual(sol.stats['nsteps'], self.yref.shape[0] - 1);
+		self.assertEqual(sol.stats['hmax'], self.h);
+
+	def testFloat32(self):
+		# the steps are computed in float64, only the storage is rounded
+		sol = odesolvers.ThetaMethod(multivariableode, self.iv, self.t0, self.tn, self.h, 0.5, multivariableodeJ, solution=True, dtype=np.float32);
+
+		self.assertEqual(sol.dtype, np.float32);
+		np.testing.assert_array_equal(sol, self.yref.astype(np.float32));
+
+	def testComponentLayout(self):
+		sol = odesolvers.ThetaMethod(multivariableode, self.iv, self.t0, self.tn, self.h, 0.5, multivariableodeJ, solution=True, layout='component');
+
+		self.assertEqual(sol.layout, 'component');
+		np.testing.assert_array_equal(sol, self.yref);
+		for j in range(self.iv.size):
+			c = sol.component(j);
+			self.assertTrue(c.flags['C_CONTIGUOUS']);
+			self.assertTrue(np.shares_memory(c, sol._x));
+			np.testing.assert_array_equal(c, self.yref[:,j]);
+
+	def testPredictorCorrector(self):
+		sol, hi = odesolvers.AB_AM_PECE2(multivariableode, self.iv, self.t0, self.tn, solution=True);
+
+		np.testing.assert_array_equal(sol.h, hi[:,0]);
+		self.assertEqual(sol.t[0], self.t0);
+		self.assertEqual(sol.t[-1], sol._state['tcount'].item());
+		self.assertGreaterEqual(sol.stats['hmax'], sol.stats['hmin']);
+
+		# the cached times follow the continuation
+		odesolvers.AB_AM_PECE2_continue(multivariableode, sol, 4.0);
+		self.assertEqual(sol.t.size, len(sol));
+		self.assertEqual(sol.t[-1], sol._state['tcount'].item());
+
+	def testArrayBehaviour(self):
+		# by default AB_AM_PECE2 returns arrays, trimmed to the steps (not retaining the growth buffer)
+		y, hi = odesolvers.AB_AM_PECE2(multivariableode, self.iv, self.t0, self.tn);
+		self.assertIs(type(y), np.ndarray);
+		self.assertIsNone(y.base);
+		self.assertEqual(hi.shape, (len(y), 1));
+
+		# arithmetic, attributes and NumPy functions as on the array of the states, for the ODESolution too
+		sol, _ = odesolvers.AB_AM_PECE2(multivariableode, self.iv, self.t0, self.tn, solution=True);
+		for y in [y, sol]:
+			x = np.array(y);
+			np.testing.assert_array_equal(y - 1.0, x - 1.0);
+			np.testing.assert_array_equal(2*y + y, 3*x);
+			np.testing.assert_array_equal(y.T, x.T);
+			self.assertEqual(y.shape, (len(x), self.iv.size));
+			self.assertEqual(y.size, x.size);
+			self.assertEqual(y.ndim, 2);
+			self.assertEqual(np.max(np.abs(y)), np.max(np.abs(x)));
+			self.assertIs(type(y - 1.0), np.ndarray);
+
+	def testStorageAllSolvers(self):
+		# reduced precision and component-major storage with every solver, the steps being computed in float64
+		solvers = [lambda **kw: odesolvers.AB_AM_PECE2(multivariableode, self.iv, self.t0, self.tn, solution=True, **kw)[0],
+					lambda **kw: odesolvers.GBSSolver(multivariableode, self.iv, self.t0, self.tn, ETOL=1.0e-8, solution=True, **kw)[0],
+					lambda **kw: odesolvers.LinearlyImplicitExtrapolationSolver(stiffode, self.iv, self.t0, self.tn, ETOL=1.0e-6, df=stiffodeJ, solution=True, **kw)[0],
+					lambda **kw: odesolvers.RKCSolver(multivariableode, self.iv, self.t0, self.tn, solution=True, **kw)[0],
+					lambda **kw: odesolvers.RosenbrockSolver(stiffode, self.iv, self.t0, self.tn, df=stiffodeJ, solution=True, **kw)[0]];
+		for solver in solvers:
+			ref = solver();
+			sol = solver(dtype=np.float32, layout='component');
+
+			self.assertEqual(sol.dtype, np.float32);
+			self.assertEqual(sol.layout, 'component');
+			self.assertTrue(sol.component(1).flags['C_CONTIGUOUS']);
+			np.testing.assert_array_equal(sol, np.asarray(ref).astype(np.float32));
+			np.testing.assert_array_equal(sol.h, ref.h);
+
+		# arrays keep the layout too
+		y, hi = odesolvers.AB_AM_PECE2(multivariableode, self.iv, self.t0, self.tn, layout='component');
+		self.assertTrue(y[:,0].flags['C_CONTIGUOUS']);
+
+	def testFixedStepTimes(self):
+		# the times of fixed steps are t0 + i h, not accumulated
+		h : np.float = 0.1;
+		for sol in [odesolvers.ThetaMethod(multivariableode, self.iv, self.t0, self.tn, h, 0.5, multivariableodeJ, solution=True),
+					odesolvers.AB_AM_PECE2(multivariableode, self.iv, self.t0, self.tn, h, solution=True)[0]]:
+			np.testing.assert_array_equal(sol.t, self.t0 + h*np.arange(len(sol)));
+
+	def testErrorHandling(self):
+		with self.assertRaises(ValueError): odesolvers.ThetaMethod(multivariableode, self.iv, self.t0, self.tn, self.h, 0.5, multivariableodeJ, dtype=int);
+		with self.assertRaises(ValueError): odesolvers.ThetaMethod(multivariableode, self.iv, self.t0, self.tn, self.h, 0.5, multivariableodeJ, layout='row');
+
+
+if __name__ == '__main__':
+	unittest.main()
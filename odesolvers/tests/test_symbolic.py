@@ -0,0 +1,84 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Test symbolic front end.
+#
+
+import unittest
+import numpy as np
+
+import odesolvers
+
+from .test_helpers import *
+
+try:
+	import sympy
+except ImportError:
+	sympy = None
+
+@unittest.skipIf(sympy is None, 'sympy not installed')
+class TestSymbolicODE(unittest.TestCase):
+	def setUp(self):
+		self.t, self.x1, self.x2 = sympy.symbols('t x1 x2');
+
+	def testLotkaVolterra(self):
+		a, b = sympy.symbols('a b');
+		x1, x2 = self.x1, self.x2;
+		f, df = odesolvers.SymbolicODE([a*x1 - b*x1*x2, -x2 + b*x1*x2], [x1, x2], params={a: 0.25, b: 0.01});
+
+		x = np.array([10.0, 20.0]);
+		np.testing.assert_allclose(f(0.0, x), [0.25*10 - 0.01*200, -20 + 0.01*200]);
+		np.testing.assert_allclose(df(0.0, x), [[0.25 - 0.01*20, -0.01*10], [0.01*20, -1 + 0.01*10]]);
+
+	def testStiffODE(self):
+		t, x1, x2 = self.t, self.x1, self.x2;
+		f, df = odesolvers.SymbolicODE([-x1, -100*(x2 - sympy.sin(t)) + sympy.cos(t)], [x1, x2], t);
+
+		x = np.array([1.0, 2.0]);
+		for ti in [0.0, 0.3]:
+			np.testing.assert_allclose(f(ti, x), stiffode(ti, x));
+			np.testing.assert_array_equal(df(ti, x), stiffodeJ(ti, x));
+
+		# constant Jacobian: every call must return a fresh array
+		J = df(0.0, x);
+		J[0,0] = 5.0;
+		self.assertEqual(df(0.0, x)[0,0], -1.0);
+
+	def testBatch(self):
+		x1, x2 = self.x1, self.x2;
+		f, df = odesolvers.SymbolicODE([-x1 + x2, -x2*x1], [x1, x2], batch=True);
+
+		X = np.array([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]]);
+		F = f(0.0, X);
+		J = df(0.0, X);
+
+		self.assertEqual(F.shape, (3,2));
+		self.assertEqual(J.shape, (3,2,2));
+		for k in range(3):
+			np.testing.assert_allclose(F[k], [-X[k,0] + X[k,1], -X[k,0]*X[k,1]]);
+			np.testing.assert_allclose(J[k], [[-1, 1], [-X[k,1], -X[k,0]]]);
+
+	def testThetaMethod(self):
+		x1, x2 = self.x1, self.x2;
+		f, df = odesolvers.SymbolicODE([-x1 + x2, -x2], [x1, x2]);
+
+		iv = np.array([1.0, 2.0]);
+		y = odesolvers.ThetaMethod(f, iv, 0.0, 0.3, 0.01, 0.5, df);
+		yref = odesolvers.ThetaMethod(multivariableode, iv, 0.0, 0.3, 0.01, 0.5, multivariableodeJ);
+
+		np.testing.assert_allclose(y, yref);
+
+	def testErrorHandling(self):
+		x1, x2 = self.x1, self.x2;
+		# wrong number of expressions
+		with self.assertRaises(ValueError): odesolvers.SymbolicODE([-x1], [x1, x2]);
+		# unknown parameter
+		with self.assertRaises(ValueError): odesolvers.SymbolicODE([-sympy.Symbol('k')*x1], [x1]);
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,95 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Test symplectic integrators (Stormer-Verlet and compositions).
+#
+
+import unittest
+import numpy as np
+
+import odesolvers
+
+from .test_helpers import *
+
+def kepler(t, q):
+	"""Function containing the acceleration of the Kepler problem q'' = -q/|q|^3.
+	"""
+	return -q/np.linalg.norm(q)**3;
+
+def keplerenergy(q, v):
+	"""Function containing the energy of the Kepler problem, at all the steps.
+	"""
+	return 0.5*np.sum(v*v, axis=1) - 1/np.linalg.norm(q, axis=1);
+
+class TestSymplectic(unittest.TestCase):
+	def setUp(self):
+		# Kepler problem with eccentricity 0.5, of period 2 pi
+		self.t0 : np.float = 0.0;
+		self.tn : np.float = 2*np.pi;
+		self.q0 = np.array([0.5, 0.0]);
+		self.v0 = np.array([0.0, np.sqrt(3.0)]);
+
+	def testOrder(self):
+		for order in [2, 4, 6]:
+			errors = [];
+			for N in [200, 400]:
+				q, v = odesolvers.SymplecticComposition(kepler, self.q0, self.v0, self.t0, self.tn, self.tn/N, order);
+				errors.append(np.linalg.norm(q[-1] - self.q0) + np.linalg.norm(v[-1] - self.v0));
+			self.assertAlmostEqual(np.log2(errors[0]/errors[1]), order, delta=0.1);
+
+		q, v = odesolvers.SymplecticComposition(kepler, self.q0, self.v0, self.t0, self.tn, self.tn/200, 8);
+		self.assertLess(np.linalg.norm(q[-1] - self.q0), 1.0e-7);
+
+	def testStormerVerlet(self):
+		h : np.float = 0.1;
+		q, v = odesolvers.StormerVerlet(lambda t, q: -q, np.array([1.0]), np.array([0.0]), self.t0, 1.0, h);
+		t = np.arange(q.shape[0])*h;
+
+		np.testing.assert_allclose(q[:,0], np.cos(t), atol=1.0e-2);
+		np.testing.assert_allclose(v[:,0], -np.sin(t), atol=1.0e-2);
+		# one step by hand
+		self.assertAlmostEqual(q[1,0], 1.0 - h*h/2);
+		self.assertAlmostEqual(v[1,0], -h/2*(1.0 + (1.0 - h*h/2)));
+
+	def testEnergy(self):
+		# 1000 periods: the energy error of Stormer-Verlet stays bounded
+		h : np.float = self.tn/100;
+		q, v = odesolvers.StormerVerlet(kepler, self.q0, self.v0, self.t0, 1000*self.tn, h);
+		E = keplerenergy(q, v);
+		self.assertLess(np.max(np.abs(E - E[0])), 1.0e-2);
+		self.assertLess(np.max(np.abs(E[-1000:] - E[0])), 2*np.max(np.abs(E[:1000] - E[0])));
+
+		# while the first-order system with Explicit Euler drifts away within a few periods
+		f = lambda t, x: np.concatenate((x[2:], kepler(t, x[:2])));
+		x = odesolvers.ExplicitEulerSolver(f, np.concatenate((self.q0, self.v0)), self.t0, 10*self.tn, h);
+		self.assertGreater(abs(keplerenergy(x[-1:,:2], x[-1:,2:])[0] - E[0]), 0.1);
+
+	def testReversibility(self):
+		q, v = odesolvers.SymplecticComposition(kepler, self.q0, self.v0, self.t0, self.tn, self.tn/50, 4);
+		qb, vb = odesolvers.SymplecticComposition(kepler, q[-1], -v[-1], self.t0, self.tn, self.tn/50, 4);
+
+		np.testing.assert_allclose(qb[-1], self.q0, atol=1.0e-10);
+		np.testing.assert_allclose(vb[-1], -self.v0, atol=1.0e-10);
+
+	def testEvaluations(self):
+		for order, stages in [(2, 1), (4, 3), (6, 7), (8, 15)]:
+			count = [0];
+			def a(t, q):
+				count[0] += 1;
+				return kepler(t, q);
+			odesolvers.SymplecticComposition(a, self.q0, self.v0, self.t0, self.tn, self.tn/10, order);
+			self.assertEqual(count[0], 1 + 10*stages);
+
+	def testErrorHandling(self):
+		with self.assertRaises(ValueError): odesolvers.StormerVerlet(kepler, self.q0, self.v0, self.t0, self.tn, -0.1);
+		with self.assertRaises(ValueError): odesolvers.StormerVerlet(kepler, self.q0, self.v0, self.tn, self.t0, 0.1);
+		with self.assertRaises(ValueError): odesolvers.StormerVerlet(kepler, self.q0, np.zeros(3), self.t0, self.tn, 0.1);
+		with self.assertRaises(ValueError): odesolvers.SymplecticComposition(kepler, self.q0, self.v0, self.t0, self.tn, 0.1, 3);
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -10,6 +10,7 @@
 
 import unittest
 import numpy as np
+from scipy.sparse.linalg import LinearOperator
 
 import odesolvers
 
@@ -51,3 +52,44 @@ class TestThetaMethod(unittest.TestCase):
 		self.assertEqual(y[0,0],self.iv[0]);
 		self.assertEqual(y[0,1],self.iv[1]);
 		self.assertGreater(np.absolute(y[N,1]-y[0,1]),3);
+
+	def testJacobianFree(self):
+		h : np.float = 0.05;
+
+		y = odesolvers.ThetaMethod(stiffode, self.iv, self.t0, self.tn, h, self.theta, jacobianfree=True, TOL=1.0e-8);
+		yref = odesolvers.ThetaMethod(stiffode, self.iv, self.t0, self.tn, h, self.theta, stiffodeJ, TOL=1.0e-8);
+
+		np.testing.assert_allclose(y, yref, atol=1.0e-6);
+
+	def testJacobianFreePreconditioned(self):
+		# discretized heat equation, never forming the Jacobian
+		n : np.int = 100;
+		h : np.float = 0.01;
+
+		def heat(t, x):
+			xprime = -2*x;
+			xprime[1:] += x[:-1];
+			xprime[:-1] += x[1:];
+			return n*n*xprime;
+
+		# preconditioner: inverse of the diagonal of I - gamma*df
+		def precond(t, x, gamma):
+			return LinearOperator((n,n), matvec=lambda v: v/(1 + 2*gamma*n*n), dtype=float);
+
+		iv = np.sin(np.pi*np.linspace(0.0, 1.0, n+2)[1:-1]);
+		y = odesolvers.ThetaMethod(heat, iv, self.t0, 0.05, h, 0.5, jacobianfree=True, precond=precond);
+
+		self.assertEqual(y.shape, (6,n));
+		self.assertLess(np.max(np.abs(y[-1])), np.max(np.abs(iv)));
+		self.assertTrue(np.all(y[-1] >= -1.0e-6));
+
+		# static preconditioner (a LinearOperator, callable itself, is not a factory)
+		P = LinearOperator((n,n), matvec=lambda v: v/(1 + 2*0.5*h*n*n), dtype=float);
+		ystatic = odesolvers.ThetaMethod(heat, iv, self.t0, 0.05, h, 0.5, jacobianfree=True, precond=P);
+		np.testing.assert_array_equal(ystatic, y);
+
+		# GMRES not converging (singular preconditioner) is reported, not used silently
+		P = LinearOperator((n,n), matvec=lambda v: 0.0*v, dtype=float);
+		with self.assertRaises(ArithmeticError):
+			odesolvers.ThetaMethod(heat, iv, self.t0, 0.05, h, 0.5, jacobianfree=True, precond=P, maxhalvings=0);
+
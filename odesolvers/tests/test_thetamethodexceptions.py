@@ -40,6 +40,8 @@ class TestThetaMethodExceptions(unittest.TestCase):
 		with self.assertRaises(ValueError): odesolvers.ThetaMethod(stableode, iv, self.t0, self.tn, 0.1, 0.5, TOL=-0.1);
 		# Negative number of Newton iteration steps
 		with self.assertRaises(ValueError): odesolvers.ThetaMethod(stableode, iv, self.t0, self.tn, 0.1, 0.5, NEWTITER=-2);
+		# Non-positive number of steps between checkpoints
+		with self.assertRaises(ValueError): odesolvers.ThetaMethod(stableode, iv, self.t0, self.tn, 0.1, 1, checkpoint='checkpoint.npz', checkpointevery=0);
 		# Automatic differentiation
 		with self.assertRaises(NotImplementedError): odesolvers.ThetaMethod(stableode, iv, self.t0, self.tn, 0.1, 0);
 
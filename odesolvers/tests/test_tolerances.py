@@ -0,0 +1,109 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Test relative and absolute tolerances (weighted RMS norm).
+#
+
+import unittest
+import numpy as np
+
+import odesolvers
+from odesolvers._errornorm import _wrmsnorm
+
+from .test_helpers import *
+
+# multivariableode with the second component scaled by D (a power of 2, so that the scaling is exact)
+D = 2.0**14;
+
+def scaledode(t, x):
+	return multivariableode(t, x/np.array([1.0, D]))*np.array([1.0, D]);
+
+def scaledodeJ(t, x):
+	return multivariableodeJ(t, x)*np.array([[1.0, 1.0/D], [D, 1.0]]);
+
+class TestTolerances(unittest.TestCase):
+	def setUp(self):
+		# common initial and final time for all tests
+		self.t0 : np.float = 0.0;
+		self.tn : np.float = 5.0;
+		self.iv = np.array([1.0, 2.0]);
+		self.scale = np.array([1.0, D]);
+
+	def testNorm(self):
+		norm = _wrmsnorm(1.0e-3, np.array([1.0e-6, 1.0]), 2);
+		self.assertAlmostEqual(norm(np.array([1.0e-6, 0.0]), np.zeros(2), np.zeros(2)), np.sqrt(0.5));
+		self.assertAlmostEqual(norm(np.array([0.0, 1.0]), np.zeros(2), np.array([0.0, 1000.0])), np.sqrt(0.5)/2);
+		self.assertIsNone(_wrmsnorm(None, None, 2));
+
+		# the documented defaults when only one tolerance is given
+		v, x = np.array([1.0e-5, 2.0e-4]), np.array([0.5, 2.0]);
+		self.assertEqual(_wrmsnorm(1.0e-4, None, 2)(v, x, x), _wrmsnorm(1.0e-4, 1.0e-6, 2)(v, x, x));
+		self.assertEqual(_wrmsnorm(None, 1.0e-8, 2)(v, x, x), _wrmsnorm(1.0e-3, 1.0e-8, 2)(v, x, x));
+
+		with self.assertRaises(ValueError): _wrmsnorm(-1.0e-3, 1.0e-6, 2);
+		with self.assertRaises(ValueError): _wrmsnorm(1.0e-3, 0.0, 2);
+		with self.assertRaises(ValueError): _wrmsnorm(1.0e-3, np.ones(3), 2);
+
+	def testScaleInvariance(self):
+		# with per-component tolerances, the stepsizes do not depend on the units of the components
+		rtol, atol = 1.0e-4, np.array([1.0e-6, 1.0e-6*D]);
+		for solver, kwargs in [(odesolvers.AB_AM_PECE2, {}), (odesolvers.AB_AM_PECE2, {'controller': odesolvers.PIController()}),
+								(odesolvers.GBSSolver, {})]:
+			sol, hi = solver(multivariableode, self.iv, self.t0, self.tn, rtol=rtol, atol=atol[0], **kwargs);
+			ssol, shi = solver(scaledode, self.iv*self.scale, self.t0, self.tn, rtol=rtol, atol=atol, **kwargs);
+
+			np.testing.assert_array_equal(shi, hi);
+			np.testing.assert_array_equal(ssol, np.asarray(sol)*self.scale);
+
+		# while the single absolute tolerance over-resolves the large component
+		sol, hi = odesolvers.AB_AM_PECE2(multivariableode, self.iv, self.t0, self.tn);
+		ssol, shi = odesolvers.AB_AM_PECE2(scaledode, self.iv*self.scale, self.t0, self.tn);
+		self.assertGreater(len(ssol), len(sol));
+
+	def testAccuracy(self):
+		for rtol in [1.0e-4, 1.0e-8]:
+			sol, hi = odesolvers.GBSSolver(multivariableode, self.iv, self.t0, self.tn, rtol=rtol, atol=rtol, solution=True);
+			t = sol.t;
+			yex = np.stack([(1 + 2*t)*np.exp(-t), 2*np.exp(-t)], axis=1);
+			self.assertLess(np.max(np.abs(sol - yex)/(rtol + rtol*np.abs(yex))), 10.0);
+
+	def testNewton(self):
+		h : np.float = 0.01;
+		yref = odesolvers.ThetaMethod(multivariableode, self.iv, self.t0, self.tn, h, 0.5, multivariableodeJ, TOL=1.0e-12);
+
+		# an absolute tolerance below the roundoff of the large component cannot be met (nor by halving the step)
+		with self.assertRaises(ArithmeticError):
+			odesolvers.ThetaMethod(scaledode, self.iv*self.scale, self.t0, self.tn, h, 0.5, scaledodeJ, TOL=1.0e-12, maxhalvings=0);
+
+		y = odesolvers.ThetaMethod(scaledode, self.iv*self.scale, self.t0, self.tn, h, 0.5, scaledodeJ, rtol=1.0e-12, atol=1.0e-12*self.scale);
+		np.testing.assert_allclose(y/self.scale, yref, rtol=1.0e-10, atol=1.0e-12);
+
+	def testJacobianFree(self):
+		# the GMRES tolerance follows the weighted norm (the residuals of states of size 1e-10 being below any absolute 1e-3 TOL)
+		h : np.float = 0.05;
+		s = 1.0e-10;
+		def smallode(t, x):
+			return stiffode(t, x/s)*s;
+
+		y = odesolvers.ThetaMethod(smallode, self.iv*s, self.t0, 1.0, h, 0.5, jacobianfree=True, rtol=1.0e-8, atol=1.0e-20);
+		yref = odesolvers.ThetaMethod(stiffode, self.iv, self.t0, 1.0, h, 0.5, stiffodeJ, rtol=1.0e-8, atol=1.0e-10);
+		np.testing.assert_allclose(y/s, yref, rtol=1.0e-6);
+
+	def testContinue(self):
+		sol, hi = odesolvers.AB_AM_PECE2(multivariableode, self.iv, self.t0, 2.0, rtol=1.0e-5, solution=True);
+		sol, hi = odesolvers.AB_AM_PECE2_continue(multivariableode, sol, self.tn);
+		yref, hiref = odesolvers.AB_AM_PECE2(multivariableode, self.iv, self.t0, self.tn, rtol=1.0e-5);
+
+		np.testing.assert_array_equal(hi, hiref);
+
+	def testErrorHandling(self):
+		with self.assertRaises(ValueError): odesolvers.ThetaMethod(multivariableode, self.iv, self.t0, self.tn, 0.01, 0.5, multivariableodeJ, atol=-1.0);
+		with self.assertRaises(ValueError): odesolvers.AB_AM_PECE2(multivariableode, self.iv, self.t0, self.tn, rtol=np.ones(3));
+
+
+if __name__ == '__main__':
+	unittest.main()
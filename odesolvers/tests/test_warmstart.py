@@ -0,0 +1,60 @@
+#
+# Author : Francesco Seccamonte
+# Copyright (c) 2020 Francesco Seccamonte. All rights reserved.  
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.  
+#
+
+#
+# Test continuation of AB_AM_PECE2 solutions to a later final time.
+#
+
+import unittest
+import numpy as np
+
+import odesolvers
+
+from .test_helpers import *
+
+class TestWarmStart(unittest.TestCase):
+	def setUp(self):
+		# common initial and final time for all tests
+		self.t0 : np.float = 0.0;
+		self.tn : np.float = 1.0;
+		self.iv = np.array([1.0, 2.0]);
+
+	def testContinue(self):
+		for h in [None, 0.01]:
+			yref, hiref = odesolvers.AB_AM_PECE2(stiffode, self.iv, self.t0, 2*self.tn, h, ETOL=1.0e-4);
+
+			y, hi = odesolvers.AB_AM_PECE2(stiffode, self.iv, self.t0, self.tn, h, ETOL=1.0e-4, solution=True);
+			n = len(y);
+			xfirst = y[:n];
+			y2, hi2 = odesolvers.AB_AM_PECE2_continue(stiffode, y, 2*self.tn);
+
+			# same solution as a single integration, previous results still valid
+			self.assertIs(y2, y);
+			np.testing.assert_array_equal(y, yref);
+			np.testing.assert_array_equal(hi2, hiref);
+			np.testing.assert_array_equal(xfirst, yref[:n]);
+
+	def testAppendInPlace(self):
+		y, hi = odesolvers.AB_AM_PECE2(stableode, np.array([1.0]), self.t0, self.tn, 0.01, solution=True);
+		buffer = y._x;
+		n = len(y);
+		# the storage is large enough: new steps are appended without copying
+		self.assertGreater(buffer.shape[0], n + 50);
+		odesolvers.AB_AM_PECE2_continue(stableode, y, 1.5*self.tn);
+
+		self.assertIs(y._x, buffer);
+		self.assertGreater(len(y), n);
+
+	def testErrorHandling(self):
+		y, hi = odesolvers.AB_AM_PECE2(stableode, np.array([1.0]), self.t0, self.tn, 0.01, solution=True);
+		# final time already reached
+		with self.assertRaises(ValueError): odesolvers.AB_AM_PECE2_continue(stableode, y, 0.5*self.tn);
+		# arrays (default) keep no solver state
+		with self.assertRaises(ValueError): odesolvers.AB_AM_PECE2_continue(stableode, np.asarray(y), 1.5*self.tn);
+
+
+if __name__ == '__main__':
+	unittest.main()
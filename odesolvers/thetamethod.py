@@ -11,10 +11,17 @@
 import numpy as np
 from nptyping import Array
 
-from ._expliciteuler import _ExplicitEuler_step
-from ._thetamethod import _Theta_step
+from ._async import _run
+from ._expliciteuler import _ExplicitEuler_step, _ExplicitEuler_step_async
+from ._thetamethod import _Theta_step_async, _Theta_step_JFNK, _IMEXTheta_step, _Theta_step_retry, _Theta_step_retry_async
+from ._linalg import _shape, _matvec, _shifted, _factorize
+from ._checkpoint import _save_checkpoint, _load_checkpoint
+from ._executor import _get_executor
+from .jacobian import FDJacobian
+from .solution import ODESolution, _allocate
+from ._errornorm import _wrmsnorm, _tolerances
 
-def ThetaMethod(f, iv : Array[float], t0 : float, tn : float, h : float, theta : float, df = None, TOL : float = 1.0e-5, NEWTITER : int = 10) -> Array[float]:
+def ThetaMethod(f, iv : Array[float], t0 : float, tn : float, h : float, theta : float, df = None, TOL : float = 1.0e-5, NEWTITER : int = 10, jacobianfree : bool = False, precond = None, checkpoint : str = None, checkpointevery : int = 100, executor = None, workers : int = None, solution : bool = False, dtype = float, layout : str = 'time', rtol = None, atol = None, maxhalvings : int = 4, M = None) -> Array[float]:
 	"""Function implementing the Theta method for ODEs numerical solution.
 
 	The ODE to be solved is of the form: x' = f(t,x), x being a vector in n-dimensions
@@ -23,6 +30,42 @@ def ThetaMethod(f, iv : Array[float], t0 : float, tn : float, h : float, theta :
 	Theta = 1 is equivalent to the Explicit (Forward) Euler method.
 	Theta = 0 is equivalent to the Implicit (Backward) Euler method.
 
+	With jacobianfree = True, the Newton iteration is carried out matrix-free (Newton-Krylov with GMRES),
+	using directional derivatives of f in place of df, which is then not needed.
+	This allows to solve very large systems, whose Jacobian does not fit in memory.
+
+	df may return a dense, banded ((l, u), ab) or sparse (scipy.sparse) matrix: the Newton linear systems are then solved
+	with scipy.linalg.solve_banded (resp. a sparse LU), e.g. in O(n) for a method-of-lines discretization (see FDOperator).
+
+	If checkpoint is provided, the state of the solver is saved to that file every checkpointevery steps,
+	and the integration can be continued from there with ThetaMethod_resume. The solution computed so far is kept
+	in the file checkpoint + '.x', to which each checkpoint appends only its new steps.
+
+	If df is not provided and an executor is, the Jacobian is approximated by finite differences (see FDJacobian),
+	its columns being evaluated in parallel on the executor. The solution does not depend on the executor.
+
+	With solution = True, an ODESolution is returned, providing also the times t and the stepsizes.
+	The states can be stored with a reduced precision (e.g. dtype = np.float32, halving the memory),
+	the steps being always computed in float64, and component-major (layout = 'component').
+
+	If rtol and/or atol are provided, the Newton iteration converges when its correction is within the tolerances
+	in the weighted RMS norm sqrt(mean((delta_j/(atol_j + rtol_j |x_j|))^2)), instead of its 2-norm being within TOL:
+	this is needed when the components have very different scales.
+
+	The Newton iteration starts from the solution extrapolated linearly from the last two steps,
+	and its contraction rate is monitored: it stops as soon as the estimated error is within the tolerance,
+	and gives up as soon as it diverges or would not converge within NEWTITER iterations.
+	The step is then performed as two steps of size h/2 (halving recursively, up to maxhalvings times),
+	so that the solution is still returned at the times t0 + i h; an ArithmeticError is raised only if all of them fail.
+
+	If the mass matrix M is provided, the ODE to be solved is M x' = f(t,x), with the numerical scheme
+		M (x_{n+1} - x_n) = theta h f(t_n,x_n) + (1 - theta)h f(t_{n+1},x_{n+1})
+	M can be dense, banded ((l, u), ab) or sparse (scipy.sparse), and singular: the components of its zero rows
+	are algebraic variables of a differential-algebraic equation (DAE) of index 1, e.g. 0 = g(t,x).
+	The Newton iteration solves (M - (1-theta)*h*df) delta = -r, in the format of M (sparse if df is sparse).
+	Theta has to be smaller than 1 (implicit method); for DAEs, Theta = 0 (Implicit Euler) is recommended, the algebraic
+	variables being then damped, and iv should satisfy the algebraic equations (consistent initial values).
+
 	- **parameters**, **types**, **return** and **return types**::
 		:param f: function in x' = f(t,x)
 		:param iv: vector of initial values
@@ -33,6 +76,21 @@ def ThetaMethod(f, iv : Array[float], t0 : float, tn : float, h : float, theta :
 		:param df: Jacobian of f
 		:param TOL: Numerical tolerance for convergence
 		:param NEWTITER: Maximum number of Newton iterations to be performed
+		:param jacobianfree: whether to use the Jacobian-free Newton-Krylov iteration
+		:param precond: (only if jacobianfree) preconditioner approximating the inverse of I - (1-theta)*h*df (M - (1-theta)*h*df with M),
+						or function (t,x,gamma) returning such a preconditioner for I - gamma*df(t,x)
+		:param checkpoint: checkpoint file (None for no checkpoints)
+		:param checkpointevery: number of steps between two checkpoints
+		:param executor: (only if df is None) executor for the finite-difference Jacobian,
+						or 'thread' (resp. 'process') for a new thread (resp. process) pool
+		:param workers: number of workers of the new pool
+		:param solution: whether to return an ODESolution
+		:param dtype: floating-point type of the stored states
+		:param layout: layout of the stored states, 'time' (x[i,j]) or 'component' (x[j,i])
+		:param rtol: relative tolerance of the Newton iteration (scalar or per component, 1e-3 if only atol is given)
+		:param atol: absolute tolerance of the Newton iteration (scalar or per component, 1e-6 if only rtol is given)
+		:param maxhalvings: maximum number of times the stepsize is halved when the Newton iteration fails (0 for none)
+		:param M: mass matrix (None for the identity)
 		:type f: Callable
 		:type iv: np.array[float]
 		:type t0: np.float
@@ -42,9 +100,32 @@ def ThetaMethod(f, iv : Array[float], t0 : float, tn : float, h : float, theta :
 		:type df: Callable
 		:type TOL: np.float
 		:type NEWTITER: (unsigned) int
+		:type jacobianfree: bool
+		:type precond: LinearOperator or Callable
+		:type checkpoint: str
+		:type checkpointevery: int
+		:type executor: concurrent.futures.Executor or str
+		:type workers: int
+		:type solution: bool
+		:type dtype: np.dtype
+		:type layout: str
+		:type rtol: np.float or np.array[float]
+		:type atol: np.float or np.array[float]
+		:type maxhalvings: int
+		:type M: np.array[float,float], ((int, int), np.array[float,float]) or scipy.sparse matrix
 		:return: Vector x containing solution of component j at time i (x[i,j])
-		:rtype: np.array[float,float]
+		:rtype: np.array[float,float] or ODESolution
+
+	"""
+
+	return _run(_ThetaMethod_async(f, iv, t0, tn, h, theta, df, TOL, NEWTITER, jacobianfree, precond, checkpoint, checkpointevery, executor, workers,
+									solution, dtype, layout, rtol, atol, maxhalvings, M));
+
 
+async def _ThetaMethod_async(f, iv : Array[float], t0 : float, tn : float, h : float, theta : float, df = None, TOL : float = 1.0e-5, NEWTITER : int = 10, jacobianfree : bool = False, precond = None, checkpoint : str = None, checkpointevery : int = 100, executor = None, workers : int = None, solution : bool = False, dtype = float, layout : str = 'time', rtol = None, atol = None, maxhalvings : int = 4, M = None) -> Array[float]:
+	"""Internal coroutine implementing ThetaMethod and ThetaMethodAsync, f and df being possibly coroutine functions
+		(except for the Jacobian-free iteration and the finite-difference Jacobian).
+	See ThetaMethod for the parameters.
 	"""
 
 	if h <= 0.0:
@@ -62,19 +143,347 @@ def ThetaMethod(f, iv : Array[float], t0 : float, tn : float, h : float, theta :
 	if (theta != 1) and (NEWTITER < 0.0):
 		raise ValueError('The maximum number of Newton Iteration steps must be positive')
 
-	if (theta != 1) and df is None:
+	if (theta != 1) and df is None and not jacobianfree and executor is None:
+		raise NotImplementedError('Automatic differentiation not implemented yet. Please provide the Jacobian of f')
+
+	if checkpointevery < 1:
+		raise ValueError('The number of steps between checkpoints must be positive')
+
+	if maxhalvings < 0:
+		raise ValueError('The maximum number of stepsize halvings must be nonnegative')
+
+	if M is not None and theta == 1:
+		raise ValueError('A mass matrix requires an implicit method (theta smaller than 1)')
+
+	if M is not None and _shape(M) != (iv.size, iv.size):
+		raise ValueError('The mass matrix must be square, with size equal to the number of states')
+
+	_wrmsnorm(rtol, atol, iv.size);		# checking the tolerances
+
+	N : np.int = np.int(np.ceil((tn - t0)/h));	# number of steps
+
+	buf, x = _allocate(np.int(N+1), iv.size, dtype, layout);	# preallocating the array (+1 for including initial condition)
+	x[0,:] = iv;
+
+	x = await _ThetaMethod_loop_async(f, df, x, 0, t0, h, theta, TOL, NEWTITER, jacobianfree, precond, checkpoint, checkpointevery, iv, rtol, atol, None, maxhalvings, M,
+										executor, workers, layout, solution);
+
+	return _result(buf, x, t0, h, layout, solution);
+
+
+def _result(buf, x, t0, h, layout, solution):
+	"""Internal function returning the states, as an array or as an ODESolution (see ThetaMethod).
+	"""
+	if not solution:
+		return x;
+
+	hi = np.full((x.shape[0],1), h, float);
+	hi[0] = 0.0;
+
+	return ODESolution(buf, hi, x.shape[0], t0=t0, layout=layout, hfixed=h);
+
+
+def ThetaMethod_resume(f, checkpoint : str, df = None, precond = None, M = None, executor = None, workers : int = None, solution : bool = None) -> Array[float]:
+	"""Function continuing a ThetaMethod integration from a checkpoint.
+
+	The integration continues exactly (bit-for-bit) as the original one would have,
+	with the same settings (including dtype and layout, and whether an ODESolution is returned),
+	and keeps saving checkpoints to the same file.
+	The functions f, df and precond, and the mass matrix M, are not stored in the checkpoint, and must be provided again.
+	If the original integration used the finite-difference Jacobian on an executor, an executor must be provided again
+	(not necessarily the same: the solution does not depend on it).
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param f: function in x' = f(t,x)
+		:param checkpoint: checkpoint file written by ThetaMethod
+		:param df: Jacobian of f
+		:param precond: preconditioner (only if the original integration was jacobianfree)
+		:param M: mass matrix (only if the original integration had one)
+		:param executor: (only if df is None) executor for the finite-difference Jacobian, see ThetaMethod
+		:param workers: number of workers of the new pool
+		:param solution: whether to return an ODESolution (None for the setting of the original integration)
+		:type f: Callable
+		:type checkpoint: str
+		:type df: Callable
+		:type precond: LinearOperator or Callable
+		:type M: np.array[float,float], ((int, int), np.array[float,float]) or scipy.sparse matrix
+		:type executor: concurrent.futures.Executor or str
+		:type workers: int
+		:type solution: bool
+		:return: Vector x containing solution of component j at time i (x[i,j])
+		:rtype: np.array[float,float] or ODESolution
+
+	"""
+
+	state = _load_checkpoint(checkpoint, 'ThetaMethod');
+
+	theta = state['theta'].item();
+	jacobianfree = bool(state['jacobianfree']);
+	if (theta != 1) and df is None and not jacobianfree and executor is None:
 		raise NotImplementedError('Automatic differentiation not implemented yet. Please provide the Jacobian of f')
 
+	if bool(state.get('mass', False)) != (M is not None):
+		raise ValueError('The mass matrix must be provided if and only if the original integration had one')
+
+	layout = str(state.get('layout', 'time'));
+	if solution is None:
+		solution = bool(state.get('solution', False));
+
+	i = int(state['i']);
+	buf, x = _allocate(int(state['N'])+1, state['x'].shape[1], state['x'].dtype, layout);
+	x[:i+1,:] = state['x'];
+
+	t0, h = state['t0'].item(), state['h'].item();
+	x = _run(_ThetaMethod_loop_async(f, df, x, i, t0, h, theta, state['TOL'].item(), int(state['NEWTITER']),
+										jacobianfree, precond, checkpoint, int(state['checkpointevery']), state.get('xi', state['x'][i]),
+										state.get('rtol'), state.get('atol'), state.get('xprev'), int(state.get('maxhalvings', 0)), M,
+										executor, workers, layout, solution));
+
+	return _result(buf, x, t0, h, layout, solution);
+
+
+async def _ThetaMethod_loop_async(f, df, x, istart, t0, h, theta, TOL, NEWTITER, jacobianfree, precond, checkpoint, checkpointevery, xi, rtol = None, atol = None, xprev = None, maxhalvings = 0, M = None, executor = None, workers = None, layout = 'time', solution = False):
+	"""Internal coroutine running the steps of the Theta method, from step istart to the end of x.
+	See ThetaMethod for the parameters not listed here.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param x: preallocated solution, filled up to row istart
+		:param istart: index of the current step
+		:param xi: current state in full precision (x may have a reduced precision)
+		:param rtol: relative tolerance of the Newton iteration
+		:param atol: absolute tolerance of the Newton iteration
+		:param xprev: state at the previous step, for extrapolating the initial guess of the Newton iteration (None if unknown)
+		:param maxhalvings: maximum number of times the stepsize is halved when the Newton iteration fails
+		:param M: mass matrix (None for the identity)
+		:param executor: executor for the finite-difference Jacobian, if df is None (None for no executor)
+		:param workers: number of workers of the executor
+		:param layout: layout of the buffer of x (saved in the checkpoint)
+		:param solution: whether an ODESolution is returned (saved in the checkpoint)
+		:type x: np.array[float,float]
+		:type istart: int
+		:type xi: np.array[float]
+		:type rtol: np.float or np.array[float]
+		:type atol: np.float or np.array[float]
+		:type xprev: np.array[float]
+		:type maxhalvings: int
+		:type M: np.array[float,float], ((int, int), np.array[float,float]) or scipy.sparse matrix
+		:type executor: concurrent.futures.Executor or str
+		:type workers: int
+		:type layout: str
+		:type solution: bool
+		:return: Vector x containing solution of component j at time i (x[i,j])
+		:rtype: np.array[float,float]
+
+	"""
+
+	norm = _wrmsnorm(rtol, atol, x.shape[1]);
+	tolerances = _tolerances(rtol, atol);
+
+	xi = np.array(xi, float);
+	N = x.shape[0] - 1;
+	saved = istart;		# rows of x already in the checkpoint (x[istart] being rewritten, when resuming)
+
+	if (theta == 1):
+		for i in range(istart, N):
+			xi = await _ExplicitEuler_step_async(f,xi,(t0+h*i),h);
+			x[i+1,:] = xi;
+
+			if checkpoint is not None and (i+1) % checkpointevery == 0:
+				_save_checkpoint(checkpoint, {'x': (x[:i+2,:], saved)}, solver='ThetaMethod', xi=xi, i=i+1, N=N, t0=t0, h=h, theta=theta,
+									TOL=TOL, NEWTITER=NEWTITER, jacobianfree=jacobianfree, checkpointevery=checkpointevery, layout=layout, solution=solution);
+				saved = i+2;
+		return x;
+
+	if df is None and not jacobianfree and executor is not None:
+		pool, owned = _get_executor(executor, workers);
+		try:
+			return await _ThetaMethod_loop_async(f, FDJacobian(f, pool, workers=workers), x, istart, t0, h, theta, TOL, NEWTITER, jacobianfree, precond,
+													checkpoint, checkpointevery, xi, rtol, atol, xprev, maxhalvings, M,
+													layout=layout, solution=solution);
+		finally:
+			if owned:
+				pool.shutdown();
+
+	if jacobianfree:
+		step = lambda xi, ti, h, guess: _Theta_step_JFNK(f,xi,ti,h,theta,TOL,NEWTITER,precond,norm,guess,M);
+	else:
+		step = lambda xi, ti, h, guess: _Theta_step_async(f,df,xi,ti,h,theta,TOL,NEWTITER,norm,guess,None,M);
+
+	for i in range(istart, N):
+		# initial guess of the Newton iteration extrapolated linearly from the last two steps
+		guess = None if xprev is None else 2*xi - xprev;
+		xprev = xi;
+		xi, nsteps = await _Theta_step_retry_async(step,xi,(t0+h*i),h,guess,maxhalvings);
+		x[i+1,:] = xi;
+
+		if checkpoint is not None and (i+1) % checkpointevery == 0:
+			_save_checkpoint(checkpoint, {'x': (x[:i+2,:], saved)}, solver='ThetaMethod', xi=xi, xprev=xprev, i=i+1, N=N, t0=t0, h=h, theta=theta,
+								TOL=TOL, NEWTITER=NEWTITER, jacobianfree=jacobianfree, checkpointevery=checkpointevery,
+								maxhalvings=maxhalvings, mass=(M is not None), layout=layout, solution=solution, **tolerances);
+			saved = i+2;
+
+	return x;
+
+
+def LinearThetaMethod(A, iv : Array[float], t0 : float, tn : float, h : float, theta : float, b = None) -> Array[float]:
+	"""Function implementing the Theta method for linear ODEs with constant matrix.
+
+	The ODE to be solved is of the form: x' = A x + b(t), x being a vector in n-dimensions
+	Theta method implements the numerical scheme:
+		(I - (1 - theta)h A) x_{n+1} = x_n + theta h (A x_n + b(t_n)) + (1 - theta)h b(t_{n+1})
+
+	The matrix I - (1 - theta)h A is factorized once: each step requires one product with A,
+	one evaluation of b and one back-substitution, with no Newton iteration.
+	A can be dense, sparse (scipy.sparse) or banded, given as ((l, u), ab) as in scipy.linalg.solve_banded.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param A: matrix in x' = A x + b(t)
+		:param iv: vector of initial values
+		:param t0: initial time
+		:param tn: final time
+		:param h: step size
+		:param theta: value between 0 and 1
+		:param b: forcing function in x' = A x + b(t) (None if zero)
+		:type A: np.array[float,float], ((int, int), np.array[float,float]) or scipy.sparse matrix
+		:type iv: np.array[float]
+		:type t0: np.float
+		:type tn: np.float
+		:type h: np.float
+		:type theta: np.float
+		:type b: Callable
+		:return: Vector x containing solution of component j at time i (x[i,j])
+		:rtype: np.array[float,float]
+
+	"""
+
+	if h <= 0.0:
+		raise ValueError('The stepsize h must be positive')
+
+	if (tn - t0) <= 0.0:
+		raise ValueError('The final time must be greater than the initial time')
+
+	if not 0 <= theta <= 1:
+		raise ValueError('Theta has to be between 0 and 1')
+
+	if _shape(A) != (iv.size, iv.size):
+		raise ValueError('The matrix A must be square, with size equal to the number of states')
+
+	N : np.int = np.int(np.ceil((tn - t0)/h));	# number of steps
+
+	x = np.empty((np.int(N+1),iv.size), float);	# preallocating the array (+1 for including initial condition)
+	x[0,:] = iv;
+
+	# factorizing the iteration matrix once
+	solve = _factorize(_shifted(A, (1-theta)*h)) if theta != 1 else None;
+
+	bnext = b(t0) if b is not None else 0.0;
+	for i in range(N):
+		bi = bnext;
+		rhs = x[i,:] + theta*h*_matvec(A, x[i,:]);
+		if b is not None:
+			bnext = b(t0+h*(i+1));
+			rhs += h*(theta*bi + (1-theta)*bnext);
+		x[i+1,:] = solve(rhs) if solve is not None else rhs;
+
+	return x;
+
+
+def IMEXThetaMethod(fstiff, fnonstiff, iv : Array[float], t0 : float, tn : float, h : float, theta : float, dfstiff = None, TOL : float = 1.0e-5, NEWTITER : int = 10, rtol = None, atol = None, maxhalvings : int = 4) -> Array[float]:
+	"""Function implementing the implicit-explicit (IMEX) Theta method for ODEs numerical solution.
+
+	The ODE to be solved is of the form: x' = fstiff(t,x) + fnonstiff(t,x), x being a vector in n-dimensions
+	The stiff part is treated with the Theta method, the non-stiff part with the Explicit Euler method:
+		x_{n+1} = x_n + h fnonstiff(t_n,x_n) + theta h fstiff(t_n,x_n) + (1 - theta)h fstiff(t_{n+1},x_{n+1})
+
+	The non-stiff part is evaluated once per step, and not within the Newton iteration.
+	If dfstiff is a (dense, banded or sparse) matrix instead of a function, fstiff is assumed to be affine in x,
+	i.e. fstiff(t,x) = dfstiff x + g(t): the iteration matrix is then factorized once, and each step
+	requires a single back-substitution.
+	Otherwise, the Newton iteration is monitored, and the step halved if it fails, as in ThetaMethod.
+
+	- **parameters**, **types**, **return** and **return types**::
+		:param fstiff: stiff part of f in x' = f(t,x)
+		:param fnonstiff: non-stiff part of f in x' = f(t,x)
+		:param iv: vector of initial values
+		:param t0: initial time
+		:param tn: final time
+		:param h: step size
+		:param theta: value between 0 and 1
+		:param dfstiff: Jacobian of fstiff (function, or constant matrix if fstiff is affine)
+		:param TOL: Numerical tolerance for convergence
+		:param NEWTITER: Maximum number of Newton iterations to be performed
+		:param rtol: relative tolerance of the Newton iteration (scalar or per component), see ThetaMethod
+		:param atol: absolute tolerance of the Newton iteration (scalar or per component), see ThetaMethod
+		:param maxhalvings: maximum number of times the stepsize is halved when the Newton iteration fails, see ThetaMethod
+		:type fstiff: Callable
+		:type fnonstiff: Callable
+		:type iv: np.array[float]
+		:type t0: np.float
+		:type tn: np.float
+		:type h: np.float
+		:type theta: np.float
+		:type dfstiff: Callable, np.array[float,float], ((int, int), np.array[float,float]) or scipy.sparse matrix
+		:type TOL: np.float
+		:type NEWTITER: (unsigned) int
+		:type rtol: np.float or np.array[float]
+		:type atol: np.float or np.array[float]
+		:type maxhalvings: int
+		:return: Vector x containing solution of component j at time i (x[i,j])
+		:rtype: np.array[float,float]
+
+	"""
+
+	if h <= 0.0:
+		raise ValueError('The stepsize h must be positive')
+
+	if (tn - t0) <= 0.0:
+		raise ValueError('The final time must be greater than the initial time')
+
+	if not 0 <= theta <= 1:
+		raise ValueError('Theta has to be between 0 and 1')
+
+	if TOL <= 0.0:
+		raise ValueError('The numerical tolerance must be positive')
+
+	if (theta != 1) and (NEWTITER < 0.0):
+		raise ValueError('The maximum number of Newton Iteration steps must be positive')
+
+	if (theta != 1) and dfstiff is None:
+		raise NotImplementedError('Automatic differentiation not implemented yet. Please provide the Jacobian of fstiff')
+
+	if maxhalvings < 0:
+		raise ValueError('The maximum number of stepsize halvings must be nonnegative')
+
+	norm = _wrmsnorm(rtol, atol, iv.size);
+
 	N : np.int = np.int(np.ceil((tn - t0)/h));	# number of steps
 
 	x = np.empty((np.int(N+1),iv.size), float);	# preallocating the array (+1 for including initial condition)
 	x[0,:] = iv;
 
 	if (theta == 1):
+		f = lambda t, x: fstiff(t,x) + fnonstiff(t,x);
 		for i in range(N):
 			x[i+1,:] = _ExplicitEuler_step(f,x[i,:],(t0+h*i),h);
-	else:
+		return x;
+
+	solve = None;
+	if not callable(dfstiff):
+		if _shape(dfstiff) != (iv.size, iv.size):
+			raise ValueError('The matrix dfstiff must be square, with size equal to the number of states')
+		solve = _factorize(_shifted(dfstiff, (1-theta)*h));	# factorizing the iteration matrix once
+
+	if solve is not None:
 		for i in range(N):
-			x[i+1,:] = _Theta_step(f,df,x[i,:],(t0+h*i),h,theta,TOL,NEWTITER);
+			x[i+1,:] = _IMEXTheta_step(fstiff,dfstiff,fnonstiff,x[i,:],(t0+h*i),h,theta,TOL,NEWTITER,solve,norm);
+		return x;
+
+	step = lambda xi, ti, h, guess: _IMEXTheta_step(fstiff,dfstiff,fnonstiff,xi,ti,h,theta,TOL,NEWTITER,None,norm,guess);
+
+	for i in range(N):
+		# initial guess of the Newton iteration extrapolated linearly from the last two steps
+		guess = None if i == 0 else 2*x[i,:] - x[i-1,:];
+		x[i+1,:] = _Theta_step_retry(step,x[i,:],(t0+h*i),h,guess,maxhalvings)[0];
 
 	return x;
+
@@ -18,16 +18,16 @@ URL = 'https://github.com/francescoseccamonte/odesolvers'
 EMAIL = 'fseccamonte@ucsb.edu'
 AUTHOR = 'Francesco Seccamonte'
 REQUIRES_PYTHON = '>=3.6.0'
-VERSION = '0.1.0'
+VERSION = ''
 
 # What packages are required for this module to be executed?
 REQUIRED = [
-    'numpy', 'nptyping', 'numpy_ringbuffer', 'matplotlib'
+    'numpy', 'scipy', 'nptyping', 'numpy_ringbuffer', 'matplotlib'
 ]
 
 # What packages are optional?
 EXTRAS = {
-    # 'fancy feature': ['django'],
+    'symbolic': ['sympy'],
 }
 
 # The rest you shouldn't have to touch too much :)
@@ -107,9 +107,9 @@ setup(
     # If your package is a single module, use this instead of 'packages':
     # py_modules=['mypackage'],
 
-    # entry_points={
-    #     'console_scripts': ['mycli=mymodule:cli'],
-    # },
+    entry_points={
+        'console_scripts': ['odesolvers-batch=odesolvers.batch:main'],
+    },
     install_requires=REQUIRED,
     extras_require=EXTRAS,
     include_package_data=True,